@@ -0,0 +1,63 @@
+# FILE: ./1_Scraper/detail_workers.py
+
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from page_readiness import wait_for_detail_panel
+
+JOB_VIEW_URL = "https://www.linkedin.com/jobs/view/{job_id}/"
+
+def open_detail_tabs(count, debugger_address, instrument=None):
+    """
+    Opens `count` extra tabs in the already running Chrome, each driven by its own WebDriver session
+    attached to the same debugger address, so detail pages can load side by side.
+    """
+    tabs = []
+    for _ in range(count):
+        chrome_options = Options(); chrome_options.add_experimental_option("debuggerAddress", debugger_address)
+        tab = webdriver.Chrome(options=chrome_options)
+        if instrument:
+            tab = instrument(tab)
+        tab.switch_to.new_window('tab')
+        tabs.append(tab)
+    print(f"Opened {len(tabs)} detail tabs on {debugger_address}.")
+    return tabs
+
+def close_detail_tabs(tabs):
+    """Closes the worker tabs and stops their chromedriver processes without closing the browser."""
+    for tab in tabs:
+        try:
+            tab.close()
+        except Exception as e:
+            print(f"  > WARNING: Could not close a detail tab: {e}")
+        finally:
+            tab.service.stop()
+
+def fetch_job_details(tab, job_id, details_js, title_selector):
+    """Loads a job's view page in the given tab and returns its detail snapshot."""
+    tab.get(JOB_VIEW_URL.format(job_id=job_id))
+    wait_for_detail_panel(tab, title_selector, "")
+    return tab.execute_script(details_js)
+
+def fetch_details_parallel(tabs, job_ids, details_js, title_selector):
+    """
+    Fetches the details of every job ID across the worker tabs at the same time.
+    Results come back in the same order as job_ids; a job that failed to load comes back as None.
+    """
+    free_tabs = queue.Queue()
+    for tab in tabs:
+        free_tabs.put(tab)
+
+    def fetch(job_id):
+        tab = free_tabs.get()
+        try:
+            return fetch_job_details(tab, job_id, details_js, title_selector)
+        except Exception as e:
+            print(f"  > ERROR: Could not load details for job ID {job_id}: {e}")
+            return None
+        finally:
+            free_tabs.put(tab)
+
+    with ThreadPoolExecutor(max_workers=len(tabs)) as executor:
+        return list(executor.map(fetch, job_ids))
@@ -0,0 +1,126 @@
+# FILE: ./1_Scraper/network_capture.py
+
+import re
+import json
+import base64
+
+# Only responses from LinkedIn's internal REST API carry job records.
+API_URL_MARKER = "/voyager/api/"
+JOB_VIEW_URL = "https://www.linkedin.com/jobs/view/{job_id}/"
+JOB_POSTING_ID_PATTERN = re.compile(r'jobPosting(?:Card)?:\(?(\d+)')
+
+def enable_performance_logging(chrome_options):
+    """Asks chromedriver to record DevTools network events; must be set before the driver is created."""
+    chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+def enable_network_capture(driver):
+    """Turns on the DevTools Network domain for the attached tab."""
+    driver.execute_cdp_cmd('Network.enable', {})
+
+def drain_api_responses(driver, include_urls=False):
+    """
+    Returns the parsed JSON bodies of every API response recorded since the last call,
+    or (url, body) pairs when include_urls is set.
+    """
+    payloads = []
+    for entry in driver.get_log('performance'):
+        try:
+            message = json.loads(entry['message'])['message']
+        except (KeyError, ValueError):
+            continue
+        if message.get('method') != 'Network.responseReceived':
+            continue
+        response = message['params']['response']
+        if API_URL_MARKER not in response.get('url', '') or 'json' not in response.get('mimeType', ''):
+            continue
+        try:
+            body = driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': message['params']['requestId']})
+            text = base64.b64decode(body['body']).decode('utf-8') if body.get('base64Encoded') else body['body']
+            payload = json.loads(text)
+            payloads.append((response['url'], payload) if include_urls else payload)
+        except Exception:
+            # Bodies of evicted or redirected requests are no longer available; skip them.
+            continue
+    return payloads
+
+def iter_entities(node):
+    """Yields every dict nested anywhere in a decoded API payload."""
+    if isinstance(node, dict):
+        yield node
+        for value in node.values():
+            yield from iter_entities(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from iter_entities(value)
+
+def find_job_id(entity):
+    """Returns the job ID of a job posting entity, from jobPostingId or its URN."""
+    if entity.get('jobPostingId'):
+        return str(entity['jobPostingId'])
+    for key in ('entityUrn', 'dashEntityUrn', 'jobPostingUrn', '*jobPosting'):
+        if match := JOB_POSTING_ID_PATTERN.search(str(entity.get(key, ''))):
+            return match.group(1)
+    return None
+
+def text_of(value):
+    """Returns the plain text of a field that is either a string or a {'text': ...} attributed-text dict."""
+    if isinstance(value, dict):
+        return value.get('text', '') or ''
+    return value or ''
+
+def find_company_name(entity, entities_by_urn):
+    """Resolves a posting's company name from inline company details or the referenced company entity."""
+    for nested in iter_entities(entity.get('companyDetails', {})):
+        if isinstance(nested.get('companyResolutionResult'), dict) and nested['companyResolutionResult'].get('name'):
+            return nested['companyResolutionResult']['name']
+        if nested.get('companyName'):
+            return nested['companyName']
+        for key in ('company', '*company', '*companyResolutionResult'):
+            if (company := entities_by_urn.get(nested.get(key))) and company.get('name'):
+                return company['name']
+    return ''
+
+def find_apply_button(entity):
+    """Maps the posting's apply method to the same apply_button values the DOM snapshot returns."""
+    apply_method = entity.get('applyMethod') or {}
+    apply_type = ' '.join([apply_method.get('$type', '')] + list(apply_method.keys()))
+    if 'OffsiteApply' in apply_type or 'companyApplyUrl' in apply_type:
+        return 'company_website'
+    if 'OnsiteApply' in apply_type or 'easyApplyUrl' in apply_type:
+        return 'easy_apply'
+    return ''
+
+def parse_job_postings(payloads):
+    """
+    Extracts job records from API payloads, returned as job ID -> detail dict in the same shape as the
+    DOM snapshot, so build_job_info turns them into the usual job_info. Records without a description are left out.
+    """
+    entities = [entity for payload in payloads for entity in iter_entities(payload)]
+    entities_by_urn = {entity['entityUrn']: entity for entity in entities if isinstance(entity.get('entityUrn'), str)}
+    postings = {}
+    for entity in entities:
+        description = text_of(entity.get('description'))
+        if not entity.get('title') or not description:
+            continue
+        job_id = find_job_id(entity)
+        if not job_id:
+            continue
+        postings[job_id] = {
+            "title": text_of(entity.get('title')).strip(),
+            "company": find_company_name(entity, entities_by_urn),
+            "description": description.strip(),
+            "location": entity.get('formattedLocation', ''),
+            "hiring_team": "",
+            "apply_button": find_apply_button(entity),
+            "url": JOB_VIEW_URL.format(job_id=job_id),
+        }
+    return postings
+
+def harvest_job_postings(driver, job_ids, captured):
+    """
+    Collects job records for the given IDs from the API traffic the page itself has produced; nothing is
+    requested here. IDs the page has not downloaded come back as None, for the caller to open through the
+    card's panel (the snapshot path). Records accumulate in `captured` (job ID -> details) across pages.
+    """
+    captured.update(parse_job_postings(drain_api_responses(driver)))
+    return [captured.get(job_id) for job_id in job_ids]
@@ -0,0 +1,106 @@
+# FILE: ./1_Scraper/page_readiness.py
+
+import time
+from collections import defaultdict
+from selenium.common.exceptions import TimeoutException
+
+# --- Readiness Configuration ---
+# Maximum seconds to wait for each DOM condition before giving up.
+WAIT_TIMEOUTS = {
+    "job_list": 15,
+    "detail_panel": 15,
+    "next_page": 15,
+}
+
+# Every wait appends its duration (seconds) here, keyed by condition name.
+WAIT_TIMINGS = defaultdict(list)
+
+# Resolves as soon as the named condition holds, re-checking on every DOM mutation
+# through a MutationObserver instead of polling from Python.
+WAIT_FOR_CONDITION_JS = """
+var name = arguments[0], params = arguments[1], timeoutMs = arguments[2];
+var done = arguments[arguments.length - 1];
+var conditions = {
+    job_list: function (p) {
+        var items = document.querySelectorAll(p.selector);
+        return items.length > 0 && !!items[0].querySelector('a[aria-label]');
+    },
+    detail_panel: function (p) {
+        var title = document.querySelector(p.title_selector);
+        if (!title) { return false; }
+        var text = title.innerText.trim();
+        if (!text) { return false; }
+        return p.expected_title ? text.indexOf(p.expected_title) !== -1 : text !== p.previous_title;
+    },
+    next_page: function (p) {
+        var first = document.querySelector(p.selector);
+        return !!first && first.getAttribute('data-occludable-job-id') !== p.previous_first_id
+            && !!first.querySelector('a[aria-label]');
+    }
+};
+var check = conditions[name];
+if (check(params)) { done(true); return; }
+var finished = false;
+var observer = new MutationObserver(function () {
+    if (!finished && check(params)) { finish(true); }
+});
+function finish(result) {
+    finished = true;
+    observer.disconnect();
+    done(result);
+}
+observer.observe(document.body, {childList: true, subtree: true, characterData: true, attributes: true});
+setTimeout(function () { if (!finished) { finish(check(params)); } }, timeoutMs);
+"""
+
+FIRST_JOB_ID_JS = """
+var first = document.querySelector(arguments[0]);
+var title = document.querySelector(arguments[1]);
+return {
+    first_job_id: first ? first.getAttribute('data-occludable-job-id') : null,
+    detail_title: title ? title.innerText.trim() : ''
+};
+"""
+
+def wait_for_condition(driver, name, params):
+    """Blocks until the named DOM condition holds, recording how long the wait took."""
+    timeout = WAIT_TIMEOUTS[name]
+    driver.set_script_timeout(timeout + 5)
+    started = time.perf_counter()
+    try:
+        ready = driver.execute_async_script(WAIT_FOR_CONDITION_JS, name, params, int(timeout * 1000))
+    finally:
+        WAIT_TIMINGS[name].append(time.perf_counter() - started)
+    if not ready:
+        raise TimeoutException(f"Condition '{name}' not met within {timeout}s.")
+
+def wait_for_job_list(driver, list_selector):
+    """Waits until the results list has at least one rendered job card."""
+    wait_for_condition(driver, "job_list", {"selector": list_selector})
+
+def wait_for_detail_panel(driver, title_selector, expected_title, previous_title=""):
+    """Waits until the detail panel shows the clicked job, by its title or, if unknown, a title change."""
+    wait_for_condition(driver, "detail_panel", {
+        "title_selector": title_selector,
+        "expected_title": expected_title,
+        "previous_title": previous_title,
+    })
+
+def wait_for_next_page(driver, list_selector, previous_first_id):
+    """Waits until the results list has been replaced by the next page."""
+    wait_for_condition(driver, "next_page", {"selector": list_selector, "previous_first_id": previous_first_id})
+
+def read_page_markers(driver, list_selector, title_selector):
+    """Returns the first card's job ID and the current detail title, used to detect when either changes."""
+    return driver.execute_script(FIRST_JOB_ID_JS, list_selector, title_selector)
+
+def print_wait_summary():
+    """Prints count, median, p90 and max wait time for every condition waited on so far."""
+    if not WAIT_TIMINGS:
+        return
+    print("\nReadiness wait times:")
+    for name, timings in sorted(WAIT_TIMINGS.items()):
+        ordered = sorted(timings)
+        median = ordered[len(ordered) // 2]
+        p90 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.9))]
+        print(f"  > {name}: {len(ordered)} waits, median {median:.2f}s, p90 {p90:.2f}s, max {ordered[-1]:.2f}s, total {sum(ordered):.1f}s")
@@ -0,0 +1,176 @@
+# FILE: ./1_Scraper/relevance.py
+
+import os
+import re
+import sys
+import json
+import time
+
+# --- Dynamic Path Configuration ---
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+OPPORTUNITIES_BASE_DIR = os.path.join(PROJECT_ROOT, '3_Opportunities')
+RELEVANCE_RULES_FILE = os.path.join(PROJECT_ROOT, 'relevance_rules.json')
+
+sys.path.insert(0, PROJECT_ROOT)
+from opportunity_paths import folder_key, iter_opportunity_dirs
+
+# The original substring filter, kept only so the benchmark can compare against it.
+LEGACY_KEYWORDS = ["scrum", "software", "tech", "technology", "it", "agile", "app", "application", "web", "mobile"]
+
+# Used when relevance_rules.json is missing.
+DEFAULT_RULES = {
+    "threshold": 1,
+    "include": [{"pattern": keyword, "weight": 1} for keyword in LEGACY_KEYWORDS if keyword not in ("it", "app")],
+    "exclude": []
+}
+
+WORD_PATTERN = re.compile(r'\w+')
+
+_compiled_matcher = None
+
+def load_relevance_rules():
+    """Loads the include/exclude rules and threshold from relevance_rules.json."""
+    if not os.path.exists(RELEVANCE_RULES_FILE):
+        return DEFAULT_RULES
+    try:
+        with open(RELEVANCE_RULES_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except json.JSONDecodeError as e:
+        print(f"ERROR: Could not parse '{os.path.basename(RELEVANCE_RULES_FILE)}': {e}. Using default rules.")
+        return DEFAULT_RULES
+
+def compile_rules(rules):
+    """
+    Compiles the include and exclude rules into one regex over the lowercased description: a trie of the rules'
+    words, with an empty named group marking each word that ends a rule, so one finditer() yields every rule
+    that matched. Returns (pattern, rules matched by each group, (weight, case-sensitive pattern or None) by rule, threshold).
+    """
+    trie = {}
+    named = {}
+    for kind, sign in (("include", 1), ("exclude", -1)):
+        for position, rule in enumerate(rules.get(kind, [])):
+            words = WORD_PATTERN.findall(rule['pattern'])
+            if not words:
+                continue
+            name = f"{kind}_{position}"
+            named[name] = (sign * rule.get('weight', 1), case_pattern(words) if rule.get('case_sensitive') else None)
+            node = trie
+            for word in words:
+                node = node.setdefault(word.lower(), {})
+            node.setdefault(None, []).append(name)
+    groups = {}
+    pattern = re.compile(r'\W' + trie_pattern(trie, groups, first=True))
+    return pattern, groups, named, rules.get('threshold', 1)
+
+def trie_pattern(node, groups, matched=(), first=False):
+    """
+    Returns the alternation of the words below a trie node, grouped by first letter and longest first, each
+    followed by its marker and the words that may come next. A marker stands for every rule ending on the path
+    so far, so a match's lastgroup names them all. The words after a rule's first word are only looked ahead at,
+    so the scan resumes at the next word and a rule starting inside a phrase is still found.
+    """
+    branches = {}
+    for word in sorted((word for word in node if word is not None), key=len, reverse=True):
+        child = node[word]
+        marker = ''
+        path_matched = matched + tuple(child.get(None, []))
+        if child.get(None):
+            marker = f"(?P<r{len(groups)}>)"
+            groups[f"r{len(groups)}"] = path_matched
+        rest = trie_pattern(child, groups, path_matched)
+        if rest:
+            marker += rf'(?:(?=\W+{rest}))?' if first else rf'(?:\W+{rest})?'
+        branches.setdefault(word[0], []).append(re.escape(word[1:]) + r'\b' + marker)
+    alternatives = (re.escape(letter) + f"(?:{'|'.join(tails)})" for letter, tails in sorted(branches.items()))
+    return f"(?:{'|'.join(alternatives)})" if branches else ''
+
+def case_pattern(words):
+    """
+    Returns the regex for a case-sensitive rule. The word boundary in front is checked after the first letter,
+    so the regex starts with a literal the scanner can search for instead of trying every position.
+    """
+    first = re.escape(words[0][0]) + r'(?<!\w.)' + re.escape(words[0][1:])
+    return re.compile(r'\W+'.join([first, *map(re.escape, words[1:])]) + r'\b')
+
+def get_matcher():
+    """Returns the compiled matcher, building it from the rules file on first use."""
+    global _compiled_matcher
+    if _compiled_matcher is None:
+        _compiled_matcher = compile_rules(load_relevance_rules())
+    return _compiled_matcher
+
+def score_relevance(text, matcher=None):
+    """
+    Returns the relevance score of a description: each matched rule's weight counted once.
+    The lowercased description is scanned once; case-sensitive rules found there are confirmed in the original.
+    """
+    pattern, groups, named, _ = matcher or get_matcher()
+    # The leading space lets the pattern's \W anchor a rule at the very start of the description.
+    reached = {match.lastgroup for match in pattern.finditer(" " + text.lower())}
+    reached.discard(None)
+    score = 0
+    for name in {name for group in reached for name in groups[group]}:
+        weight, case_sensitive = named[name]
+        if case_sensitive is None or case_sensitive.search(text):
+            score += weight
+    return score
+
+def is_relevant(text, matcher=None):
+    """Returns (relevant, score) for a description against the configured threshold."""
+    matcher = matcher or get_matcher()
+    score = score_relevance(text, matcher)
+    return score >= matcher[3], score
+
+def legacy_is_relevant(text):
+    """The original filter: any keyword as a substring of the lowercased description."""
+    text_lower = text.lower()
+    return any(keyword in text_lower for keyword in LEGACY_KEYWORDS)
+
+def load_corpus_descriptions():
+    """Returns (folder key, description body) for every opportunity in 3_Opportunities."""
+    corpus = []
+    for folder_path in iter_opportunity_dirs(OPPORTUNITIES_BASE_DIR):
+        job_desc_path = os.path.join(folder_path, 'jobdescription.txt')
+        if os.path.exists(job_desc_path):
+            with open(job_desc_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            corpus.append((folder_key(folder_path, OPPORTUNITIES_BASE_DIR), content.split("Job Description:", 1)[-1]))
+    return corpus
+
+def run_benchmark(iterations=200):
+    """Times the legacy substring filter against the compiled matcher over the existing corpus."""
+    print("--- Relevance Filter Micro-benchmark ---")
+    corpus = load_corpus_descriptions()
+    if not corpus:
+        print(f"No job descriptions found in '{OPPORTUNITIES_BASE_DIR}'."); return
+    matcher = get_matcher()
+    descriptions = [description for _, description in corpus]
+    total_chars = sum(len(description) for description in descriptions)
+    print(f"Corpus: {len(descriptions)} descriptions, {total_chars:,} characters, {iterations} iterations.")
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        legacy_results = [legacy_is_relevant(description) for description in descriptions]
+    legacy_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        compiled_results = [is_relevant(description, matcher) for description in descriptions]
+    compiled_seconds = time.perf_counter() - started
+
+    per_description = iterations * len(descriptions)
+    print(f"\nLegacy substring filter: {legacy_seconds / per_description * 1e6:.1f} us/description, "
+          f"{sum(legacy_results)} of {len(descriptions)} pass.")
+    print(f"Compiled matcher:        {compiled_seconds / per_description * 1e6:.1f} us/description, "
+          f"{sum(relevant for relevant, _ in compiled_results)} of {len(descriptions)} pass (threshold {matcher[3]}).")
+
+    print("\nPer-opportunity scores:")
+    for (folder_name, _), legacy, (relevant, score) in zip(corpus, legacy_results, compiled_results):
+        print(f"  {'PASS' if relevant else 'DROP'} {score:>4}  (legacy: {'pass' if legacy else 'drop'})  {folder_name}")
+
+if __name__ == '__main__':
+    if '--benchmark' in sys.argv:
+        run_benchmark()
+    else:
+        print("Usage: python relevance.py --benchmark")
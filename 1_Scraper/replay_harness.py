@@ -0,0 +1,317 @@
+# FILE: ./1_Scraper/replay_harness.py
+
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import hashlib
+import html as html_lib
+import argparse
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+import scrape_linkedin as scraper
+from opportunity_paths import iter_opportunity_dirs
+from job_index import JobIndex
+import detail_workers
+import page_readiness
+from network_capture import enable_performance_logging, enable_network_capture, drain_api_responses
+
+# --- Dynamic Path Configuration ---
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+FIXTURES_BASE_DIR = os.path.join(PROJECT_ROOT, 'scraper_fixtures')
+
+# --- Replay Configuration ---
+REPLAY_HOST = "127.0.0.1"
+REPLAY_PORT = 8765
+REPLAY_DEBUGGER_PORT = 9333
+DETAIL_PANEL_CSS = ".jobs-details__main-content"
+
+# Injected into every replayed page in place of LinkedIn's own scripts. It swaps in the recorded
+# detail panel when a card is clicked and the recorded next page when "View next page" is clicked,
+# without reloading the document, the same way the live single-page app does. It also requests the
+# API responses recorded with each page, synchronously, so "network" extraction finds them in the
+# performance log by the time the page's cards can be read.
+REPLAY_SCRIPT = """
+<script>
+(function () {
+    function meta() { return document.getElementById('replay-meta'); }
+    function loadApi(pageMeta) {
+        JSON.parse(pageMeta.getAttribute('data-api') || '[]').forEach(function (url) {
+            var request = new XMLHttpRequest(); request.open('GET', url, false); request.send();
+        });
+    }
+    function hideNextOnLastPage() {
+        if (meta().getAttribute('data-last') === '1') {
+            document.querySelectorAll("button[aria-label='View next page']").forEach(function (b) { b.remove(); });
+        }
+    }
+    document.addEventListener('click', function (event) {
+        var next = event.target.closest("button[aria-label='View next page']");
+        var card = event.target.closest('li.occludable-update');
+        if (next) {
+            event.preventDefault(); event.stopPropagation();
+            var start = (parseInt(meta().getAttribute('data-page'), 10)) * %(per_page)d;
+            fetch('/jobs/search/?start=' + start).then(function (r) { return r.text(); }).then(function (html) {
+                var doc = new DOMParser().parseFromString(html, 'text/html');
+                loadApi(doc.getElementById('replay-meta'));
+                document.body.innerHTML = doc.body.innerHTML;
+                history.replaceState(null, '', '/jobs/search/?start=' + start);
+                hideNextOnLastPage();
+            });
+        } else if (card) {
+            event.preventDefault(); event.stopPropagation();
+            var jobId = card.getAttribute('data-occludable-job-id');
+            fetch('/replay/details/' + jobId + '.html').then(function (r) { return r.text(); }).then(function (html) {
+                var panel = document.querySelector('%(panel)s');
+                if (panel) { panel.outerHTML = html; }
+                history.replaceState(null, '', '/jobs/search/?currentJobId=' + jobId + '&start=' + ((parseInt(meta().getAttribute('data-page'), 10) - 1) * %(per_page)d));
+            });
+        }
+    }, true);
+    loadApi(meta());
+    hideNextOnLastPage();
+})();
+</script>
+"""
+
+SCRIPT_TAG_PATTERN = re.compile(r'<script\b[^>]*>.*?</script>', re.IGNORECASE | re.DOTALL)
+
+def fixture_paths(fixture_dir):
+    """Returns the manifest path and the details and API sub-directories of a fixture directory."""
+    return os.path.join(fixture_dir, 'manifest.json'), os.path.join(fixture_dir, 'details'), os.path.join(fixture_dir, 'api')
+
+def connect_to_chrome(debugger_address, capture_network=False):
+    """Attaches to a running Chrome on the given debugger address."""
+    chrome_options = Options(); chrome_options.add_experimental_option("debuggerAddress", debugger_address)
+    if capture_network:
+        enable_performance_logging(chrome_options)
+    driver = scraper.instrument_driver(webdriver.Chrome(options=chrome_options))
+    if capture_network:
+        enable_network_capture(driver)
+    return driver
+
+def save_api_responses(driver, api_dir, api_index):
+    """Writes every captured API response to the fixture and records its URL in api_index. Returns the URLs saved."""
+    keys = []
+    for url, payload in drain_api_responses(driver, include_urls=True):
+        parsed = urlparse(url)
+        key = parsed.path + ('?' + parsed.query if parsed.query else '')
+        file_name = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16] + '.json'
+        with open(os.path.join(api_dir, file_name), 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False)
+        api_index[key] = file_name
+        keys.append(key)
+    return keys
+
+def record(search_url, pages, fixture_dir):
+    """Records result pages, every job's detail panel and the API responses seen along the way."""
+    print(f"--- Recording {pages} pages of '{search_url}' into '{fixture_dir}' ---")
+    manifest_path, details_dir, api_dir = fixture_paths(fixture_dir)
+    os.makedirs(details_dir, exist_ok=True)
+    os.makedirs(api_dir, exist_ok=True)
+
+    driver = connect_to_chrome(scraper.DEBUGGER_ADDRESS, capture_network=True)
+    manifest = {"search_url": search_url, "recorded_at": time.strftime("%Y-%m-%d %H:%M:%S"), "pages": [], "api": {}}
+
+    for page_number in range(1, pages + 1):
+        driver.get(scraper.build_page_url(search_url, page_number))
+        try:
+            page_readiness.wait_for_job_list(driver, scraper.JOB_LIST_SELECTOR)
+        except Exception:
+            print(f"Page {page_number} did not load. Stopping the recording."); break
+
+        cards = scraper.read_job_cards(driver)
+        page_file = f"page_{page_number}.html"
+        with open(os.path.join(fixture_dir, page_file), 'w', encoding='utf-8') as f:
+            f.write(driver.execute_script("return document.documentElement.outerHTML;"))
+        print(f"Page {page_number}: saved {len(cards)} cards.")
+
+        previous_title = ""
+        job_ids = []
+        for card in cards:
+            if not card['job_id']:
+                continue
+            try:
+                details = scraper.open_job_in_panel(driver, card, previous_title)
+                previous_title = details.get('title', '')
+                panel_html = driver.execute_script("var p = document.querySelector(arguments[0]); return p ? p.outerHTML : '';", DETAIL_PANEL_CSS)
+                with open(os.path.join(details_dir, f"{card['job_id']}.html"), 'w', encoding='utf-8') as f:
+                    f.write(panel_html)
+                job_ids.append(card['job_id'])
+            except Exception as e:
+                print(f"  > Could not record job ID {card['job_id']}: {e}")
+        api_keys = save_api_responses(driver, api_dir, manifest['api'])
+        manifest['pages'].append({"file": page_file, "job_ids": job_ids, "api": api_keys})
+        print(f"  > Recorded {len(job_ids)} detail panels.")
+
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=4, ensure_ascii=False)
+    print(f"Recording complete: {len(manifest['pages'])} pages, {len(manifest['api'])} API responses.")
+
+def make_replay_handler(fixture_dir, replay_api=True):
+    """
+    Builds the request handler that serves a recorded fixture as if it were LinkedIn. With replay_api, each
+    page requests the API responses recorded with it, as LinkedIn's own scripts (stripped here) would.
+    """
+    manifest_path, details_dir, api_dir = fixture_paths(fixture_dir)
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    page_count = len(manifest['pages'])
+
+    class ReplayHandler(BaseHTTPRequestHandler):
+        def send_body(self, body, content_type="text/html; charset=utf-8", status=200):
+            data = body.encode('utf-8')
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def read_fixture(self, path):
+            with open(path, 'r', encoding='utf-8') as f:
+                return f.read()
+
+        def do_GET(self):
+            parsed = urlparse(self.path)
+            if parsed.path.startswith('/jobs/search'):
+                start = int(parse_qs(parsed.query).get('start', ['0'])[0])
+                page_number = start // scraper.RESULTS_PER_PAGE + 1
+                if page_number > page_count:
+                    return self.send_body("<html><body>No matching jobs found.</body></html>")
+                # Fixtures recorded before pages listed their API responses replay all of them with the first page.
+                page = manifest['pages'][page_number - 1]
+                api_urls = page.get('api', list(manifest['api']) if page_number == 1 else []) if replay_api else []
+                meta = (f'<div id="replay-meta" data-page="{page_number}" data-last="{1 if page_number == page_count else 0}"'
+                        f' data-api="{html_lib.escape(json.dumps(api_urls))}"></div>')
+                html = SCRIPT_TAG_PATTERN.sub('', self.read_fixture(os.path.join(fixture_dir, page['file'])))
+                script = REPLAY_SCRIPT % {"per_page": scraper.RESULTS_PER_PAGE, "panel": DETAIL_PANEL_CSS}
+                return self.send_body(html.replace('</body>', meta + script + '</body>', 1))
+            if match := re.match(r'^/(?:replay/details|jobs/view)/(\d+)', parsed.path):
+                detail_path = os.path.join(details_dir, f"{match.group(1)}.html")
+                if not os.path.exists(detail_path):
+                    return self.send_body("Not recorded", "text/plain", 404)
+                panel = self.read_fixture(detail_path)
+                if parsed.path.startswith('/replay/'):
+                    return self.send_body(panel)
+                return self.send_body(f"<html><body>{SCRIPT_TAG_PATTERN.sub('', panel)}</body></html>")
+            if parsed.path.startswith('/voyager/api/'):
+                key = parsed.path + ('?' + parsed.query if parsed.query else '')
+                file_name = manifest['api'].get(key) or next((name for url, name in manifest['api'].items() if url.split('?')[0] == parsed.path), None)
+                if not file_name:
+                    return self.send_body("{}", "application/json", 404)
+                return self.send_body(self.read_fixture(os.path.join(api_dir, file_name)), "application/json")
+            self.send_body("Not recorded", "text/plain", 404)
+
+        def log_message(self, format, *args):
+            pass # Keep benchmark output readable.
+
+    return ReplayHandler
+
+def start_replay_server(fixture_dir, port, replay_api=True):
+    """Serves the fixture from a background thread and returns the running server."""
+    server = ThreadingHTTPServer((REPLAY_HOST, port), make_replay_handler(fixture_dir, replay_api))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"Replaying '{fixture_dir}' at http://{REPLAY_HOST}:{port}/jobs/search/")
+    return server
+
+def launch_headless_chrome(extraction_mode):
+    """Starts a headless Chrome with a debugger port, so the detail-tab workers can attach to it too."""
+    chrome_options = Options()
+    chrome_options.add_argument("--headless=new")
+    chrome_options.add_argument(f"--remote-debugging-port={REPLAY_DEBUGGER_PORT}")
+    chrome_options.add_argument("--window-size=1400,1000")
+    if extraction_mode == "network":
+        enable_performance_logging(chrome_options)
+    driver = scraper.instrument_driver(webdriver.Chrome(options=chrome_options))
+    if extraction_mode == "network":
+        enable_network_capture(driver)
+    return driver
+
+def benchmark(fixture_dir, port, extraction_mode, fetch_mode, tabs):
+    """Runs the scraper end to end against the replayed fixture and reports its throughput."""
+    print(f"--- Scraper Benchmark: {extraction_mode} extraction, {fetch_mode} detail fetching ---")
+    # Only "network" extraction reads the API traffic; the other modes are measured without it, as before.
+    server = start_replay_server(fixture_dir, port, replay_api=extraction_mode == "network")
+    output_dir = tempfile.mkdtemp(prefix='scraper_benchmark_')
+
+    # Point the scraper at the replay server and a throwaway output directory.
+    scraper.EXTRACTION_MODE = extraction_mode
+    scraper.OPPORTUNITIES_BASE_DIR = os.path.join(output_dir, '3_Opportunities')
+    scraper.CHECKPOINT_FILE = os.path.join(output_dir, 'scrape_checkpoint.json')
+    detail_workers.JOB_VIEW_URL = f"http://{REPLAY_HOST}:{port}/jobs/view/{{job_id}}/"
+    os.makedirs(scraper.OPPORTUNITIES_BASE_DIR)
+    page_readiness.WAIT_TIMINGS.clear()
+    existing = sum(1 for _ in iter_opportunity_dirs(scraper.OPPORTUNITIES_BASE_DIR))
+
+    driver = launch_headless_chrome(extraction_mode)
+    detail_tabs = None
+    try:
+        if fetch_mode == "tabs":
+            detail_tabs = detail_workers.open_detail_tabs(tabs, f"127.0.0.1:{REPLAY_DEBUGGER_PORT}", scraper.instrument_driver)
+        query = {"name": "Replay", "url": f"http://{REPLAY_HOST}:{port}/jobs/search/?keywords=replay"}
+        started = time.perf_counter()
+        job_index = JobIndex(os.path.join(output_dir, 'job_index.db'), legacy_urls_file=None)
+        query_stats = scraper.run_search_schedule(driver, [query], job_index, detail_tabs)
+        elapsed = time.perf_counter() - started
+        calls = scraper.count_webdriver_calls(driver, detail_tabs)
+    finally:
+        if detail_tabs:
+            detail_workers.close_detail_tabs(detail_tabs)
+        driver.quit()
+        server.shutdown()
+
+    stats = query_stats["Replay"]
+    pages = max(stats['pages'], 1)
+    wait_seconds = sum(sum(timings) for timings in page_readiness.WAIT_TIMINGS.values())
+    created = sum(1 for _ in iter_opportunity_dirs(scraper.OPPORTUNITIES_BASE_DIR)) - existing
+    shutil.rmtree(output_dir, ignore_errors=True)
+
+    print("\n--- Benchmark Results ---")
+    print(f"Pages: {stats['pages']}, cards: {stats['cards']}, relevant jobs: {stats['scraped']}, folders created: {created}")
+    print(f"Wall time: {elapsed:.2f}s ({stats['cards'] / elapsed if elapsed else 0:.2f} jobs/sec)")
+    print(f"WebDriver round trips: {calls} total, {calls / pages:.1f} per page")
+    print(f"Readiness wait time: {wait_seconds:.2f}s total, {wait_seconds / pages:.2f}s per page")
+    page_readiness.print_wait_summary()
+
+def main():
+    """Command-line entry point: record, serve or benchmark."""
+    parser = argparse.ArgumentParser(description="Offline record/replay harness and benchmark for the LinkedIn scraper.")
+    parser.add_argument('--fixture', default=os.path.join(FIXTURES_BASE_DIR, 'default'), help="Fixture directory to record into or replay from.")
+    parser.add_argument('--port', type=int, default=REPLAY_PORT, help="Port of the local replay server.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    record_parser = commands.add_parser('record', help="Record pages from the Chrome instance on the debugger port.")
+    record_parser.add_argument('--url', default=scraper.SEARCH_URL, help="Search URL to record.")
+    record_parser.add_argument('--pages', type=int, default=2, help="Number of result pages to record.")
+
+    commands.add_parser('serve', help="Serve a recorded fixture until interrupted.")
+
+    benchmark_parser = commands.add_parser('benchmark', help="Run the scraper against a recorded fixture in headless Chrome.")
+    benchmark_parser.add_argument('--mode', choices=["snapshot", "legacy", "network"], default=scraper.EXTRACTION_MODE, help="Extraction mode to measure.")
+    benchmark_parser.add_argument('--fetch', choices=["panel", "tabs"], default="panel", help="Detail fetching mode to measure.")
+    benchmark_parser.add_argument('--tabs', type=int, default=scraper.DETAIL_TABS, help="Number of detail tabs in 'tabs' mode.")
+
+    args = parser.parse_args()
+    if args.command == 'record':
+        record(args.url, args.pages, args.fixture)
+    elif args.command == 'serve':
+        server = start_replay_server(args.fixture, args.port)
+        try:
+            while True: time.sleep(1)
+        except KeyboardInterrupt:
+            server.shutdown()
+    elif args.command == 'benchmark':
+        if not os.path.exists(fixture_paths(args.fixture)[0]):
+            print(f"ERROR: No recorded fixture found at '{args.fixture}'. Run the 'record' command first."); sys.exit(1)
+        benchmark(args.fixture, args.port, args.mode, args.fetch, args.tabs)
+
+if __name__ == '__main__':
+    main()
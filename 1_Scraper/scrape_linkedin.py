@@ -2,125 +2,450 @@
 
 import os
 import re
+import sys
+import json
 import time
 import datetime
+from urllib.parse import urlparse, parse_qs, urlencode, urlunparse, quote
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
+from page_readiness import wait_for_job_list, wait_for_detail_panel, wait_for_next_page, read_page_markers, print_wait_summary
+from detail_workers import open_detail_tabs, close_detail_tabs, fetch_details_parallel
+from network_capture import enable_performance_logging, enable_network_capture, harvest_job_postings
+from relevance import is_relevant
 
 # --- Dynamic Path Configuration ---
 SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
 PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
 OPPORTUNITIES_BASE_DIR = os.path.join(PROJECT_ROOT, '3_Opportunities')
-PROCESSED_URLS_FILE = os.path.join(PROJECT_ROOT, 'processed_urls.txt')
+CHECKPOINT_FILE = os.path.join(PROJECT_ROOT, 'scrape_checkpoint.json')
+SEARCH_QUERIES_FILE = os.path.join(PROJECT_ROOT, 'search_queries.json')
 SEARCH_URL = "https://www.linkedin.com/jobs/search/?currentJobId=4278928885&distance=25&f_TPR=r86400&geoId=90000596&keywords=Scrum%20master&origin=JOB_SEARCH_PAGE_JOB_FILTER&refresh=true&sortBy=DD"
 
-def load_processed_urls():
-    """Loads all previously processed URLs from the log file into a set for fast lookups."""
-    if not os.path.exists(PROCESSED_URLS_FILE):
-        return set()
-    with open(PROCESSED_URLS_FILE, 'r', encoding='utf-8') as f:
-        return {line.strip() for line in f if line.strip()}
-
-def log_processed_url(url):
-    """Appends a new, successfully processed URL to the log file."""
-    with open(PROCESSED_URLS_FILE, 'a', encoding='utf-8') as f:
-        f.write(url + '\n')
-
-def scrape_jobs_on_current_page(driver, processed_urls):
-    """Scrapes all job postings on the currently visible page."""
-    job_postings = []
-    required_keywords = ["scrum", "software", "tech", "technology", "it", "agile", "app", "application", "web", "mobile"]
+# Modules shared by all phases (job_index, near_duplicates, ...) live in the project root.
+sys.path.insert(0, PROJECT_ROOT)
+from job_index import JobIndex, extract_job_id, canonical_job_id
+from near_duplicates import NearDuplicateIndex, minhash_signature
+from opportunity_catalog import OpportunityCatalog
+from opportunity_paths import new_opportunity_path, folder_key
+from work_queue import WorkQueue
+
+# --- Search Schedule Configuration ---
+# Searches are read from search_queries.json; SEARCH_URL is used alone if that file is missing.
+# "sequential" crawls each query to the end before the next one.
+# "interleaved" takes one page from each query in turn over the same browser tab.
+SCHEDULE_MODE = "sequential"
+SEARCH_URL_DEFAULTS = {
+    "distance": "25", "f_TPR": "r86400", "origin": "JOB_SEARCH_PAGE_JOB_FILTER", "refresh": "true", "sortBy": "DD"
+}
+
+# --- Incremental Crawl Configuration ---
+# SEARCH_URL is sorted by date, so once the crawl reaches jobs it has already processed the
+# remaining pages are older and already known. Incremental mode stops paging at that point.
+INCREMENTAL_MODE = True
+KNOWN_STREAK_LIMIT = 10 # Stop after this many consecutive already-processed job IDs.
+RESULTS_PER_PAGE = 25
+
+# --- Near-duplicate Configuration ---
+# Recruiters often repost the same job under a new ID or company name. A posting whose description
+# is at least NEAR_DUPLICATE_THRESHOLD similar to an existing opportunity is either skipped ("skip")
+# or saved with a "Duplicate-Of:" line so the tailor reuses the original's data.txt ("link").
+# "off" disables the check.
+NEAR_DUPLICATE_ACTION = "link"
+NEAR_DUPLICATE_THRESHOLD = 0.8
+
+# --- Extraction Configuration ---
+# "snapshot" reads each page and each detail panel with one execute_script call.
+# "legacy" makes one WebDriver call per element, as the scraper originally did.
+# "network" parses job records from the API responses captured through the DevTools Network
+# domain, without clicking the cards; jobs it cannot find fall back to the snapshot panel path.
+EXTRACTION_MODE = "snapshot"
+JOB_LIST_SELECTOR = 'li.occludable-update'
+RIGHT_PANEL_TITLE_CSS = "div.job-details-jobs-unified-top-card__job-title > h1"
+RIGHT_PANEL_TITLE_SELECTOR = (By.CSS_SELECTOR, RIGHT_PANEL_TITLE_CSS)
+NEXT_PAGE_BUTTON_CSS = "button[aria-label='View next page']"
+DEBUGGER_ADDRESS = "127.0.0.1:9222"
+
+# "panel" clicks each card and reads the detail panel in the search tab, one job at a time.
+# "tabs" opens DETAIL_TABS extra tabs and loads the job view pages in parallel.
+DETAIL_FETCH_MODE = "panel"
+DETAIL_TABS = 3
+
+# LinkedIn only renders a card's contents once it has been scrolled into view ("occludable"),
+# so the script scrolls through the list and waits briefly for each card before reading it.
+JOB_CARDS_JS = """
+var selector = arguments[0], done = arguments[arguments.length - 1];
+var items = Array.prototype.slice.call(document.querySelectorAll(selector));
+function readCard(li, index) {
+    var link = li.querySelector('a[aria-label]') || li.querySelector('a[href*="/jobs/view/"]');
+    var company = li.querySelector('.artdeco-entity-lockup__subtitle');
+    var idHolder = li.querySelector('[data-job-id]');
+    var href = link ? link.href : '';
+    var idMatch = href.match(/\\/jobs\\/view\\/(\\d+)/);
+    var label = link ? (link.getAttribute('aria-label') || link.innerText || '') : '';
+    return {
+        index: index,
+        title: label.replace(' with verification', '').trim(),
+        company: company ? company.innerText.trim() : '',
+        job_id: li.getAttribute('data-occludable-job-id') || (idHolder ? idHolder.getAttribute('data-job-id') : '') || (idMatch ? idMatch[1] : ''),
+        link: href
+    };
+}
+var cards = [], index = 0, attempts = 0;
+function step() {
+    if (index >= items.length) { done(cards); return; }
+    var li = items[index];
+    li.scrollIntoView({block: 'center'});
+    if (!li.querySelector('a[aria-label]') && attempts < 10) { attempts++; setTimeout(step, 50); return; }
+    cards.push(readCard(li, index));
+    index++; attempts = 0;
+    step();
+}
+step();
+"""
+
+CLICK_CARD_JS = """
+var li = document.querySelectorAll(arguments[0])[arguments[1]];
+li.scrollIntoView({block: 'center'});
+(li.querySelector('a[aria-label]') || li.querySelector('[data-job-id]') || li).click();
+"""
+
+JOB_DETAILS_JS = """
+function text(selector) {
+    var el = document.querySelector(selector);
+    return el ? el.innerText.trim() : '';
+}
+var applyButton = '';
+if (document.querySelector("button.jobs-apply-button[aria-label*='Apply on company website']")) { applyButton = 'company_website'; }
+else if (document.querySelector("button.jobs-apply-button[aria-label*='Easy Apply']")) { applyButton = 'easy_apply'; }
+return {
+    title: text('div.job-details-jobs-unified-top-card__job-title > h1'),
+    company: text('.job-details-jobs-unified-top-card__company-name a'),
+    description: text('#job-details'),
+    location: text('.job-details-jobs-unified-top-card__tertiary-description-container'),
+    hiring_team: text('span.jobs-poster__name'),
+    apply_button: applyButton,
+    url: window.location.href
+};
+"""
+
+def load_search_queries():
+    """Loads the enabled searches from search_queries.json, falling back to SEARCH_URL alone."""
+    default_queries = [{"name": "Default search", "url": SEARCH_URL}]
+    if not os.path.exists(SEARCH_QUERIES_FILE):
+        return default_queries
+    try:
+        with open(SEARCH_QUERIES_FILE, 'r', encoding='utf-8') as f:
+            queries = json.load(f)
+    except json.JSONDecodeError as e:
+        print(f"ERROR: Could not parse '{os.path.basename(SEARCH_QUERIES_FILE)}': {e}. Using SEARCH_URL only.")
+        return default_queries
+    return [query for query in queries if query.get('enabled', True)]
+
+def build_search_url(query):
+    """Returns the search URL for a query entry, either given as 'url' or built from 'keywords' and 'filters'."""
+    if query.get('url'):
+        return query['url']
+    params = dict(SEARCH_URL_DEFAULTS)
+    params.update(query.get('filters', {}))
+    params['keywords'] = query['keywords']
+    return "https://www.linkedin.com/jobs/search/?" + urlencode(params, quote_via=quote)
+
+def load_checkpoints():
+    """Loads the crawl checkpoints left by interrupted runs, keyed by search URL."""
+    if not os.path.exists(CHECKPOINT_FILE):
+        return {}
+    try:
+        with open(CHECKPOINT_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (json.JSONDecodeError, FileNotFoundError):
+        return {}
+
+def save_checkpoints(checkpoints):
+    """Saves all crawl checkpoints to the JSON file, removing it when none are left."""
+    if not checkpoints:
+        if os.path.exists(CHECKPOINT_FILE):
+            os.remove(CHECKPOINT_FILE)
+        return
+    with open(CHECKPOINT_FILE, 'w', encoding='utf-8') as f:
+        json.dump(checkpoints, f, indent=4, ensure_ascii=False)
+
+def load_checkpoint(search_url):
+    """Returns the checkpoint (page number, last job ID) of an interrupted crawl of this search, if any."""
+    return load_checkpoints().get(search_url)
+
+def save_checkpoint(search_url, page_number, last_job_id):
+    """Records the page a search is on, so a crash or disconnect resumes here instead of page 1."""
+    checkpoints = load_checkpoints()
+    checkpoints[search_url] = {
+        "page_number": page_number, "last_job_id": last_job_id,
+        "updated_at": datetime.datetime.now().isoformat()
+    }
+    save_checkpoints(checkpoints)
+
+def clear_checkpoint(search_url):
+    """Removes a search's checkpoint once its crawl finishes cleanly."""
+    checkpoints = load_checkpoints()
+    if checkpoints.pop(search_url, None) is not None:
+        save_checkpoints(checkpoints)
+
+def build_page_url(search_url, page_number):
+    """Returns the search URL pointed at the given 1-based results page."""
+    parts = urlparse(search_url)
+    query = parse_qs(parts.query, keep_blank_values=True)
+    query.pop('start', None)
+    if page_number > 1:
+        query['start'] = [str((page_number - 1) * RESULTS_PER_PAGE)]
+    return urlunparse(parts._replace(query=urlencode(query, doseq=True, quote_via=quote)))
+
+def instrument_driver(driver):
+    """Wraps driver.execute so every WebDriver round trip to chromedriver is counted in driver.command_count."""
+    original_execute = driver.execute
+    driver.command_count = 0
+
+    def counting_execute(driver_command, params=None):
+        driver.command_count += 1
+        return original_execute(driver_command, params)
+
+    driver.execute = counting_execute
+    return driver
+
+def count_webdriver_calls(driver, detail_tabs=None):
+    """Returns the WebDriver round trips made so far by the search tab and any detail tabs."""
+    return getattr(driver, 'command_count', 0) + sum(getattr(tab, 'command_count', 0) for tab in detail_tabs or [])
+
+def read_job_cards(driver):
+    """Returns title, company, job ID and link for every card on the page in a single execute_async_script call."""
+    driver.set_script_timeout(30)
+    return driver.execute_async_script(JOB_CARDS_JS, JOB_LIST_SELECTOR)
+
+def read_job_cards_legacy(driver):
+    """Per-element version of read_job_cards, kept so both extraction modes can be compared."""
+    cards = []
+    for index, job_item in enumerate(driver.find_elements(By.CSS_SELECTOR, JOB_LIST_SELECTOR)):
+        try:
+            title = job_item.find_element(By.CSS_SELECTOR, 'a[aria-label]').get_attribute('aria-label').replace(" with verification", "").strip()
+        except NoSuchElementException:
+            title = ""
+        cards.append({"index": index, "title": title, "company": "", "job_id": job_item.get_attribute('data-occludable-job-id') or "", "link": ""})
+    return cards
+
+def open_job_card(driver, card):
+    """Scrolls the card into view and clicks it with a single execute_script call."""
+    driver.execute_script(CLICK_CARD_JS, JOB_LIST_SELECTOR, card['index'])
+
+def open_job_card_legacy(driver, card):
+    """Re-finds the card element and clicks it through individual WebDriver calls."""
+    job_item = driver.find_elements(By.CSS_SELECTOR, JOB_LIST_SELECTOR)[card['index']]
+    driver.execute_script("arguments[0].scrollIntoView(true);", job_item)
+    job_item.click()
+
+def open_job_in_panel(driver, card, previous_title):
+    """Clicks a card, waits for its detail panel to load and returns the panel's detail snapshot."""
+    legacy = EXTRACTION_MODE == "legacy"
+    if legacy: open_job_card_legacy(driver, card)
+    else: open_job_card(driver, card)
+    wait_for_detail_panel(driver, RIGHT_PANEL_TITLE_CSS, card['title'], previous_title)
+    return read_job_details_legacy(driver) if legacy else read_job_details(driver)
+
+def read_job_details(driver):
+    """Returns the detail-panel fields of the currently open job as one JavaScript snapshot."""
+    return driver.execute_script(JOB_DETAILS_JS)
+
+def read_job_details_legacy(driver):
+    """Per-element version of read_job_details, kept so both extraction modes can be compared."""
+    details_panel = driver.find_element(By.CLASS_NAME, "jobs-details__main-content")
+
+    def get_element_text(parent, by, value):
+        try: return parent.find_element(by, value).text.strip()
+        except NoSuchElementException: return ""
+
+    apply_button = ""
+    try:
+        details_panel.find_element(By.CSS_SELECTOR, "button.jobs-apply-button[aria-label*='Apply on company website']")
+        apply_button = "company_website"
+    except NoSuchElementException:
+        try:
+            details_panel.find_element(By.CSS_SELECTOR, "button.jobs-apply-button[aria-label*='Easy Apply']")
+            apply_button = "easy_apply"
+        except NoSuchElementException:
+            pass
+
+    return {
+        "title": get_element_text(details_panel, *RIGHT_PANEL_TITLE_SELECTOR),
+        "company": get_element_text(details_panel, By.CSS_SELECTOR, ".job-details-jobs-unified-top-card__company-name a"),
+        "description": get_element_text(details_panel, By.ID, "job-details"),
+        "location": get_element_text(details_panel, By.CLASS_NAME, "job-details-jobs-unified-top-card__tertiary-description-container"),
+        "hiring_team": get_element_text(details_panel, By.CSS_SELECTOR, "span.jobs-poster__name"),
+        "apply_button": apply_button,
+        "url": driver.current_url,
+    }
+
+def build_job_info(details):
+    """Turns a detail-panel snapshot into the job_info dict used by create_opportunity_folder, or None if irrelevant."""
+    role_name = details.get('title', '')
+    company_name = details.get('company', '')
+    job_description = details.get('description', '')
+
+    job_description_lower = job_description.lower()
+    relevant, relevance_score = is_relevant(job_description)
+    if not relevant:
+        print(f"  > INFO: Skipping '{role_name}' - relevance score {relevance_score} is below the threshold.")
+        return None
+
+    raw_location_text = details.get('location', '')
+    location = raw_location_text.split('·')[0].strip() if raw_location_text else "Not specified"
+    hiring_team = details.get('hiring_team') or "Not identified"
+
+    application_instructions = "See Job Post URL"
+    if details.get('apply_button') == "company_website":
+        application_instructions = "Apply on company website (button in job post)"
+    elif details.get('apply_button') == "easy_apply":
+        application_instructions = "LinkedIn Easy Apply"
+    elif emails := re.findall(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', job_description):
+        application_instructions = f"Apply by emailing: {', '.join(emails)}"
+
+    job_type = 'Remote' if 'remote' in job_description_lower else 'On-site' if 'on-site' in job_description_lower or 'onsite' in job_description_lower else 'Hybrid' if 'hybrid' in job_description_lower else 'Not specified'
+    salary_range = "Not specified"
+    if salaries := re.findall(r'\$[0-9,.]+[Kk]?\s*[-–to]+\s*\$[0-9,.]+[Kk]?', job_description): salary_range = salaries[0]
+
+    return {
+        "job_board": "LinkedIn", "company_name": company_name, "role_name": role_name,
+        "location": location, "type": job_type, "salary_range": salary_range,
+        "hiring_team": hiring_team, "application_instructions": application_instructions,
+        "job_post_url": details.get('url', ''), "job_description": job_description
+    }
+
+def scrape_jobs_on_current_page(driver, processed_job_ids, crawl_state=None, seen_job_ids=None, detail_tabs=None):
+    """
+    Scrapes the job postings on the currently visible page, yielding each job_info as soon as it is extracted.
+    Cards whose job ID is in processed_job_ids (a JobIndex or set) or, when seen_job_ids is given, was already opened by another
+    query in this run are skipped. crawl_state, if given, tracks the card count, known count, consecutive
+    known streak and last job ID. With detail_tabs, the remaining detail pages are loaded in parallel.
+    """
+    scraped_count = 0
+    skipped_known = 0
+    detail_fetches = 0
+    pending_cards = []
+    if crawl_state is None:
+        crawl_state = {}
+    if seen_job_ids is None:
+        seen_job_ids = set()
+    crawl_state.update(cards=0, known=0, duplicates=0)
+    crawl_state.setdefault('known_streak', 0)
+    legacy = EXTRACTION_MODE == "legacy"
     
     try:
-        job_list_selector = (By.CSS_SELECTOR, 'li.occludable-update')
-        
-        # --- THIS IS THE FIX ---
-        # Wait for the individual job items (li) to be present, not the parent ul with a random class.
+        # Wait for the individual job items (li) to be rendered, not the parent ul with a random class.
         print("Waiting for job list items to render on the new page...")
-        WebDriverWait(driver, 15).until(EC.presence_of_all_elements_located(job_list_selector))
-        time.sleep(2) # Allow extra time for all elements to fully render after being detected.
+        wait_for_job_list(driver, JOB_LIST_SELECTOR)
+
+        page_started = time.perf_counter()
+        calls_before = count_webdriver_calls(driver, detail_tabs)
         
-        job_items = driver.find_elements(*job_list_selector)
-        print(f"Found {len(job_items)} job listings on this page.")
+        job_cards = read_job_cards_legacy(driver) if legacy else read_job_cards(driver)
+        print(f"Found {len(job_cards)} job listings on this page.")
+        crawl_state['cards'] = len(job_cards)
+        previous_title = read_page_markers(driver, JOB_LIST_SELECTOR, RIGHT_PANEL_TITLE_CSS)['detail_title']
 
-        for index in range(len(job_items)):
-            job_item = driver.find_elements(*job_list_selector)[index]
-            print(f"\n--- Processing job {index + 1} of {len(job_items)} ---")
+        for card in job_cards:
+            print(f"\n--- Processing job {card['index'] + 1} of {len(job_cards)} ---")
             
             try:
-                left_panel_title_element = job_item.find_element(By.CSS_SELECTOR, 'a[aria-label]')
-                left_panel_title = left_panel_title_element.get_attribute('aria-label').replace(" with verification", "").strip()
+                left_panel_title = card['title']
                 print(f"  > Job on left: '{left_panel_title}'")
-                
-                driver.execute_script("arguments[0].scrollIntoView(true);", job_item)
-                time.sleep(0.5)
-                job_item.click()
 
-                right_panel_title_selector = (By.CSS_SELECTOR, "div.job-details-jobs-unified-top-card__job-title > h1")
-                WebDriverWait(driver, 15).until(EC.text_to_be_present_in_element(right_panel_title_selector, left_panel_title))
-                
-                details_panel = driver.find_element(By.CLASS_NAME, "jobs-details__main-content")
-
-                def get_element_text(parent, by, value):
-                    try: return parent.find_element(by, value).text.strip()
-                    except NoSuchElementException: return ""
+                job_id = card['job_id'] or extract_job_id(card['link'])
+                crawl_state['last_job_id'] = job_id
+                if job_id and (job_id in processed_job_ids or job_id in seen_job_ids):
+                    skipped_known += 1
+                    crawl_state['known'] += 1
+                    crawl_state['known_streak'] += 1
+                    if job_id in processed_job_ids:
+                        print(f"  > INFO: Skipping already processed job ID {job_id} without opening it.")
+                    else:
+                        crawl_state['duplicates'] += 1
+                        print(f"  > INFO: Skipping job ID {job_id}, already opened by another query in this run.")
+                    if INCREMENTAL_MODE and crawl_state['known_streak'] >= KNOWN_STREAK_LIMIT:
+                        print(f"  > INFO: {KNOWN_STREAK_LIMIT} consecutive known jobs seen. The rest of the results are older.")
+                        break
+                    continue
+                crawl_state['known_streak'] = 0
+                if job_id: seen_job_ids.add(job_id)
+                detail_fetches += 1
 
-                role_name = get_element_text(details_panel, *right_panel_title_selector)
-                company_name = get_element_text(details_panel, By.CSS_SELECTOR, ".job-details-jobs-unified-top-card__company-name a")
-                job_description = get_element_text(details_panel, By.ID, "job-details")
-                
-                job_description_lower = job_description.lower()
-                if not any(keyword in job_description_lower for keyword in required_keywords):
-                    print(f"  > INFO: Skipping '{role_name}' - does not meet keyword criteria.")
+                if job_id and (detail_tabs or EXTRACTION_MODE == "network"):
+                    pending_cards.append((card, job_id))
                     continue
                 
-                raw_location_text = get_element_text(details_panel, By.CLASS_NAME, "job-details-jobs-unified-top-card__tertiary-description-container")
-                location = raw_location_text.split('·')[0].strip() if raw_location_text else "Not specified"
-                hiring_team = get_element_text(details_panel, By.CSS_SELECTOR, "span.jobs-poster__name") or "Not identified"
-                
-                application_instructions = "See Job Post URL"
-                try:
-                    details_panel.find_element(By.CSS_SELECTOR, "button.jobs-apply-button[aria-label*='Apply on company website']")
-                    application_instructions = "Apply on company website (button in job post)"
-                except NoSuchElementException:
-                    try:
-                        details_panel.find_element(By.CSS_SELECTOR, "button.jobs-apply-button[aria-label*='Easy Apply']")
-                        application_instructions = "LinkedIn Easy Apply"
-                    except NoSuchElementException:
-                        if emails := re.findall(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', job_description):
-                            application_instructions = f"Apply by emailing: {', '.join(emails)}"
-                
-                job_type = 'Remote' if 'remote' in job_description_lower else 'On-site' if 'on-site' in job_description_lower or 'onsite' in job_description_lower else 'Hybrid' if 'hybrid' in job_description_lower else 'Not specified'
-                salary_range = "Not specified"
-                if salaries := re.findall(r'\$[0-9,.]+[Kk]?\s*[-–to]+\s*\$[0-9,.]+[Kk]?', job_description): salary_range = salaries[0]
-
-                job_info = {
-                    "job_board": "LinkedIn", "company_name": company_name, "role_name": role_name,
-                    "location": location, "type": job_type, "salary_range": salary_range,
-                    "hiring_team": hiring_team, "application_instructions": application_instructions,
-                    "job_post_url": driver.current_url, "job_description": job_description
-                }
-                job_postings.append(job_info)
-                print(f"  > SUCCESS: Scraped '{role_name}' at '{company_name}'")
+                details = open_job_in_panel(driver, card, previous_title)
+                previous_title = details.get('title', '')
+                if job_info := build_scraped_job(details, job_id, processed_job_ids):
+                    scraped_count += 1
+                    yield job_info
 
             except Exception as e:
                 print(f"  > An unexpected error occurred while scraping: {e}. Skipping.")
                 continue
+
+        if pending_cards:
+            job_ids = [job_id for _, job_id in pending_cards]
+            if EXTRACTION_MODE == "network":
+                print(f"\nHarvesting {len(pending_cards)} job records from captured API responses...")
+                results = harvest_job_postings(driver, job_ids, crawl_state.setdefault('captured_postings', {}))
+                print(f"  > {sum(1 for details in results if details)} of {len(results)} found in network traffic.")
+            else:
+                print(f"\nLoading {len(pending_cards)} job details across {len(detail_tabs)} tabs...")
+                results = fetch_details_parallel(detail_tabs, job_ids, JOB_DETAILS_JS, RIGHT_PANEL_TITLE_CSS)
+            for (card, job_id), details in zip(pending_cards, results):
+                if details is None and EXTRACTION_MODE == "network":
+                    try:
+                        print(f"  > Job ID {job_id} was not in the captured responses. Opening its card instead.")
+                        details = open_job_in_panel(driver, card, previous_title)
+                        previous_title = details.get('title', '')
+                    except Exception as e:
+                        print(f"  > An unexpected error occurred while scraping: {e}. Skipping.")
+                        continue
+                if details and (job_info := build_scraped_job(details, job_id, processed_job_ids)):
+                    scraped_count += 1
+                    yield job_info
+
+        page_seconds = time.perf_counter() - page_started
+        page_calls = count_webdriver_calls(driver, detail_tabs) - calls_before
+        per_card = page_calls / len(job_cards) if job_cards else 0
+        jobs_per_minute = detail_fetches / page_seconds * 60 if page_seconds else 0
+        print(f"\nPage stats ({EXTRACTION_MODE} mode, {'%d tabs' % len(detail_tabs) if detail_tabs else 'single tab'}): "
+              f"{len(job_cards)} cards ({skipped_known} already processed, {scraped_count} relevant) in {page_seconds:.1f}s, "
+              f"{page_calls} WebDriver calls ({per_card:.1f} per card), {detail_fetches} details at {jobs_per_minute:.1f} jobs/min.")
     except TimeoutException:
         print("\nFATAL: The job list did not load. The primary script selector 'li.occludable-update' is likely wrong.")
-    return job_postings
 
-def create_opportunity_folder(job_data):
-    """Creates the folder and the detailed jobdescription.txt file."""
-    sanitized_company = "".join(c for c in job_data.get('company_name', 'Unknown_Company') if c.isalnum() or c in (' ', '-', '_')).strip().replace(' ', '_')
-    sanitized_role = "".join(c for c in job_data.get('role_name', 'Unknown_Role') if c.isalnum() or c in (' ', '_')).strip().replace(' ', '_')
-    date_str = datetime.date.today().strftime("%Y-%m-%d")
-    folder_name = f"{sanitized_company}_{sanitized_role}_{date_str}"
-    folder_path = os.path.join(OPPORTUNITIES_BASE_DIR, folder_name)
+def build_scraped_job(details, job_id, processed_job_ids=None):
+    """
+    Builds the job_info dict for a detail snapshot, tags it with its job ID and reports the result. A job the
+    relevance filter rejects is recorded in processed_job_ids (a JobIndex or set), so later runs skip its card
+    without opening it and count it toward the known streak.
+    """
+    job_info = build_job_info(details)
+    if job_info is None:
+        job_id = job_id or extract_job_id(details.get('url', ''))
+        if job_id and isinstance(processed_job_ids, JobIndex):
+            processed_job_ids.add(job_id, details.get('url'), source="irrelevant")
+        elif job_id and processed_job_ids is not None:
+            processed_job_ids.add(job_id)
+        return None
+    job_info['job_id'] = job_id or extract_job_id(job_info['job_post_url'])
+    print(f"  > SUCCESS: Scraped '{job_info['role_name']}' at '{job_info['company_name']}'")
+    return job_info
+
+def create_opportunity_folder(job_data, catalog=None):
+    """Creates the folder and the detailed jobdescription.txt file, and adds it to the catalog if one is given."""
+    folder_path = new_opportunity_path(job_data.get('company_name', 'Unknown_Company'), job_data.get('role_name', 'Unknown_Role'),
+                                       job_data.get('job_id'), base_dir=OPPORTUNITIES_BASE_DIR)
 
     if os.path.exists(folder_path): return None
     try:
@@ -128,6 +453,8 @@ def create_opportunity_folder(job_data):
         job_desc_path = os.path.join(folder_path, "jobdescription.txt")
         with open(job_desc_path, 'w', encoding='utf-8') as f:
             f.write("Status: pending\n"); f.write("Data-Status: pending\n")
+            if job_data.get('duplicate_of'):
+                f.write(f"Duplicate-Of: {job_data['duplicate_of']}\n")
             f.write(f"Job board: {job_data.get('job_board', 'N/A')}\n")
             f.write(f"Company Name: {job_data.get('company_name', 'N/A')}\n")
             f.write(f"Role Name: {job_data.get('role_name', 'N/A')}\n")
@@ -138,71 +465,206 @@ def create_opportunity_folder(job_data):
             f.write(f"Application Instructions: {job_data.get('application_instructions', 'N/A')}\n")
             f.write(f"Job post URL: {job_data.get('job_post_url', 'N/A')}\n\n")
             f.write(f"Job Description:\n{job_data.get('job_description', 'N/A')}\n")
+        if catalog is not None:
+            catalog.sync_folder(folder_path)
         return folder_path
     except OSError as e:
         print(f"  > Error creating directory {folder_path}: {e}")
         return None
 
-def main():
-    """Main function to run the scraper, handling pagination."""
-    print("--- Phase 1: LinkedIn Job Scraper (with Pagination) ---")
-    
-    if not os.path.exists(OPPORTUNITIES_BASE_DIR):
-        os.makedirs(OPPORTUNITIES_BASE_DIR)
-        
-    processed_urls = load_processed_urls()
-    print(f"Loaded {len(processed_urls)} previously processed URLs.")
-    
-    print("Connecting to the existing Chrome browser on port 9222...")
-    try:
-        chrome_options = Options(); chrome_options.add_experimental_option("debuggerAddress", "127.0.0.1:9222")
-        driver = webdriver.Chrome(options=chrome_options)
-        print("Successfully connected to the browser.")
-        driver.get(SEARCH_URL)
-    except Exception as e:
-        print(f"FATAL: Could not connect to Chrome. Error: {e}"); return
+def save_scraped_job(job, job_index, duplicate_index=None, catalog=None, work_queue=None):
+    """
+    Creates the opportunity folder for a scraped job, records it in the job index and, when given, the
+    near-duplicate index, and queues it for tailoring. Returns the folder path or None.
+    """
+    job_url = job.get('job_post_url', '').split('&')[0]
+    job_id = job.get('job_id') or canonical_job_id(job_url)
+    if job_id in job_index:
+        print(f"  -> INFO: Skipping duplicate job (job ID already processed): {job.get('role_name', 'N/A')}")
+        return None
+
+    signature = None
+    if duplicate_index is not None:
+        signature = minhash_signature(job.get('job_description', ''))
+        if match := duplicate_index.find(None, NEAR_DUPLICATE_THRESHOLD, signature=signature):
+            original, similarity = match
+            if NEAR_DUPLICATE_ACTION == "skip":
+                print(f"  -> INFO: Skipping repost ({similarity:.0%} similar to '{original}'): {job.get('role_name', 'N/A')}")
+                job_index.add(job_id, job_url, source="near_duplicate")
+                return None
+            print(f"  -> INFO: Linking repost to '{original}' ({similarity:.0%} similar).")
+            job = {**job, "duplicate_of": original}
+
+    folder_path = create_opportunity_folder(job, catalog)
+    if folder_path:
+        print(f"  -> SUCCESS: Created new opportunity folder at: {folder_path}")
+        job_index.add(job_id, job_url, source="scraper")
+        if duplicate_index is not None:
+            duplicate_index.add(folder_key(folder_path, OPPORTUNITIES_BASE_DIR), None, signature=signature)
+        if work_queue is not None:
+            work_queue.enqueue("tailor", folder_key(folder_path, OPPORTUNITIES_BASE_DIR))
+    else:
+        print(f"  -> INFO: Skipping opportunity (folder may exist for today): {job.get('role_name', 'N/A')}")
+    return folder_path
+
+def crawl_search(driver, query, session):
+    """
+    Crawls one search query page by page, yielding after each page so the scheduler can interleave queries.
+    session holds the shared dedupe sets, the URL the tab is currently on, the per-query stats and the
+    optional on_opportunity_created callback, which is called as soon as each folder is written.
+    """
+    name = query.get('name') or query.get('keywords') or 'Unnamed search'
+    search_url = build_search_url(query)
+    stats = session['stats'][name] = {"pages": 0, "cards": 0, "processed": 0, "duplicates": 0, "scraped": 0, "created": 0}
 
     page_number = 1
-    new_opportunities_count = 0
-    
+    checkpoint = load_checkpoint(search_url)
+    if checkpoint:
+        page_number = checkpoint.get('page_number', 1)
+        print(f"[{name}] Resuming interrupted crawl at page {page_number} (last job ID {checkpoint.get('last_job_id')}).")
+
+    crawl_state = {}
     while True:
-        print(f"\n--- Scraping Page {page_number} ---")
-        scraped_jobs_on_page = scrape_jobs_on_current_page(driver, processed_urls)
-        
-        if not scraped_jobs_on_page:
-            print("No new relevant jobs found on this page.")
-        
-        for job in scraped_jobs_on_page:
-            job_url = job.get('job_post_url', '').split('&')[0]
-            if job_url in processed_urls:
-                print(f"  -> INFO: Skipping duplicate job (URL already processed): {job.get('role_name', 'N/A')}")
-                continue
+        if session['active_url'] != search_url:
+            # Either the first page of this query or another query has used the tab since our last page.
+            driver.get(build_page_url(search_url, page_number))
+            session['active_url'] = search_url
 
-            folder_path = create_opportunity_folder(job)
+        print(f"\n--- [{name}] Scraping Page {page_number} ---")
+        save_checkpoint(search_url, page_number, crawl_state.get('last_job_id'))
+        scraped_on_page = 0
+        for job in scrape_jobs_on_current_page(driver, session['job_index'], crawl_state, session['seen_job_ids'], session['detail_tabs']):
+            scraped_on_page += 1
+            folder_path = save_scraped_job(job, session['job_index'], session['duplicate_index'], session['catalog'], session['work_queue'])
             if folder_path:
-                print(f"  -> SUCCESS: Created new opportunity folder at: {folder_path}")
-                new_opportunities_count += 1
-                log_processed_url(job_url)
-                processed_urls.add(job_url)
-            else:
-                print(f"  -> INFO: Skipping opportunity (folder may exist for today): {job.get('role_name', 'N/A')}")
-        
+                stats['created'] += 1
+                if session['on_opportunity_created']:
+                    session['on_opportunity_created'](folder_path, job)
+
+        if not scraped_on_page:
+            print("No new relevant jobs found on this page.")
+
+        stats['pages'] += 1
+        stats['cards'] += crawl_state['cards']
+        stats['processed'] += crawl_state['known'] - crawl_state['duplicates']
+        stats['duplicates'] += crawl_state['duplicates']
+        stats['scraped'] += scraped_on_page
+
+        if INCREMENTAL_MODE:
+            if crawl_state['cards'] and crawl_state['known'] == crawl_state['cards']:
+                print(f"[{name}] Every job on this page was already seen. Stopping incremental crawl.")
+                break
+            if crawl_state['known_streak'] >= KNOWN_STREAK_LIMIT:
+                print(f"[{name}] Reached {KNOWN_STREAK_LIMIT} consecutive already-seen jobs. Stopping incremental crawl.")
+                break
+
+        has_next_page = bool(driver.execute_script("return !!document.querySelector(arguments[0]);", NEXT_PAGE_BUTTON_CSS))
+        if not has_next_page:
+            print(f"[{name}] Last page reached.")
+            break
+
+        yield page_number
+
+        if session['active_url'] != search_url:
+            # Another query used the tab in between, so jump straight to our next page by URL.
+            page_number += 1
+            continue
+
         try:
             print("\nAttempting to move to the next page...")
             next_button = WebDriverWait(driver, 5).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "button[aria-label='View next page']"))
+                EC.element_to_be_clickable((By.CSS_SELECTOR, NEXT_PAGE_BUTTON_CSS))
             )
-            driver.execute_script("arguments[0].scrollIntoView(true);", next_button)
-            time.sleep(1)
-            next_button.click()
+            previous_first_id = read_page_markers(driver, JOB_LIST_SELECTOR, RIGHT_PANEL_TITLE_CSS)['first_job_id']
+            driver.execute_script("arguments[0].scrollIntoView(true); arguments[0].click();", next_button)
+            wait_for_next_page(driver, JOB_LIST_SELECTOR, previous_first_id)
             page_number += 1
-            time.sleep(3) # Wait for the new page to begin loading
         except (TimeoutException, NoSuchElementException):
-            print("Last page reached. Finishing scrape.")
-            break
+            print(f"WARNING: [{name}] The next page did not load in time. The next run will resume from it.")
+            save_checkpoint(search_url, page_number + 1, crawl_state.get('last_job_id'))
+            return
+
+    clear_checkpoint(search_url)
+
+def run_search_schedule(driver, queries, job_index, detail_tabs=None, on_opportunity_created=None, duplicate_index=None, catalog=None, work_queue=None):
+    """Runs every query over one browser session, sequentially or interleaved, and returns per-query stats."""
+    session = {
+        "job_index": job_index, "duplicate_index": duplicate_index, "catalog": catalog, "work_queue": work_queue, "seen_job_ids": set(), "active_url": None, "stats": {}, "detail_tabs": detail_tabs,
+        "on_opportunity_created": on_opportunity_created
+    }
+    crawlers = [crawl_search(driver, query, session) for query in queries]
+    if SCHEDULE_MODE == "interleaved":
+        while crawlers:
+            for crawler in list(crawlers):
+                if next(crawler, None) is None:
+                    crawlers.remove(crawler)
+    else:
+        for crawler in crawlers:
+            for _ in crawler:
+                pass
+    return session['stats']
+
+def print_query_report(query_stats):
+    """Prints the per-query yield so low-yield searches can be spotted and dropped."""
+    print("\nPer-query yield:")
+    for name, stats in query_stats.items():
+        new_jobs = stats['cards'] - stats['processed'] - stats['duplicates']
+        yield_pct = 100 * stats['created'] / stats['cards'] if stats['cards'] else 0
+        print(f"  > {name}: {stats['pages']} pages, {stats['cards']} cards, {new_jobs} new, {stats['processed']} already processed, "
+              f"{stats['duplicates']} seen in other queries, {stats['created']} created ({yield_pct:.0f}% yield)")
+
+def main(on_opportunity_created=None):
+    """
+    Main function to run the scraper over every configured search, handling pagination.
+    on_opportunity_created(folder_path, job_info), if given, is called as soon as each new folder is written,
+    so a downstream consumer (e.g. a queue feeding the AI tailor) can start before the crawl finishes.
+    """
+    print("--- Phase 1: LinkedIn Job Scraper (with Pagination) ---")
+    
+    if not os.path.exists(OPPORTUNITIES_BASE_DIR):
+        os.makedirs(OPPORTUNITIES_BASE_DIR)
+        
+    job_index = JobIndex()
+    print(f"Job index holds {len(job_index)} previously processed jobs.")
+    duplicate_index = NearDuplicateIndex() if NEAR_DUPLICATE_ACTION != "off" else None
+    catalog = OpportunityCatalog()
+    work_queue = WorkQueue()
+    if duplicate_index is not None:
+        print(f"Near-duplicate index holds {len(duplicate_index)} descriptions ({NEAR_DUPLICATE_ACTION} reposts at {NEAR_DUPLICATE_THRESHOLD:.0%}).")
+
+    queries = load_search_queries()
+    print(f"Loaded {len(queries)} search queries ({SCHEDULE_MODE} schedule).")
+    
+    print(f"Connecting to the existing Chrome browser on {DEBUGGER_ADDRESS}...")
+    try:
+        chrome_options = Options(); chrome_options.add_experimental_option("debuggerAddress", DEBUGGER_ADDRESS)
+        if EXTRACTION_MODE == "network":
+            enable_performance_logging(chrome_options)
+        driver = instrument_driver(webdriver.Chrome(options=chrome_options))
+        if EXTRACTION_MODE == "network":
+            enable_network_capture(driver)
+        print("Successfully connected to the browser.")
+        detail_tabs = open_detail_tabs(DETAIL_TABS, DEBUGGER_ADDRESS, instrument_driver) if DETAIL_FETCH_MODE == "tabs" else None
+    except Exception as e:
+        print(f"FATAL: Could not connect to Chrome. Error: {e}"); return
+
+    crawl_started = time.perf_counter()
+    try:
+        query_stats = run_search_schedule(driver, queries, job_index, detail_tabs, on_opportunity_created, duplicate_index, catalog, work_queue)
+    finally:
+        if detail_tabs:
+            close_detail_tabs(detail_tabs)
+    total_pages = sum(stats['pages'] for stats in query_stats.values())
+    total_created = sum(stats['created'] for stats in query_stats.values())
             
     print(f"\n--- Scraping complete ---")
-    print(f"Found and created {new_opportunities_count} new opportunities across all pages.")
+    print(f"Found and created {total_created} new opportunities across all pages.")
+    crawl_seconds = time.perf_counter() - crawl_started
+    total_scraped = sum(stats['scraped'] for stats in query_stats.values())
+    print(f"Crawled {total_pages} pages in {crawl_seconds:.1f}s using {driver.command_count} WebDriver calls ({EXTRACTION_MODE} mode).")
+    print(f"Detail fetching ({DETAIL_FETCH_MODE} mode): {total_scraped} relevant jobs at {total_scraped / crawl_seconds * 60 if crawl_seconds else 0:.1f} jobs/min overall.")
+    print_query_report(query_stats)
+    print_wait_summary()
     print("Script finished. Browser connection released.")
 
 if __name__ == '__main__':
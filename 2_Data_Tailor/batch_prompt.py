@@ -0,0 +1,33 @@
+# FILE: ./2_Data_Tailor/batch_prompt.py
+
+import re
+
+# --- Batch Prompt Format ---
+# Several job descriptions share one request after a single copy of the preprompt and prompt.txt. Each job is
+# numbered, and each answer must come back wrapped in markers carrying the same number, so it can be matched
+# to its folder (and a missing or cut-off answer detected) without trusting the model's ordering.
+JOB_MARKER = "=== JOB {n} ==="
+JOB_PATTERN = re.compile(r'^=== JOB (\d+) ===\s*$', re.M)
+ANSWER_START = "=== DATA FOR JOB {n} ==="
+ANSWER_END = "=== END OF JOB {n} ==="
+ANSWER_PATTERN = re.compile(r'^=== DATA FOR JOB (\d+) ===\s*$(.*?)^=== END OF JOB \1 ===\s*$', re.M | re.S)
+BATCH_INSTRUCTIONS = (
+    "This request contains {count} separate job descriptions, numbered below. Produce the complete expected output "
+    "for each one, independently and in order. Put a line '" + ANSWER_START.format(n="n") + "' before each answer and a line '"
+    + ANSWER_END.format(n="n") + "' after it, where n is the job's number. Write nothing outside those markers."
+)
+
+def build_batch_prompt(preprompt, main_prompt, job_descriptions):
+    """Returns one prompt asking for the data.txt of every job description, numbered from 1."""
+    jobs = "\n\n".join(f"{JOB_MARKER.format(n=n)}\n\n{description}" for n, description in enumerate(job_descriptions, 1))
+    return (f"{preprompt}\n\n{main_prompt}\n\n--- BATCH INSTRUCTIONS ---\n\n{BATCH_INSTRUCTIONS.format(count=len(job_descriptions))}"
+            f"\n\n--- JOB DESCRIPTIONS ---\n\n{jobs}")
+
+def split_batch_prompt(prompt):
+    """Returns {job number: job description} of a batch prompt (empty for a single-job prompt)."""
+    parts = JOB_PATTERN.split(prompt.split("--- JOB DESCRIPTIONS ---", 1)[-1])
+    return {int(number): description.strip() for number, description in zip(parts[1::2], parts[2::2])}
+
+def split_batch_response(text):
+    """Returns {job number: answer} for every answer that came back complete, with both of its markers."""
+    return {int(match.group(1)): match.group(2).strip() for match in ANSWER_PATTERN.finditer(text)}
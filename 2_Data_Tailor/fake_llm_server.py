@@ -0,0 +1,146 @@
+# FILE: ./2_Data_Tailor/fake_llm_server.py
+
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from stub_model import template_keys, fake_answer, CHARS_PER_TOKEN
+
+# --- Fake Server Configuration ---
+HOST = '127.0.0.1'
+PORT = 0  # Any free port (a fixed one collided with replay_harness.py's). The chosen URL is printed and in .url.
+MODEL_NAME = 'fake-data-tailor'
+STREAM_CHUNK_CHARS = 64
+FILLER = "Stub filler text. "
+
+class FakeLLMServer(ThreadingHTTPServer):
+    """
+    Local OpenAI-compatible chat completions server that answers tailoring prompts with template-shaped data.txt
+    text (one per job for a batch prompt), for load tests and CI without network access. Each request waits
+    `latency` seconds (+/- jitter) before its first token and `token_latency` per output token, fails with HTTP
+    `error_status` with probability `error_rate`, and, with `output_tokens`, is padded to about that many tokens.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host=HOST, port=PORT, latency=0.5, jitter=0.1, error_rate=0.0, token_latency=0.0,
+                 output_tokens=0, error_status=500, seed=1):
+        super().__init__((host, port), FakeLLMHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.token_latency = token_latency
+        self.output_tokens = output_tokens
+        self.error_status = error_status
+        self.keys = template_keys()
+        self.lock = threading.Lock()
+        self.rng = random.Random(seed)
+        self.requests = 0
+        self.errors = 0
+
+    @property
+    def url(self):
+        """The base URL to give OpenAICompatibleBackend (or OPENAI_BASE_URL)."""
+        return f"http://{self.server_address[0]}:{self.server_address[1]}/v1"
+
+    def draw(self):
+        """Returns (seconds before the first token, whether to fail) for the next request."""
+        with self.lock:
+            self.requests += 1
+            fail = self.rng.random() < self.error_rate
+            self.errors += fail
+            return max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter)), fail
+
+    def answer(self, prompt):
+        """Returns the stub model's answer (fake_data_txt() for each job), padded to output_tokens if that is set."""
+        text = fake_answer(prompt, self.keys)
+        if (missing := self.output_tokens * CHARS_PER_TOKEN - len(text)) > 0:
+            text += " " + (FILLER * (missing // len(FILLER) + 1))[:missing].strip()
+        return text
+
+class FakeLLMHandler(BaseHTTPRequestHandler):
+    """Serves POST /v1/chat/completions (plain or streamed) and GET /v1/models."""
+
+    def log_message(self, format, *args):
+        pass  # One line per request would drown the benchmark's output.
+
+    def send_json(self, status, body):
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def send_event(self, body):
+        self.wfile.write(f"data: {json.dumps(body) if isinstance(body, dict) else body}\n\n".encode('utf-8'))
+        self.wfile.flush()
+
+    def do_GET(self):
+        if self.path.rstrip('/').endswith('/models'):
+            self.send_json(200, {"object": "list", "data": [{"id": MODEL_NAME, "object": "model"}]})
+        else:
+            self.send_json(404, {"error": {"message": f"No route for GET {self.path}.", "type": "not_found"}})
+
+    def do_POST(self):
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            self.send_json(404, {"error": {"message": f"No route for POST {self.path}.", "type": "not_found"}}); return
+        request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        prompt = "\n\n".join(message.get("content") or "" for message in request.get("messages", []))
+        delay, fail = self.server.draw()
+        time.sleep(delay)
+        if fail:
+            self.send_json(self.server.error_status, {"error": {"message": "Fake server: injected error.", "type": "server_error"}}); return
+
+        text = self.server.answer(prompt)
+        prompt_tokens, output_tokens = len(prompt) // CHARS_PER_TOKEN, len(text) // CHARS_PER_TOKEN
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": output_tokens, "total_tokens": prompt_tokens + output_tokens}
+        completion = {"id": f"fake-{self.server.requests}", "created": int(time.time()), "model": request.get("model", MODEL_NAME)}
+        if not request.get("stream"):
+            time.sleep(output_tokens * self.server.token_latency)
+            self.send_json(200, {**completion, "object": "chat.completion", "usage": usage, "choices": [
+                {"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}]})
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        for start in range(0, len(text), STREAM_CHUNK_CHARS):
+            chunk = text[start:start + STREAM_CHUNK_CHARS]
+            time.sleep(len(chunk) / CHARS_PER_TOKEN * self.server.token_latency)
+            self.send_event({**completion, "object": "chat.completion.chunk", "choices": [
+                {"index": 0, "delta": {"content": chunk}, "finish_reason": None}]})
+        self.send_event({**completion, "object": "chat.completion.chunk", "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+        if (request.get("stream_options") or {}).get("include_usage"):
+            self.send_event({**completion, "object": "chat.completion.chunk", "choices": [], "usage": usage})
+        self.send_event("[DONE]")
+
+def main():
+    """Command-line entry point: serve fake completions until interrupted."""
+    parser = argparse.ArgumentParser(description="Runs an offline OpenAI-compatible server that answers with template-shaped data.txt.")
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--latency', type=float, default=0.5, help="Seconds before the first token.")
+    parser.add_argument('--jitter', type=float, default=0.1, help="Random +/- seconds added to the latency.")
+    parser.add_argument('--token-latency', type=float, default=0.0, help="Seconds per output token.")
+    parser.add_argument('--output-tokens', type=int, default=0, help="Pad every answer to about this many tokens.")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests that fail.")
+    parser.add_argument('--error-status', type=int, default=500, help="HTTP status of a failed request (e.g. 429).")
+    args = parser.parse_args()
+
+    server = FakeLLMServer(args.host, args.port, args.latency, args.jitter, args.error_rate, args.token_latency,
+                           args.output_tokens, args.error_status)
+    print(f"Serving fake completions at {server.url} (Ctrl+C to stop).")
+    print(f"  > Point the tailor at it with LLM_BACKEND=openai and OPENAI_BASE_URL={server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\nStopped after {server.requests} requests ({server.errors} injected errors).")
+    server.server_close()
+
+if __name__ == '__main__':
+    main()
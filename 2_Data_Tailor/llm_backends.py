@@ -0,0 +1,154 @@
+# FILE: ./2_Data_Tailor/llm_backends.py
+
+import os
+import json
+from abc import ABC, abstractmethod
+from datetime import timedelta
+from types import SimpleNamespace
+
+import requests
+
+# Only needed for the Gemini backend; the OpenAI-compatible one talks plain HTTP.
+try:
+    import google.generativeai as genai
+except ImportError:
+    genai = None
+
+# --- Backend Configuration ---
+# LLM_BACKEND picks the provider: "gemini" (the default, with GOOGLE_API_KEY) or "openai" for any
+# OpenAI-compatible chat completions server (OPENAI_BASE_URL and OPENAI_API_KEY), such as a hosted
+# provider, a local model server, or fake_llm_server.py. LLM_MODEL overrides the backend's default model.
+DEFAULT_BACKEND = "gemini"
+# Context caching only works on a pinned model version (not a "-latest" alias), so the default is pinned too.
+# A cached prefix is always registered for the backend's own model, so cached and uncached calls agree.
+GEMINI_MODEL = 'gemini-1.5-flash-002'
+# The smallest prefix each model family will cache; the first matching entry applies. Gemini 1.5 needs far more
+# than the prompt files hold, so on 1.5 they are sent whole; caching pays off from the 2.x models on.
+GEMINI_MIN_CACHED_TOKENS = (
+    ("gemini-2.5-flash", 1024),
+    ("gemini-2.5-pro", 4096),
+    ("gemini-1.5", 32768),
+    ("gemini-", 4096),
+)
+OPENAI_BASE_URL = 'https://api.openai.com/v1'
+OPENAI_MODEL = 'gpt-4o-mini'
+REQUEST_TIMEOUT_SECONDS = 300
+CHARS_PER_TOKEN = 4
+
+def min_cached_tokens(model_name):
+    """Returns the smallest prompt prefix, in tokens, that a Gemini model accepts for context caching."""
+    name = model_name.split('/')[-1]
+    return next((tokens for family, tokens in GEMINI_MIN_CACHED_TOKENS if name.startswith(family)), GEMINI_MIN_CACHED_TOKENS[-1][1])
+
+def usage_metadata(prompt_tokens, output_tokens, cached_tokens=0):
+    """Returns token usage under the Gemini SDK's field names, which the rate limiter and prefix cache read."""
+    return SimpleNamespace(prompt_token_count=prompt_tokens, candidates_token_count=output_tokens,
+                           cached_content_token_count=cached_tokens, total_token_count=prompt_tokens + output_tokens)
+
+class LLMBackend(ABC):
+    """
+    What the tailor needs from a model provider. generate() returns a response with .text and .usage_metadata,
+    stream() yields the answer's text as it arrives, and count_tokens() returns a prompt's input tokens.
+    generate_content() is generate() under the Gemini SDK's name, which the tailor calls.
+    """
+
+    model_name = None
+
+    @abstractmethod
+    def generate(self, prompt, **options):
+        """Returns the whole answer to a prompt."""
+
+    @abstractmethod
+    def stream(self, prompt, **options):
+        """Yields the answer to a prompt in pieces, as they arrive."""
+
+    def count_tokens(self, prompt):
+        return len(prompt) // CHARS_PER_TOKEN
+
+    def generate_content(self, prompt, **options):
+        return self.generate(prompt, **options)
+
+class GeminiBackend(LLMBackend):
+    """Google Gemini through google-generativeai, with context caching for prompt prefixes."""
+
+    def __init__(self, model_name=GEMINI_MODEL, api_key=None, model=None):
+        if genai is None:
+            raise RuntimeError("google-generativeai is not installed (pip install google-generativeai).")
+        if model is None:
+            api_key = api_key or os.getenv("GOOGLE_API_KEY")
+            if not api_key:
+                raise RuntimeError("GOOGLE_API_KEY environment variable not found.")
+            genai.configure(api_key=api_key)
+            model = genai.GenerativeModel(model_name)
+        self.model = model
+        self.model_name = model.model_name
+        self.release = lambda: None
+
+    def generate(self, prompt, safety_settings=None, **options):
+        return self.model.generate_content(prompt, safety_settings=safety_settings)
+
+    def stream(self, prompt, safety_settings=None, **options):
+        for chunk in self.model.generate_content(prompt, safety_settings=safety_settings, stream=True):
+            yield chunk.text
+
+    def count_tokens(self, prompt):
+        return self.model.count_tokens(prompt).total_tokens
+
+    def cache_prefix(self, prefix, ttl_seconds):
+        """Registers a prompt prefix with Gemini context caching. Returns a backend that takes only the rest of the prompt."""
+        if len(prefix) // CHARS_PER_TOKEN < (minimum := min_cached_tokens(self.model_name)):
+            raise ValueError(f"the prompt files (~{len(prefix) // CHARS_PER_TOKEN:,} tokens) are below {self.model_name}'s "
+                             f"{minimum:,}-token caching minimum")
+        cached = genai.caching.CachedContent.create(model=self.model_name, display_name="tailor-prompt-prefix",
+                                                    contents=[prefix], ttl=timedelta(seconds=ttl_seconds))
+        bound = GeminiBackend(model=genai.GenerativeModel.from_cached_content(cached_content=cached))
+        bound.release = cached.delete
+        return bound
+
+class OpenAICompatibleBackend(LLMBackend):
+    """Any server speaking the OpenAI chat completions API, over plain HTTP. Safe to share between worker threads."""
+
+    def __init__(self, model_name=OPENAI_MODEL, base_url=None, api_key=None):
+        self.model_name = model_name
+        self.base_url = (base_url or os.getenv("OPENAI_BASE_URL") or OPENAI_BASE_URL).rstrip('/')
+        self.session = requests.Session()
+        if api_key := api_key or os.getenv("OPENAI_API_KEY"):
+            self.session.headers["Authorization"] = f"Bearer {api_key}"
+
+    def post(self, prompt, stream=False):
+        """Sends one chat completion request. Raises on any answer but HTTP 200."""
+        body = {"model": self.model_name, "messages": [{"role": "user", "content": prompt}], "stream": stream}
+        response = self.session.post(f"{self.base_url}/chat/completions", json=body, stream=stream, timeout=REQUEST_TIMEOUT_SECONDS)
+        if response.status_code != 200:
+            raise RuntimeError(f"{self.base_url} answered HTTP {response.status_code}: {response.text[:200]}")
+        return response
+
+    def generate(self, prompt, **options):
+        body = self.post(prompt).json()
+        usage = body.get("usage") or {}
+        cached_tokens = (usage.get("prompt_tokens_details") or {}).get("cached_tokens", 0)
+        return SimpleNamespace(
+            text=body["choices"][0]["message"].get("content") or "",
+            usage_metadata=usage_metadata(usage.get("prompt_tokens", self.count_tokens(prompt)), usage.get("completion_tokens", 0), cached_tokens),
+        )
+
+    def stream(self, prompt, **options):
+        with self.post(prompt, stream=True) as response:
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue
+                if (data := line[len("data:"):].strip()) == "[DONE]":
+                    break
+                for choice in json.loads(data).get("choices", []):
+                    if text := (choice.get("delta") or {}).get("content"):
+                        yield text
+
+BACKENDS = {"gemini": GeminiBackend, "openai": OpenAICompatibleBackend}
+
+def create_backend(name=None, model_name=None):
+    """Returns the backend named by `name` or LLM_BACKEND, for `model_name` or LLM_MODEL (else its default model)."""
+    name = (name or os.getenv("LLM_BACKEND") or DEFAULT_BACKEND).lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown LLM backend '{name}' (choose from {', '.join(BACKENDS)}).")
+    model_name = model_name or os.getenv("LLM_MODEL")
+    return BACKENDS[name](model_name) if model_name else BACKENDS[name]()
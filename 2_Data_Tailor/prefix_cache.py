@@ -0,0 +1,123 @@
+# FILE: ./2_Data_Tailor/prefix_cache.py
+
+import os
+import time
+import threading
+
+# --- Dynamic Path Configuration ---
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+PREPROMPT_PATH = os.path.join(PROJECT_ROOT, 'preprompt.txt')
+PROMPT_PATH = os.path.join(PROJECT_ROOT, 'prompt.txt')
+
+# --- Prefix Cache Configuration ---
+# preprompt.txt and prompt.txt open every prompt. They are registered once as a cached prefix, and each call
+# then sends only what follows them (the job description). A handle is re-registered shortly before its TTL
+# runs out, and as soon as either prompt file changes.
+PREFIX_TTL_SECONDS = 3600
+REFRESH_MARGIN_SECONDS = 120
+CHARS_PER_TOKEN = 4
+
+def prefix_text(preprompt, main_prompt):
+    """Returns the part every tailoring prompt (single or batched) starts with."""
+    return f"{preprompt}\n\n{main_prompt}"
+
+def register_prefix(model, prefix, ttl_seconds):
+    """
+    Registers a prompt prefix with the model's provider (see cache_prefix() in llm_backends.py and stub_model.py).
+    Returns (bound model, release), where the bound model's generate_content() takes only the rest of the prompt
+    and release() deletes the handle. Raises if unsupported.
+    """
+    if not hasattr(model, 'cache_prefix'):
+        raise TypeError(f"{type(model).__name__} does not support cached prefixes")
+    bound = model.cache_prefix(prefix, ttl_seconds)
+    return bound, getattr(bound, 'release', lambda: None)
+
+class PrefixCachedModel:
+    """
+    Wraps a model so that a prompt starting with the current prompt files is sent as its suffix only, against a
+    cached copy of the prefix registered with the provider. Any other prompt (e.g. a draft-and-delta request),
+    or every prompt if the provider cannot cache, is sent whole. Counts cached and uncached input tokens from
+    the responses' usage metadata. Safe to share between worker threads.
+    """
+
+    def __init__(self, model, ttl_seconds=PREFIX_TTL_SECONDS):
+        self.model = model
+        self.model_name = getattr(model, 'model_name', type(model).__name__)  # Keeps response cache keys unchanged.
+        self.ttl_seconds = ttl_seconds
+        self.lock = threading.Lock()
+        self.mtimes = None
+        self.prompts = None
+        self.bound = None
+        self.release = None
+        self.expires = 0.0
+        self.unsupported = False
+        self.registrations = 0
+        self.cached_tokens = 0
+        self.uncached_tokens = 0
+
+    def load_prompts(self):
+        """Returns (preprompt, main_prompt), re-reading the files and dropping the handle when either has changed."""
+        mtimes = (os.path.getmtime(PREPROMPT_PATH), os.path.getmtime(PROMPT_PATH))
+        with self.lock:
+            if mtimes != self.mtimes:
+                with open(PREPROMPT_PATH, 'r', encoding='utf-8') as f: preprompt = f.read()
+                with open(PROMPT_PATH, 'r', encoding='utf-8') as f: main_prompt = f.read()
+                self.mtimes = mtimes
+                if (preprompt, main_prompt) != self.prompts:
+                    if self.prompts is not None:
+                        print("  > INFO: Prompt files changed. Registering the new prefix on the next call.")
+                    self.prompts = (preprompt, main_prompt)
+                    self.drop()
+            return self.prompts
+
+    def drop(self):
+        """Deletes the current handle, if any. Called with the lock held."""
+        if self.release is not None:
+            try:
+                self.release()
+            except Exception as e:
+                print(f"  > INFO: Could not delete the old cached prefix: {e}")
+        self.bound, self.release, self.expires = None, None, 0.0
+
+    def split(self, final_prompt):
+        """Returns (bound model, rest of the prompt) if the prompt starts with the current prompt files, else None."""
+        prefix = prefix_text(*self.load_prompts())
+        if self.unsupported or not final_prompt.startswith(prefix):
+            return None
+        with self.lock:
+            if self.bound is None or time.time() >= self.expires - REFRESH_MARGIN_SECONDS:
+                # An expiring handle is left to lapse on its own; calls in flight may still be using it.
+                try:
+                    self.bound, self.release = register_prefix(self.model, prefix, self.ttl_seconds)
+                except Exception as e:
+                    print(f"  > INFO: Prompt prefix caching unavailable ({e}). Sending whole prompts.")
+                    self.unsupported = True
+                    return None
+                self.expires = time.time() + self.ttl_seconds
+                self.registrations += 1
+                print(f"  > Registered the prompt files as a cached prefix (~{len(prefix) // CHARS_PER_TOKEN:,} tokens).")
+            return self.bound, final_prompt[len(prefix):].lstrip()
+
+    def generate_content(self, prompt, **kwargs):
+        if (split := self.split(prompt)) is not None:
+            response = split[0].generate_content(split[1], **kwargs)
+        else:
+            response = self.model.generate_content(prompt, **kwargs)
+        if (usage := getattr(response, 'usage_metadata', None)) is not None:
+            cached = getattr(usage, 'cached_content_token_count', 0) or 0
+            with self.lock:
+                self.cached_tokens += cached
+                self.uncached_tokens += usage.prompt_token_count - cached
+        return response
+
+    def close(self):
+        """Deletes the registered prefix instead of leaving it to expire."""
+        with self.lock:
+            self.drop()
+
+    def summary(self):
+        """Returns a one-line account of the cached and uncached input tokens."""
+        total = self.cached_tokens + self.uncached_tokens
+        return (f"Prompt prefix cache: {self.registrations} registrations, {self.cached_tokens:,} cached and"
+                f" {self.uncached_tokens:,} uncached input tokens ({self.cached_tokens / total if total else 0:.0%} cached).")
@@ -0,0 +1,61 @@
+# FILE: ./2_Data_Tailor/rate_limiter.py
+
+import time
+import threading
+
+class TokenBucket:
+    """Holds up to `capacity` units, refilled evenly over `period` seconds."""
+
+    def __init__(self, capacity, period=60.0):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.available = capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now):
+        self.available = min(self.capacity, self.available + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount):
+        """Returns how many seconds until `amount` units are available (0 if they are now)."""
+        return max(0.0, (amount - self.available) / self.rate)
+
+class RateLimiter:
+    """
+    Keeps AI calls under a requests-per-minute and a tokens-per-minute quota, shared by every worker thread.
+    acquire() blocks until one request and the estimated tokens fit in both buckets; settle() corrects the
+    token bucket once the call's real usage is known, so an underestimate is paid back by the next calls.
+    """
+
+    def __init__(self, requests_per_minute, tokens_per_minute):
+        self.lock = threading.Lock()
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.waited_seconds = 0.0
+        self.throttled_calls = 0
+
+    def acquire(self, tokens):
+        """Blocks until the call may be sent. Returns the seconds spent waiting."""
+        tokens = min(tokens, self.tokens.capacity)  # A prompt larger than the whole quota would otherwise wait forever.
+        started = time.monotonic()
+        throttled = False
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.requests.refill(now)
+                self.tokens.refill(now)
+                wait = max(self.requests.wait_time(1), self.tokens.wait_time(tokens))
+                if wait <= 0:
+                    self.requests.available -= 1
+                    self.tokens.available -= tokens
+                    waited = now - started
+                    self.waited_seconds += waited
+                    self.throttled_calls += throttled
+                    return waited
+            throttled = True
+            time.sleep(wait)
+
+    def settle(self, estimated_tokens, actual_tokens):
+        """Charges (or refunds) the difference between a call's estimated and actual token usage."""
+        with self.lock:
+            self.tokens.available -= actual_tokens - estimated_tokens
@@ -0,0 +1,179 @@
+# FILE: ./2_Data_Tailor/response_cache.py
+
+import os
+import sys
+import time
+import sqlite3
+import hashlib
+import threading
+
+# --- Dynamic Path Configuration ---
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+RESPONSE_CACHE_DB = os.path.join(PROJECT_ROOT, 'response_cache.db')
+PREPROMPT_PATH = os.path.join(PROJECT_ROOT, 'preprompt.txt')
+PROMPT_PATH = os.path.join(PROJECT_ROOT, 'prompt.txt')
+
+# --- Cache Configuration ---
+# Responses are kept until they are MAX_AGE_DAYS old or, when the store grows past MAX_CACHE_BYTES,
+# until they are the least recently used.
+MAX_CACHE_BYTES = 50 * 1024 * 1024
+MAX_AGE_DAYS = 90
+# Header lines that change while an opportunity moves through the pipeline; they never change the answer.
+VOLATILE_HEADER_KEYS = ("status", "data-status", "duplicate-of")
+
+def prompt_version(preprompt, main_prompt):
+    """Returns a short fingerprint of the prompt files, used to invalidate responses of older prompts."""
+    return hashlib.sha256(f"{preprompt}\0{main_prompt}".encode('utf-8')).hexdigest()[:12]
+
+def stable_job_text(job_description_content):
+    """Returns a jobdescription.txt without its status lines, so a reset or an error status does not change the key."""
+    return "".join(line for line in job_description_content.splitlines(keepends=True)
+                   if line.split(":", 1)[0].strip().lower() not in VOLATILE_HEADER_KEYS)
+
+def cache_key(model_name, preprompt, main_prompt, job_description_content, settings):
+    """Returns the content address of one tailoring request."""
+    parts = (model_name, preprompt, main_prompt, stable_job_text(job_description_content), settings)
+    return hashlib.sha256("\0".join(parts).encode('utf-8')).hexdigest()
+
+class ResponseCache:
+    """
+    Persistent, content-addressed store of AI tailoring responses, in SQLite.
+    A request identical to an earlier one (same model, prompt files, job description and settings) is answered
+    from the store without a network call. Safe to share between worker threads.
+    """
+
+    def __init__(self, db_path=RESPONSE_CACHE_DB, max_bytes=MAX_CACHE_BYTES, max_age_days=MAX_AGE_DAYS):
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_days * 86400
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, prompt_version TEXT NOT NULL, model TEXT, response TEXT NOT NULL,"
+            " size INTEGER NOT NULL, created_at REAL NOT NULL, last_used REAL NOT NULL, hits INTEGER NOT NULL DEFAULT 0"
+            ")"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS responses_prompt_version ON responses (prompt_version)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        self.conn.commit()
+
+    def count(self, name):
+        self.conn.execute("INSERT INTO counters (name, value) VALUES (?, 1) ON CONFLICT (name) DO UPDATE SET value = value + 1", (name,))
+
+    def get(self, key):
+        """Returns the cached response for a key, or None. Counts a hit or a miss."""
+        with self.lock:
+            row = self.conn.execute("SELECT response, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            now = time.time()
+            if row is None or now - row['created_at'] > self.max_age_seconds:
+                self.misses += 1
+                self.count("misses")
+                self.conn.commit()
+                return None
+            self.hits += 1
+            self.count("hits")
+            self.conn.execute("UPDATE responses SET last_used = ?, hits = hits + 1 WHERE key = ?", (now, key))
+            self.conn.commit()
+            return row['response']
+
+    def __contains__(self, key):
+        """True if a fresh response is cached for the key. Unlike get(), counts neither a hit nor a miss."""
+        with self.lock:
+            row = self.conn.execute("SELECT created_at FROM responses WHERE key = ?", (key,)).fetchone()
+        return row is not None and time.time() - row['created_at'] <= self.max_age_seconds
+
+    def put(self, key, response, version, model_name=""):
+        """Stores a response, then evicts expired and least recently used entries beyond the size limit."""
+        with self.lock:
+            now = time.time()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, prompt_version, model, response, size, created_at, last_used) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, version, model_name, response, len(response.encode('utf-8')), now, now)
+            )
+            self.evict(now)
+            self.conn.commit()
+
+    def evict(self, now=None):
+        """Deletes entries older than the age limit, then the least recently used until under the size limit. Returns how many."""
+        now = now or time.time()
+        evicted = self.conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.max_age_seconds,)).rowcount
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total > self.max_bytes:
+            doomed = []
+            for row in self.conn.execute("SELECT key, size FROM responses ORDER BY last_used"):
+                if total <= self.max_bytes:
+                    break
+                doomed.append((row['key'],))
+                total -= row['size']
+            self.conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+            evicted += len(doomed)
+        if evicted:
+            self.conn.execute("INSERT INTO counters (name, value) VALUES ('evictions', ?) ON CONFLICT (name) DO UPDATE SET value = value + ?", (evicted, evicted))
+        return evicted
+
+    def invalidate(self, keep_version=None, version=None):
+        """Deletes the responses of one prompt version, or of every version except keep_version. Returns how many."""
+        with self.lock:
+            if version is not None:
+                removed = self.conn.execute("DELETE FROM responses WHERE prompt_version = ?", (version,)).rowcount
+            else:
+                removed = self.conn.execute("DELETE FROM responses WHERE prompt_version != ?", (keep_version,)).rowcount
+            self.conn.commit()
+            return removed
+
+    def clear(self):
+        """Deletes every response. Returns how many."""
+        with self.lock:
+            removed = self.conn.execute("DELETE FROM responses").rowcount
+            self.conn.commit()
+            return removed
+
+    def stats(self):
+        """Returns the entry count, total bytes, and the lifetime hit, miss and eviction counters."""
+        with self.lock:
+            entries, size = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+            counters = {row['name']: row['value'] for row in self.conn.execute("SELECT name, value FROM counters")}
+        return {"entries": entries, "bytes": size, "hits": counters.get("hits", 0),
+                "misses": counters.get("misses", 0), "evictions": counters.get("evictions", 0)}
+
+    def close(self):
+        self.conn.close()
+
+def current_prompt_version():
+    """Returns the prompt_version of the prompt files on disk."""
+    with open(PREPROMPT_PATH, 'r', encoding='utf-8') as f: preprompt = f.read()
+    with open(PROMPT_PATH, 'r', encoding='utf-8') as f: main_prompt = f.read()
+    return prompt_version(preprompt, main_prompt)
+
+def main():
+    """Command-line entry point: show cache statistics, drop responses of old prompt versions, or clear the cache."""
+    args = sys.argv[1:]
+    if not args or args[0] not in ('--stats', '--invalidate-prompt', '--clear'):
+        print("Usage: python response_cache.py --stats | --invalidate-prompt [version] | --clear"); sys.exit(1)
+    cache = ResponseCache()
+    if args[0] == '--stats':
+        stats = cache.stats()
+        lookups = stats['hits'] + stats['misses']
+        print(f"'{os.path.basename(RESPONSE_CACHE_DB)}': {stats['entries']} responses, {stats['bytes'] / 1024:.0f} KB"
+              f" (limit {cache.max_bytes / 1024 / 1024:.0f} MB, {MAX_AGE_DAYS} days).")
+        print(f"  > Hits: {stats['hits']}  Misses: {stats['misses']}  Hit rate: {stats['hits'] / lookups if lookups else 0:.0%}  Evictions: {stats['evictions']}")
+        print(f"  > Current prompt version: {current_prompt_version()}")
+        for row in cache.conn.execute("SELECT prompt_version, COUNT(*) AS count FROM responses GROUP BY prompt_version ORDER BY MAX(created_at) DESC"):
+            print(f"    {row['prompt_version']}: {row['count']} responses")
+    elif args[0] == '--invalidate-prompt':
+        if len(args) > 1:
+            print(f"Removed {cache.invalidate(version=args[1])} responses of prompt version {args[1]}.")
+        else:
+            print(f"Removed {cache.invalidate(keep_version=current_prompt_version())} responses of older prompt versions.")
+    elif args[0] == '--clear':
+        print(f"Removed {cache.clear()} responses.")
+    cache.close()
+
+if __name__ == '__main__':
+    main()
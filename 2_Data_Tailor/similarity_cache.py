@@ -0,0 +1,157 @@
+# FILE: ./2_Data_Tailor/similarity_cache.py
+
+import os
+import re
+import sys
+import zlib
+import sqlite3
+import threading
+import numpy as np
+
+# --- Dynamic Path Configuration ---
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+SIMILARITY_CACHE_DB = os.path.join(PROJECT_ROOT, 'similarity_cache.db')
+
+sys.path.insert(0, PROJECT_ROOT)
+from near_duplicates import description_body
+from opportunity_catalog import OpportunityCatalog
+from opportunity_archive import read_opportunity_file
+
+# --- Similarity Configuration ---
+# Job descriptions are compared as hashed bag-of-words vectors (words and word pairs, log-scaled counts,
+# unit length), so the cosine similarity of two descriptions is one dot product.
+VECTOR_DIMENSIONS = 4096
+SIMILARITY_THRESHOLD = 0.90
+WORD_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our that the their this to we will with you your".split()
+)
+
+def vectorize(job_description_content):
+    """Returns the unit-length hashed bag-of-words vector of a job description's body."""
+    words = [word for word in WORD_PATTERN.findall(description_body(job_description_content).lower()) if word not in STOP_WORDS]
+    terms = words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+    vector = np.zeros(VECTOR_DIMENSIONS, dtype=np.float32)
+    if not terms:
+        return vector
+    np.add.at(vector, np.fromiter((zlib.crc32(term.encode('utf-8')) % VECTOR_DIMENSIONS for term in terms), dtype=np.int64, count=len(terms)), 1.0)
+    vector = np.log1p(vector)
+    return vector / np.linalg.norm(vector)
+
+class SimilarityCache:
+    """
+    Vectors of the job descriptions that were tailored from scratch, stored in SQLite and searched in memory.
+    nearest() returns the most similar one above the threshold, whose data.txt can then serve as a draft.
+    Safe to share between worker threads.
+    """
+
+    def __init__(self, db_path=SIMILARITY_CACHE_DB, threshold=SIMILARITY_THRESHOLD):
+        self.threshold = threshold
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.tokens_saved = 0
+        self.conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS vectors (folder TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        self.conn.commit()
+        rows = self.conn.execute("SELECT folder, vector FROM vectors ORDER BY folder").fetchall()
+        self.folders = [row['folder'] for row in rows]
+        self.matrix = (np.vstack([np.frombuffer(row['vector'], dtype=np.float32) for row in rows]) if rows
+                       else np.zeros((0, VECTOR_DIMENSIONS), dtype=np.float32))
+
+    def __len__(self):
+        return len(self.folders)
+
+    def count(self, name, amount=1):
+        self.conn.execute("INSERT INTO counters (name, value) VALUES (?, ?) ON CONFLICT (name) DO UPDATE SET value = value + ?", (name, amount, amount))
+        self.conn.commit()
+
+    def nearest(self, job_description_content, exclude=None):
+        """Returns (folder, similarity) of the most similar stored description at or above the threshold, or None."""
+        vector = vectorize(job_description_content)
+        with self.lock:
+            scores = self.matrix @ vector
+            if exclude in self.folders:
+                scores[self.folders.index(exclude)] = -1.0
+            best = int(np.argmax(scores)) if len(scores) else -1
+            if best < 0 or scores[best] < self.threshold:
+                self.misses += 1
+                self.count("misses")
+                return None
+            self.hits += 1
+            self.count("hits")
+            return self.folders[best], float(scores[best])
+
+    def add(self, folder, job_description_content):
+        """Stores (or replaces) the vector of a folder whose data.txt was tailored from scratch."""
+        vector = vectorize(job_description_content)
+        with self.lock:
+            self.conn.execute("INSERT OR REPLACE INTO vectors (folder, vector) VALUES (?, ?)", (folder, vector.tobytes()))
+            self.conn.commit()
+            if folder in self.folders:
+                self.matrix[self.folders.index(folder)] = vector
+            else:
+                self.folders.append(folder)
+                self.matrix = np.vstack([self.matrix, vector])
+
+    def note_saving(self, tokens):
+        """Adds the tokens a draft-and-delta request saved compared with a full generation."""
+        with self.lock:
+            self.tokens_saved += tokens
+            self.count("tokens_saved", tokens)
+
+    def stats(self):
+        """Returns the stored vector count and the lifetime hit, miss and tokens-saved counters."""
+        with self.lock:
+            counters = {row['name']: row['value'] for row in self.conn.execute("SELECT name, value FROM counters")}
+        return {"vectors": len(self.folders), "hits": counters.get("hits", 0), "misses": counters.get("misses", 0),
+                "tokens_saved": counters.get("tokens_saved", 0)}
+
+    def rebuild(self):
+        """Re-vectorizes every tailored opportunity (on disk or archived) that has a data.txt. Returns how many."""
+        catalog = OpportunityCatalog()
+        with self.lock:
+            self.conn.execute("DELETE FROM vectors")
+            self.folders, self.matrix = [], np.zeros((0, VECTOR_DIMENSIONS), dtype=np.float32)
+        for row in catalog.find(data_status='complete', archived=None):
+            if row['duplicate_of']:
+                continue  # A linked repost's data.txt is a copy of its original's.
+            content = read_opportunity_file(row['folder'], 'jobdescription.txt', catalog)
+            if content is not None and read_opportunity_file(row['folder'], 'data.txt', catalog) is not None:
+                self.add(row['folder'], content)
+        catalog.close()
+        return len(self.folders)
+
+    def close(self):
+        self.conn.close()
+
+def main():
+    """Command-line entry point: rebuild the vectors, show the hit rate, or find one folder's nearest neighbour."""
+    args = sys.argv[1:]
+    if not args or args[0] not in ('--rebuild', '--stats', '--check'):
+        print("Usage: python similarity_cache.py --rebuild | --stats | --check <folder key>"); sys.exit(1)
+    cache = SimilarityCache()
+    if args[0] == '--rebuild':
+        print(f"Stored the vectors of {cache.rebuild()} tailored opportunities in '{os.path.basename(SIMILARITY_CACHE_DB)}'.")
+    elif args[0] == '--stats':
+        stats = cache.stats()
+        lookups = stats['hits'] + stats['misses']
+        print(f"'{os.path.basename(SIMILARITY_CACHE_DB)}': {stats['vectors']} vectors, threshold {cache.threshold:.0%}.")
+        print(f"  > Hits: {stats['hits']}  Misses: {stats['misses']}  Hit rate: {stats['hits'] / lookups if lookups else 0:.0%}"
+              f"  Tokens saved: ~{stats['tokens_saved']:,}")
+    elif args[0] == '--check' and len(args) > 1:
+        content = read_opportunity_file(args[1], 'jobdescription.txt')
+        if content is None:
+            print(f"ERROR: No jobdescription.txt for '{args[1]}'.")
+        elif match := cache.nearest(content, exclude=args[1]):
+            print(f"Nearest tailored opportunity: '{match[0]}' ({match[1]:.0%} similar).")
+        else:
+            print(f"No tailored opportunity is {cache.threshold:.0%} similar or more.")
+    cache.close()
+
+if __name__ == '__main__':
+    main()
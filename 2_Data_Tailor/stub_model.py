@@ -0,0 +1,99 @@
+# FILE: ./2_Data_Tailor/stub_model.py
+
+import os
+import re
+import time
+import random
+import threading
+from types import SimpleNamespace
+
+from batch_prompt import split_batch_prompt, ANSWER_START, ANSWER_END
+
+# --- Dynamic Path Configuration ---
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+TEMPLATE_PATHS = [
+    os.path.join(PROJECT_ROOT, '2_Generator', 'cv_template.html'),
+    os.path.join(PROJECT_ROOT, '2_Generator', 'cl_template.html'),
+]
+
+PLACEHOLDER_PATTERN = re.compile(r'\{\{([A-Z0-9_]+)\}\}')
+CHARS_PER_TOKEN = 4
+
+def template_keys():
+    """Returns the data.txt keys the CV and CL templates use, plus the ones the tailor itself relies on."""
+    keys = ["COMPANY_NAME", "JOB_ROLE"]
+    for template_path in TEMPLATE_PATHS:
+        try:
+            with open(template_path, 'r', encoding='utf-8') as f:
+                keys += [key for key in PLACEHOLDER_PATTERN.findall(f.read()) if key not in keys]
+        except FileNotFoundError:
+            continue
+    return keys
+
+def fake_data_txt(prompt, keys):
+    """Returns a data.txt-shaped answer for a tailoring prompt, with the company and role taken from its job description."""
+    header = dict(line.split(":", 1) for line in prompt.split("--- JOB DESCRIPTION ---", 1)[-1].splitlines()[:20] if ":" in line)
+    values = {"COMPANY_NAME": header.get("Company Name", "Stub Company").strip(), "JOB_ROLE": header.get("Role Name", "Stub Role").strip()}
+    return "\n".join(f"{key}: {values.get(key, f'Stub text for {key}.')}" for key in keys)
+
+def fake_answer(prompt, keys):
+    """Returns the answer to a tailoring prompt: one data.txt, or one per job between markers for a batch prompt."""
+    if jobs := split_batch_prompt(prompt):
+        return "\n\n".join(f"{ANSWER_START.format(n=n)}\n{fake_data_txt(description, keys)}\n{ANSWER_END.format(n=n)}"
+                           for n, description in sorted(jobs.items()))
+    return fake_data_txt(prompt, keys)
+
+class StubModel:
+    """
+    Offline stand-in for genai.GenerativeModel. generate_content() sleeps for `latency` seconds (+/- jitter),
+    plus `token_latency` per output token and `input_token_latency` per uncached input token, fails with
+    probability `error_rate`, and otherwise returns a template-shaped data.txt (one per job for a batch prompt)
+    with usage metadata. cache_prefix() registers a cached prefix, like Gemini context caching.
+    Safe to call from several threads.
+    """
+
+    def __init__(self, latency=1.0, jitter=0.2, error_rate=0.0, seed=1, token_latency=0.0, input_token_latency=0.0):
+        self.latency = latency
+        self.token_latency = token_latency
+        self.input_token_latency = input_token_latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.keys = template_keys()
+        self.lock = threading.Lock()
+        self.rng = random.Random(seed)
+        self.calls = 0
+
+    def generate_content(self, prompt, safety_settings=None, **kwargs):
+        return self.respond(prompt, 0)
+
+    def cache_prefix(self, prefix, ttl_seconds=None):
+        """Returns a model whose generate_content() takes only what follows `prefix`."""
+        return StubPrefixModel(self, prefix)
+
+    def respond(self, prompt, cached_tokens):
+        """Answers a whole prompt whose first `cached_tokens` tokens come from a cached prefix."""
+        with self.lock:
+            self.calls += 1
+            delay = max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter))
+            fail = self.rng.random() < self.error_rate
+        text = fake_answer(prompt, self.keys)
+        prompt_tokens, output_tokens = len(prompt) // CHARS_PER_TOKEN, len(text) // CHARS_PER_TOKEN
+        time.sleep(delay + output_tokens * self.token_latency + (prompt_tokens - cached_tokens) * self.input_token_latency)
+        if fail:
+            raise RuntimeError("Stub model: injected error.")
+        return SimpleNamespace(
+            text=f"```text\n{text}\n```",
+            usage_metadata=SimpleNamespace(prompt_token_count=prompt_tokens, candidates_token_count=output_tokens,
+                                           cached_content_token_count=cached_tokens, total_token_count=prompt_tokens + output_tokens),
+        )
+
+class StubPrefixModel:
+    """A StubModel bound to a cached prefix; generate_content() takes the rest of the prompt."""
+
+    def __init__(self, model, prefix):
+        self.model = model
+        self.prefix = prefix
+
+    def generate_content(self, prompt, safety_settings=None, **kwargs):
+        return self.model.respond(f"{self.prefix}\n\n{prompt}", len(self.prefix) // CHARS_PER_TOKEN)
@@ -0,0 +1,251 @@
+# FILE: ./2_Data_Tailor/tailor_benchmark.py
+
+import os
+import sys
+import math
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+import subprocess
+from contextlib import redirect_stdout
+from concurrent.futures import ThreadPoolExecutor
+
+# --- Dynamic Path Configuration ---
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+OPPORTUNITIES_BASE_DIR = os.path.join(PROJECT_ROOT, '3_Opportunities')
+
+sys.path.insert(0, PROJECT_ROOT)
+import tailor_data
+from opportunity_catalog import OpportunityCatalog, parse_header
+from opportunity_paths import iter_opportunity_dirs, new_opportunity_path
+from work_queue import WorkQueue
+from prefix_cache import PrefixCachedModel, register_prefix
+from fake_llm_server import FakeLLMServer, MODEL_NAME as FAKE_MODEL_NAME
+from stub_model import StubModel
+
+# --- Benchmark Configuration ---
+# The benchmark runs the real tailor phase (queue, leases, catalog, response and similarity caches, prefix cache)
+# in a scratch copy of the project, so nothing it queues, caches or writes reaches the real one. The copy takes
+# the code, prompt files and templates; its 3_Opportunities holds synthetic pending postings from the corpus.
+SCRATCH_IGNORE = shutil.ignore_patterns('3_Opportunities', '3_Opportunities_Archive', '.git', '__pycache__', '*.db', '*.db-*', '*.pdf')
+# Generous limits, so the numbers show the backend and the workers rather than the Gemini free tier.
+REQUESTS_PER_MINUTE = 6000
+TOKENS_PER_MINUTE = 100000000
+PERCENTILES = (50, 90, 95, 99)
+
+def percentile(values, percent):
+    """Returns the nearest-rank percentile of a list of numbers."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(percent / 100 * len(ordered)) - 1)]
+
+class BenchmarkRun:
+    """Per-request timings and failures of one benchmark run, collected from every worker thread."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = []
+        self.failures = []
+
+    def record(self, seconds, failure=None):
+        with self.lock:
+            self.latencies.append(seconds)
+            if failure is not None:
+                self.failures.append(failure)
+
+class TimedModel:
+    """
+    Passes requests through to a model and records how long each took. It sits beneath PrefixCachedModel and
+    wraps the prefix-bound models too, so every request the tailor sends is timed, whole or suffix-only.
+    """
+
+    def __init__(self, model, run):
+        self.model = model
+        self.run = run
+        self.model_name = getattr(model, 'model_name', type(model).__name__)
+        self.release = getattr(model, 'release', lambda: None)
+
+    def generate_content(self, prompt, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = self.model.generate_content(prompt, **kwargs)
+        except Exception as e:
+            self.run.record(time.perf_counter() - started, str(e))
+            raise
+        self.run.record(time.perf_counter() - started)
+        return response
+
+    def cache_prefix(self, prefix, ttl_seconds):
+        bound, release = register_prefix(self.model, prefix, ttl_seconds)
+        timed = TimedModel(bound, self.run)
+        timed.release = release
+        return timed
+
+def load_benchmark_descriptions(jobs):
+    """Returns `jobs` (company, role, job description) postings from the corpus, repeated as needed."""
+    postings = []
+    for folder_path in iter_opportunity_dirs(OPPORTUNITIES_BASE_DIR):
+        job_desc_path = os.path.join(folder_path, 'jobdescription.txt')
+        if os.path.exists(job_desc_path):
+            with open(job_desc_path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            header = parse_header(text.splitlines())
+            postings.append((header.get('company name') or "Example", header.get('role name') or "Scrum Master",
+                             text.split("Job Description:", 1)[-1].strip()))
+    postings = postings or [("Example", "Scrum Master", "Lead agile teams.")]
+    return [postings[i % len(postings)] for i in range(jobs)]
+
+def write_opportunities(base_dir, jobs):
+    """Files `jobs` pending opportunities under base_dir. Each role is numbered, so a repeated posting is not an exact repeat."""
+    for number, (company, role, description) in enumerate(load_benchmark_descriptions(jobs), 1):
+        folder_path = new_opportunity_path(company, f"{role} {number}", base_dir=base_dir)
+        os.makedirs(folder_path, exist_ok=True)
+        with open(os.path.join(folder_path, 'jobdescription.txt'), 'w', encoding='utf-8') as f:
+            f.write("Status: pending\nData-Status: pending\nJob board: Benchmark\n")
+            f.write(f"Company Name: {company}\nRole Name: {role} {number}\nJob post URL: N/A\n\n")
+            f.write(f"Job Description:\n{description}\n")
+
+def configure_backend(args):
+    """Returns (backend, fake server or None) for the benchmark's options, started and ready to call."""
+    if args.stub:
+        return StubModel(args.latency, args.jitter, args.error_rate, token_latency=args.token_latency,
+                         input_token_latency=args.input_latency / 1000), None
+    server = None
+    if not args.backend:
+        if not args.url:
+            server = FakeLLMServer(port=0, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                                   token_latency=args.token_latency, output_tokens=args.output_tokens)
+            threading.Thread(target=server.serve_forever, name="fake-llm-server", daemon=True).start()
+            os.environ["LLM_MODEL"] = FAKE_MODEL_NAME
+        # This process only ever runs in the scratch copy, so the tailor's own configuration is simply pointed here.
+        os.environ["LLM_BACKEND"] = "openai"
+        os.environ["OPENAI_BASE_URL"] = args.url or server.url
+    return tailor_data.configure_model(), server
+
+def reset_opportunities():
+    """Puts every scratch opportunity back to pending, without its data.txt, and queues it afresh for the next pass."""
+    catalog = OpportunityCatalog()
+    queue = WorkQueue()
+    queue.clear()
+    for folder_path in iter_opportunity_dirs(OPPORTUNITIES_BASE_DIR):
+        data_txt_path = os.path.join(folder_path, 'data.txt')
+        if os.path.exists(data_txt_path):
+            os.remove(data_txt_path)
+        tailor_data.update_specific_status(os.path.join(folder_path, 'jobdescription.txt'), "Data-Status", "pending", catalog)
+    queue.enqueue_many("tailor", [row['folder'] for row in catalog.find(data_status='pending')])
+    queue.close()
+    catalog.close()
+
+def tailor_pass(model, preprompt, main_prompt, workers, batch_size, limiter, cache=None, similarity=None):
+    """Drains the scratch tailor queue with `workers` threads. Returns (wall seconds, data.txt written, opportunities in error)."""
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(lambda _: tailor_data.drain_tailor_queue(model, preprompt, main_prompt, limiter, cache, similarity, batch_size),
+                      range(workers)))
+    elapsed = time.perf_counter() - started
+    catalog = OpportunityCatalog()
+    written, failed = len(catalog.find(data_status='complete')), len(catalog.find(data_status='error'))
+    catalog.close()
+    return elapsed, written, failed
+
+def run_tailor_phase(args):
+    """
+    Runs the tailor phase over the scratch project's queue and prints throughput, latency and cache figures.
+    A sequential pass without caches runs over the same postings first, as the baseline for the speed-up.
+    """
+    run = BenchmarkRun()
+    backend, server = configure_backend(args)
+    model = TimedModel(backend, run)
+    if not args.no_prefix_cache:
+        model = PrefixCachedModel(model)
+    log = None if args.verbose else open(os.devnull, 'w')
+    with redirect_stdout(log or sys.stdout):
+        preprompt, main_prompt = tailor_data.load_prompt_files()
+        batch_size = min(args.batch, tailor_data.max_batch_size(preprompt, main_prompt))
+        WorkQueue(seed_from_catalog=True).close()  # Queues the synthetic opportunities from the scratch catalog, as a real run would.
+        baseline = None
+        if not args.no_baseline:
+            baseline = tailor_pass(TimedModel(backend, BenchmarkRun()), preprompt, main_prompt, 1, 1,
+                                   tailor_data.RateLimiter(args.rpm, args.tpm))
+            reset_opportunities()
+        baseline_requests, baseline_errors = (server.requests, server.errors) if server is not None else (0, 0)
+        limiter = tailor_data.RateLimiter(args.rpm, args.tpm)
+        cache = None if args.no_cache else tailor_data.ResponseCache()
+        similarity = tailor_data.SimilarityCache() if tailor_data.SimilarityCache is not None and not args.no_reuse else None
+        elapsed, written, failed = tailor_pass(model, preprompt, main_prompt, args.workers, batch_size, limiter, cache, similarity)
+    if log is not None:
+        log.close()
+
+    print(f"--- AI Tailor Benchmark: {args.jobs} jobs, {args.workers} workers, {batch_size} per request,"
+          f" {type(backend).__name__} '{tailor_data.model_name(backend)}' ---")
+    print(f"  > Wall time: {elapsed:.1f}s  Throughput: {written / elapsed * 60:.1f} jobs/min"
+          f"  ({written} of {args.jobs} data.txt written, {len(run.latencies)} requests)")
+    if run.latencies:
+        print("  > Request latency: " + "  ".join(f"p{p} {percentile(run.latencies, p):.2f}s" for p in PERCENTILES)
+              + f"  max {max(run.latencies):.2f}s")
+    if baseline is not None:
+        baseline_elapsed, baseline_written, _ = baseline
+        speedup = (written / elapsed) / (baseline_written / baseline_elapsed) if written and baseline_written else 0
+        print(f"  > Sequential baseline (1 worker, 1 per request, no caches): {baseline_elapsed:.1f}s,"
+              f" {baseline_written / baseline_elapsed * 60:.1f} jobs/min. Speed-up: {speedup:.1f}x.")
+    print(f"  > Rate limiter: {limiter.throttled_calls} calls throttled, {limiter.waited_seconds:.1f}s of worker time spent waiting.")
+    if cache is not None:
+        print(f"  > Response cache: {cache.hits} hits, {cache.misses} misses.")
+        cache.close()
+    if similarity is not None:
+        print(f"  > Similar-draft reuse: {similarity.hits} of {similarity.hits + similarity.misses} opportunities,"
+              f" ~{similarity.tokens_saved:,} tokens saved.")
+        similarity.close()
+    if isinstance(model, PrefixCachedModel):
+        print(f"  > {model.summary()}")
+        model.close()
+    if run.failures:
+        print(f"  > {len(run.failures)} requests failed, e.g.: {run.failures[0]}")
+    if failed:
+        print(f"  > {failed} opportunities are in error and queued for retry, as the tailor would leave them.")
+    if server is not None:
+        print(f"  > Fake server: {server.requests - baseline_requests} requests, {server.errors - baseline_errors} injected errors"
+              f" (plus {baseline_requests} for the baseline).")
+        server.shutdown()
+        server.server_close()
+
+def main(argv=None):
+    """Command-line entry point: benchmark the tailor phase against the fake server, a given server, or a configured backend."""
+    parser = argparse.ArgumentParser(description="Measures the AI tailor phase's throughput and tail latency under concurrency.")
+    parser.add_argument('--jobs', type=int, default=40)
+    parser.add_argument('--workers', type=int, default=tailor_data.MAX_IN_FLIGHT)
+    parser.add_argument('--batch', type=int, default=1, help="Job descriptions per request.")
+    parser.add_argument('--rpm', type=int, default=REQUESTS_PER_MINUTE, help="Rate limiter: requests per minute.")
+    parser.add_argument('--tpm', type=int, default=TOKENS_PER_MINUTE, help="Rate limiter: tokens per minute.")
+    parser.add_argument('--url', help="Benchmark this OpenAI-compatible server instead of starting the fake one.")
+    parser.add_argument('--backend', action='store_true', help="Benchmark the backend configured by LLM_BACKEND/LLM_MODEL (real calls, real cost).")
+    parser.add_argument('--stub', action='store_true', help="Benchmark the in-process stub model, which supports prefix caching.")
+    parser.add_argument('--latency', type=float, default=0.5, help="Fake server or stub: seconds before the first token.")
+    parser.add_argument('--jitter', type=float, default=0.1, help="Fake server or stub: random +/- seconds added to the latency.")
+    parser.add_argument('--token-latency', type=float, default=0.0, help="Fake server or stub: seconds per output token.")
+    parser.add_argument('--input-latency', type=float, default=0.0, help="Stub: milliseconds per uncached input token.")
+    parser.add_argument('--output-tokens', type=int, default=0, help="Fake server: pad every answer to about this many tokens.")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fake server or stub: fraction of requests that fail.")
+    parser.add_argument('--no-cache', action='store_true', help="Run without the response cache.")
+    parser.add_argument('--no-reuse', action='store_true', help="Run without similar-draft reuse.")
+    parser.add_argument('--no-prefix-cache', action='store_true', help="Send whole prompts.")
+    parser.add_argument('--no-baseline', action='store_true', help="Skip the sequential pass the speed-up is measured against.")
+    parser.add_argument('--verbose', action='store_true', help="Show the tailor's own output.")
+    parser.add_argument('--in-scratch', action='store_true', help=argparse.SUPPRESS)
+    argv = sys.argv[1:] if argv is None else argv
+    args = parser.parse_args(argv)
+    if args.in_scratch:
+        run_tailor_phase(args); return
+
+    with tempfile.TemporaryDirectory(prefix="tailor_benchmark_") as scratch_root:
+        shutil.copytree(PROJECT_ROOT, scratch_root, ignore=SCRATCH_IGNORE, dirs_exist_ok=True)
+        write_opportunities(os.path.join(scratch_root, '3_Opportunities'), args.jobs)
+        scratch_script = os.path.join(scratch_root, os.path.basename(SCRIPT_DIR), os.path.basename(__file__))
+        returncode = subprocess.call([sys.executable, scratch_script, '--in-scratch', *argv])
+    if returncode:
+        sys.exit(returncode)
+
+if __name__ == '__main__':
+    main()
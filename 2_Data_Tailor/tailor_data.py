@@ -3,8 +3,17 @@
 import os
 import sys
 import re
-import google.generativeai as genai
-from google.generativeai.types import HarmCategory, HarmBlockThreshold
+import time
+from datetime import date
+from contextlib import ExitStack
+from concurrent.futures import ThreadPoolExecutor
+
+# Only needed for Gemini's safety settings; other backends and the offline stub model run without it.
+try:
+    import google.generativeai as genai
+    from google.generativeai.types import HarmCategory, HarmBlockThreshold
+except ImportError:
+    genai = None
 
 # --- Dynamic Path Configuration ---
 SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
@@ -13,6 +22,64 @@ OPPORTUNITIES_BASE_DIR = os.path.join(PROJECT_ROOT, '3_Opportunities')
 PREPROMPT_PATH = os.path.join(PROJECT_ROOT, 'preprompt.txt')
 PROMPT_PATH = os.path.join(PROJECT_ROOT, 'prompt.txt')
 
+sys.path.insert(0, PROJECT_ROOT)
+from opportunity_catalog import OpportunityCatalog
+from work_queue import WorkQueue
+from opportunity_lease import OpportunityLease, LEASE_SECONDS, atomic_write
+from opportunity_archive import read_opportunity_file
+from rate_limiter import RateLimiter
+from response_cache import ResponseCache, cache_key, prompt_version
+from batch_prompt import build_batch_prompt, split_batch_response
+from prefix_cache import PrefixCachedModel
+from llm_backends import create_backend
+
+# The similarity cache needs NumPy; without it every opportunity is tailored from scratch.
+try:
+    from similarity_cache import SimilarityCache
+except ImportError:
+    SimilarityCache = None
+
+# --- Concurrency Configuration ---
+# Up to MAX_IN_FLIGHT opportunities are tailored at once, while the shared rate limiter keeps the calls
+# within the API quota (the defaults are the Gemini 1.5 Flash free tier; raise them for a paid project).
+MAX_IN_FLIGHT = 4
+REQUESTS_PER_MINUTE = 15
+TOKENS_PER_MINUTE = 1000000
+CHARS_PER_TOKEN = 4  # Estimate used to reserve tokens before a call; corrected from the response's usage.
+
+# --- FIX 2: Add safety settings to prevent the model from blocking the response ---
+SAFETY_SETTINGS = {
+    HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
+    HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
+    HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
+    HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
+} if genai is not None else {}
+# --- Draft Reuse Configuration ---
+# When a previously tailored job description is similar enough (see similarity_cache.py), its data.txt is
+# reused as a draft and the model is only asked to rewrite the posting-specific fields.
+DELTA_KEYS = ("COMPANY_NAME", "JOB_ROLE", "HIRING_MANAGER", "SUBJECT", "CONTENT")
+DELTA_INSTRUCTIONS = (
+    "Below is CV and cover letter data that was already tailored for a very similar job posting, followed by a new "
+    "job posting. Rewrite only these fields for the new posting: " + ", ".join(DELTA_KEYS) + ". Keep the same facts, "
+    "tone and length, and don't make up anything. Return only those fields as plain text, one 'KEY: value' section "
+    "each, in the same format as the data below."
+)
+SECTION_KEY_PATTERN = re.compile(r'^([A-Z][A-Z0-9_]*):')
+
+# --- Batch Configuration ---
+# With --batch K, up to K job descriptions share one request after a single copy of the prompt files, so the
+# prompt files are sent once per batch instead of once per job (see batch_prompt.py). K is capped so that K
+# answers fit the model's output limit and the whole prompt fits its context window.
+MODEL_CONTEXT_TOKENS = 1048576
+MODEL_OUTPUT_TOKENS = 8192
+DATA_TXT_TOKENS = 1600         # A typical data.txt answer.
+JOB_DESCRIPTION_TOKENS = 2000  # A long jobdescription.txt.
+# An answer from a batch without all of these sections is treated as cut off and retried on its own.
+REQUIRED_DATA_KEYS = ("COMPANY_NAME", "JOB_ROLE", "CONTENT", "CAREER_SUMMARY")
+
+# Part of every response cache key: a change to these settings must not reuse answers given under the old ones.
+GENERATION_SETTINGS = repr(sorted((str(category), str(threshold)) for category, threshold in SAFETY_SETTINGS.items()))
+
 def get_specific_status(file_path, status_key):
     """Reads a file and returns the value of a specific status key."""
     try:
@@ -24,90 +91,412 @@ def get_specific_status(file_path, status_key):
         return "not_found"
     return "unknown"
 
-def update_specific_status(file_path, status_key, new_status):
-    """Reads the entire file, updates a specific status line, and writes it back."""
+def update_specific_status(file_path, status_key, new_status, catalog=None):
+    """Reads the entire file, updates a specific status line, and replaces it atomically (and updates the catalog, if given)."""
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
             lines = f.readlines()
-        with open(file_path, 'w', encoding='utf-8') as f:
-            for line in lines:
-                if line.lower().strip().startswith(status_key.lower() + ":"):
-                    f.write(f"{status_key}: {new_status}\n")
-                else:
-                    f.write(line)
+        # Written to a temp file and renamed over the original, so a crash or a concurrent reader never sees a torn file.
+        atomic_write(file_path, "".join(
+            f"{status_key}: {new_status}\n" if line.lower().strip().startswith(status_key.lower() + ":") else line
+            for line in lines
+        ))
+        if catalog is not None:
+            catalog.set_status(os.path.dirname(file_path), status_key, new_status)
         print(f"  > {status_key} updated to '{new_status}'.")
         return True
     except Exception as e:
         print(f"  > FAILED to update {status_key} for {file_path}: {e}")
         return False
 
-def main():
-    """Finds opportunities needing data generation and uses AI to create data.txt files."""
-    print("--- Phase 2: AI Data Tailoring ---")
-    api_key = os.getenv("GOOGLE_API_KEY")
-    if not api_key:
-        print("ERROR: GOOGLE_API_KEY environment variable not found."); sys.exit(1)
-    genai.configure(api_key=api_key)
-    
-    # --- FIX 1: Use a confirmed, stable model name ---
-    model = genai.GenerativeModel('gemini-1.5-flash-latest')
-    print("Successfully configured Google AI with model 'gemini-1.5-flash-latest'.")
+def application_date(day=None):
+    """Returns a date the way prompt.txt asks for APPLICATION_DATE (e.g. "July 30th, 2025"); today by default."""
+    day = day or date.today()
+    suffix = "th" if 11 <= day.day % 100 <= 13 else {1: "st", 2: "nd", 3: "rd"}.get(day.day % 10, "th")
+    return f"{day.strftime('%B')} {day.day}{suffix}, {day.year}"
 
+def reuse_duplicate_data(opportunity_path, job_desc_path):
+    """
+    If the opportunity is a linked repost ("Duplicate-Of:") and the original already has a data.txt,
+    copies it with this posting's company and role filled in. Returns the data.txt written, or None.
+    """
+    with open(job_desc_path, 'r', encoding='utf-8') as f:
+        header = dict(line.split(":", 1) for line in f.read().split("Job Description:", 1)[0].splitlines() if ":" in line)
+    original_folder = header.get("Duplicate-Of", "").strip()
+    if not original_folder:
+        return None
+    original_data = read_opportunity_file(original_folder, 'data.txt')
+    if original_data is None:
+        print(f"  > Linked original '{original_folder}' has no data.txt yet. Tailoring this posting on its own.")
+        return None
+    lines = original_data.splitlines(keepends=True)
+
+    # The cover letter is dated today, not on the day the original was tailored.
+    replacements = {"COMPANY_NAME": header.get("Company Name", "").strip(), "JOB_ROLE": header.get("Role Name", "").strip(),
+                    "APPLICATION_DATE": application_date()}
+    data = "".join(
+        f"{key}: {replacements[key]}\n" if replacements.get(key := line.split(":", 1)[0].strip()) else line
+        for line in lines
+    )
+    atomic_write(os.path.join(opportunity_path, 'data.txt'), data)
+    print(f"  > SUCCESS: Reused data.txt from near-duplicate '{original_folder}' (no AI call).")
+    return data
+
+def configure_model():
+    """Returns the model backend chosen by LLM_BACKEND and LLM_MODEL (Gemini by default; see llm_backends.py)."""
+    try:
+        model = create_backend()
+    except (RuntimeError, ValueError) as e:
+        print(f"ERROR: {e}"); sys.exit(1)
+    print(f"Successfully configured {type(model).__name__} with model '{model.model_name}'.")
+    return model
+
+def load_prompt_files():
+    """Returns (preprompt, main_prompt) from preprompt.txt and prompt.txt."""
     try:
         with open(PREPROMPT_PATH, 'r', encoding='utf-8') as f: preprompt = f.read()
         with open(PROMPT_PATH, 'r', encoding='utf-8') as f: main_prompt = f.read()
         print("Loaded prompt files.")
+        return preprompt, main_prompt
     except FileNotFoundError as e:
         print(f"ERROR: Could not find prompt files. {e}"); sys.exit(1)
 
-    opportunities_to_process = 0
+def current_prompts(model, preprompt, main_prompt):
+    """
+    Returns the prompt files to build the next prompt from. A PrefixCachedModel re-reads them when they change,
+    so prompts keep matching its cached prefix after an edit; any other model gets them as loaded at startup.
+    """
+    return model.load_prompts() if isinstance(model, PrefixCachedModel) else (preprompt, main_prompt)
+
+def model_name(model):
+    """Returns the name a model is cached under."""
+    return getattr(model, 'model_name', type(model).__name__)
+
+def generate_data_txt(model, preprompt, main_prompt, job_description_content, limiter=None, cache=None):
+    """
+    Asks the model for the data.txt of one job description (or, with DELTA_INSTRUCTIONS and a draft in place
+    of the prompt files, for its changed fields). With a response cache, an identical earlier request is
+    answered from it without a call; with a rate limiter, the call first waits for quota.
+    """
+    if cache is not None:
+        key = cache_key(model_name(model), preprompt, main_prompt, job_description_content, GENERATION_SETTINGS)
+        if (cached := cache.get(key)) is not None:
+            print("  > Cache hit: reused the response to an identical earlier request (no AI call).")
+            return cached
+
+    final_prompt = f"{preprompt}\n\n{main_prompt}\n\n--- JOB DESCRIPTION ---\n\n{job_description_content}"
+    ai_output = send_prompt(model, final_prompt, limiter)
+    if cache is not None and ai_output:
+        cache.put(key, ai_output, prompt_version(preprompt, main_prompt), model_name(model))
+    return ai_output
+
+def send_prompt(model, final_prompt, limiter=None):
+    """Sends one prompt (waiting for the rate limiter, if given) and returns the answer without code fences."""
+    estimated_tokens = len(final_prompt) // CHARS_PER_TOKEN
+    if limiter is not None and (waited := limiter.acquire(estimated_tokens)) >= 1:
+        print(f"  > Waited {waited:.1f}s for the API rate limit.")
+
+    response = model.generate_content(final_prompt, safety_settings=SAFETY_SETTINGS)
+    if limiter is not None and (usage := getattr(response, 'usage_metadata', None)) is not None:
+        limiter.settle(estimated_tokens, usage.total_token_count)
+
+    # Accessing text after confirming the response is valid
+    return re.sub(r'```(text|markdown|)?', '', response.text).strip()
+
+def max_batch_size(preprompt, main_prompt):
+    """Returns the most job descriptions one request can carry within the model's output and context limits."""
+    prefix_tokens = (len(preprompt) + len(main_prompt)) // CHARS_PER_TOKEN
+    by_output = MODEL_OUTPUT_TOKENS // DATA_TXT_TOKENS
+    by_context = (MODEL_CONTEXT_TOKENS - prefix_tokens) // (JOB_DESCRIPTION_TOKENS + DATA_TXT_TOKENS)
+    return max(1, min(by_output, by_context))
+
+def valid_data_txt(text):
+    """True if a data.txt answer has every REQUIRED_DATA_KEYS section."""
+    keys = {key for key, _ in split_sections(text)}
+    return all(key in keys for key in REQUIRED_DATA_KEYS)
+
+def split_sections(text):
+    """Splits data.txt text into [key, lines] sections; a section runs from its 'KEY:' line to the next one."""
+    sections = []
+    for line in text.splitlines():
+        if match := SECTION_KEY_PATTERN.match(line):
+            sections.append([match.group(1), [line]])
+        elif sections:
+            sections[-1][1].append(line)
+        else:
+            sections.append([None, [line]])
+    return sections
+
+def merge_sections(draft, delta, keys=DELTA_KEYS):
+    """Returns the draft data.txt with the sections in `keys` replaced by the delta's, or None if the delta lacks any."""
+    updates = {key: lines for key, lines in split_sections(delta) if key in keys}
+    if any(key not in updates for key in keys):
+        return None
+    sections = split_sections(draft)
+    present = {key for key, _ in sections}
+    sections += [[key, updates[key]] for key in keys if key not in present]
+    return "\n".join("\n".join(updates.get(key, lines)) for key, lines in sections).strip()
+
+def tailor_from_similar(folder_name, job_description_content, model, preprompt, main_prompt, similarity, limiter=None, cache=None):
+    """
+    If a job description at least as similar as the similarity threshold was tailored before, returns its data.txt
+    with only DELTA_KEYS rewritten by the model for this posting. Returns None to fall back to a full generation.
+    """
+    match = similarity.nearest(job_description_content, exclude=folder_name)
+    if match is None:
+        return None
+    neighbour, score = match
+    draft = read_opportunity_file(neighbour, 'data.txt')
+    if draft is None:
+        return None
+    print(f"  > {score:.0%} similar to '{neighbour}'. Reusing its data.txt and asking only for {', '.join(DELTA_KEYS)}.")
+    context = f"--- TAILORED DATA FOR A SIMILAR JOB ---\n\n{draft}"
+    delta = generate_data_txt(model, DELTA_INSTRUCTIONS, context, job_description_content, limiter, cache)
+    merged = merge_sections(draft, delta)
+    if merged is None:
+        print("  > The model's answer is missing fields. Generating the full data.txt instead.")
+        return None
+    # The draft's cover letter is dated on the day it was tailored.
+    merged = merge_sections(merged, f"APPLICATION_DATE: {application_date()}", keys=("APPLICATION_DATE",))
+    # Stored under this posting's own key too, so re-tailoring it after a reset is answered from the cache.
+    if cache is not None:
+        key = cache_key(model_name(model), preprompt, main_prompt, job_description_content, GENERATION_SETTINGS)
+        cache.put(key, merged, prompt_version(preprompt, main_prompt), model_name(model))
+    # Saved: the prompt files that were not sent, and the part of data.txt that was not generated.
+    similarity.note_saving((len(preprompt) + len(main_prompt) - len(DELTA_INSTRUCTIONS) - len(context) + len(draft) - len(delta)) // CHARS_PER_TOKEN)
+    return merged
+
+def tailor_opportunity(item, model, preprompt, main_prompt, catalog, queue, limiter=None, cache=None, similarity=None):
+    """
+    Claims the folder's lease and tailors it. A folder leased by another worker (another process or machine
+    sharing 3_Opportunities) is deferred until that lease would have expired. Returns True if it was tailored.
+    """
+    with OpportunityLease(catalog.folder_path(item['folder']), "tailor") as lease:
+        if not lease.acquired:
+            print(f"\nSkipping '{item['folder']}': claimed by {lease.holder}.")
+            queue.defer(item, LEASE_SECONDS)
+            return False
+        return tailor_claimed_opportunity(item, model, preprompt, main_prompt, catalog, queue, limiter, cache, similarity, lease)
+
+def lost_lease(item, lease, queue):
+    """
+    Returns True if the heartbeat lost the folder's lease while it was being tailored, after deferring the item:
+    the lease's new holder writes data.txt instead, so nothing is written or acked here.
+    """
+    if lease is None or lease.acquired:
+        return False
+    print(f"  > Lost the lease on '{item['folder']}' to another worker. Leaving the folder to it.")
+    queue.defer(item, LEASE_SECONDS)
+    return True
+
+def tailor_claimed_opportunity(item, model, preprompt, main_prompt, catalog, queue, limiter=None, cache=None, similarity=None, lease=None):
+    """
+    Generates data.txt for one queued opportunity, then acks it and queues it for rendering, or nacks it on failure.
+    Nothing is written if `lease` was lost meanwhile. Returns True if the opportunity needed tailoring (whether or not it succeeded).
+    """
+    folder_name = item['folder']
+    opportunity_path = catalog.folder_path(folder_name)
+    job_desc_path = os.path.join(opportunity_path, 'jobdescription.txt')
+    data_status = get_specific_status(job_desc_path, "Data-Status")
+    print(f"\nChecking '{folder_name}'... Data-Status: {data_status.upper()}")
+
+    if data_status not in ['pending', 'error']:
+        # Already tailored or removed since it was queued.
+        catalog.sync_folder(opportunity_path)
+        queue.ack(item)
+        return False
+
+    print(f"  > Processing opportunity...")
+    try:
+        if lost_lease(item, lease, queue):
+            return False
+        if (reused_data := reuse_duplicate_data(opportunity_path, job_desc_path)) is not None:
+            # Stored under the repost's own key, so re-tailoring it after its link is cleared needs no request.
+            if cache is not None:
+                with open(job_desc_path, 'r', encoding='utf-8') as f:
+                    key = cache_key(model_name(model), preprompt, main_prompt, f.read(), GENERATION_SETTINGS)
+                cache.put(key, reused_data, prompt_version(preprompt, main_prompt), model_name(model))
+            update_specific_status(job_desc_path, "Data-Status", "complete", catalog)
+            queue.ack(item); queue.enqueue("render", folder_name)
+            return True
+
+        with open(job_desc_path, 'r', encoding='utf-8') as f:
+            job_description_content = f.read()
+
+        ai_output = None
+        # An exact response cache entry is used before any similar draft, so re-tailoring after a reset makes no
+        # AI calls, whatever order the folders come in.
+        cached = cache is not None and cache_key(model_name(model), preprompt, main_prompt, job_description_content, GENERATION_SETTINGS) in cache
+        if similarity is not None and not cached:
+            ai_output = tailor_from_similar(folder_name, job_description_content, model, preprompt, main_prompt, similarity, limiter, cache)
+        if ai_output is None:
+            print(f"  > Sending prompt to {model_name(model)}...")
+            ai_output = generate_data_txt(model, preprompt, main_prompt, job_description_content, limiter, cache)
+            if similarity is not None and ai_output:
+                similarity.add(folder_name, job_description_content)
+
+        if lost_lease(item, lease, queue):
+            return True
+        data_txt_path = os.path.join(opportunity_path, 'data.txt')
+        atomic_write(data_txt_path, ai_output)
+        print(f"  > SUCCESS: AI-generated data.txt saved.")
+        update_specific_status(job_desc_path, "Data-Status", "complete", catalog)
+        queue.ack(item); queue.enqueue("render", folder_name)
+    except Exception as e:
+        print(f"  > ERROR: An error occurred during AI processing for {folder_name}: {e}")
+        update_specific_status(job_desc_path, "Data-Status", "error", catalog)
+        print(f"  > Queued for retry ({queue.nack(item, e)}).")
+    return True
+
+def save_batch_answer(item, job_description_content, answer, model, preprompt, main_prompt, catalog, queue, cache=None, similarity=None, lease=None):
+    """Writes one job's answer from a batch request as its data.txt, then acks it and queues it for rendering, unless `lease` was lost."""
+    if lost_lease(item, lease, queue):
+        return
+    folder_name = item['folder']
+    opportunity_path = catalog.folder_path(folder_name)
+    job_desc_path = os.path.join(opportunity_path, 'jobdescription.txt')
+    try:
+        atomic_write(os.path.join(opportunity_path, 'data.txt'), answer)
+        print(f"  > SUCCESS: data.txt for '{folder_name}' saved from the batch answer.")
+        update_specific_status(job_desc_path, "Data-Status", "complete", catalog)
+        queue.ack(item); queue.enqueue("render", folder_name)
+        # Stored under the single-job key, so re-tailoring this posting alone is answered from the cache.
+        if cache is not None:
+            key = cache_key(model_name(model), preprompt, main_prompt, job_description_content, GENERATION_SETTINGS)
+            cache.put(key, answer, prompt_version(preprompt, main_prompt), model_name(model))
+        if similarity is not None:
+            similarity.add(folder_name, job_description_content)
+    except Exception as e:
+        print(f"  > ERROR: Could not save the batch answer for {folder_name}: {e}")
+        update_specific_status(job_desc_path, "Data-Status", "error", catalog)
+        print(f"  > Queued for retry ({queue.nack(item, e)}).")
+
+def tailor_batch(items, model, preprompt, main_prompt, catalog, queue, limiter=None, cache=None, similarity=None):
+    """
+    Claims the leases of several queued opportunities and tailors the pending ones with a single request.
+    Linked reposts, jobs already in the response cache, and any job whose answer comes back missing or
+    malformed go through tailor_claimed_opportunity one at a time. Returns how many needed tailoring.
+    """
+    with ExitStack() as stack:
+        batch, singles, leases = [], [], {}
+        for item in items:
+            opportunity_path = catalog.folder_path(item['folder'])
+            lease = leases[item['id']] = stack.enter_context(OpportunityLease(opportunity_path, "tailor"))
+            if not lease.acquired:
+                print(f"\nSkipping '{item['folder']}': claimed by {lease.holder}.")
+                queue.defer(item, LEASE_SECONDS)
+                continue
+            job_desc_path = os.path.join(opportunity_path, 'jobdescription.txt')
+            if (get_specific_status(job_desc_path, "Data-Status") not in ['pending', 'error']
+                    or get_specific_status(job_desc_path, "Duplicate-Of") != "unknown"):
+                singles.append(item)  # Acked, or answered from the linked original, without a request.
+                continue
+            with open(job_desc_path, 'r', encoding='utf-8') as f:
+                job_description_content = f.read()
+            if cache is not None and cache_key(model_name(model), preprompt, main_prompt, job_description_content, GENERATION_SETTINGS) in cache:
+                singles.append(item)
+            else:
+                batch.append((item, job_description_content))
+        if len(batch) == 1:
+            singles.append(batch.pop()[0])
+
+        processed = 0
+        if batch:
+            print(f"\nTailoring {len(batch)} opportunities in one request: {', '.join(item['folder'] for item, _ in batch)}")
+            answers = {}
+            try:
+                final_prompt = build_batch_prompt(preprompt, main_prompt, [content for _, content in batch])
+                answers = split_batch_response(send_prompt(model, final_prompt, limiter))
+            except Exception as e:
+                print(f"  > ERROR: The batch request failed: {e}. Tailoring its opportunities one at a time.")
+            for number, (item, job_description_content) in enumerate(batch, 1):
+                answer = answers.get(number)
+                if answer is None or not valid_data_txt(answer):
+                    if answers:
+                        print(f"  > The answer for '{item['folder']}' is missing or incomplete. Tailoring it on its own.")
+                    singles.append(item)
+                    continue
+                save_batch_answer(item, job_description_content, answer, model, preprompt, main_prompt, catalog, queue, cache, similarity, leases[item['id']])
+                processed += 1
+
+        for item in singles:
+            processed += tailor_claimed_opportunity(item, model, preprompt, main_prompt, catalog, queue, limiter, cache, similarity, leases[item['id']])
+        return processed
+
+def drain_tailor_queue(model, preprompt, main_prompt, limiter=None, cache=None, similarity=None, batch_size=1):
+    """
+    Tailors queued opportunities until the "tailor" queue is empty, batch_size at a time in one request each
+    when batch_size is above 1. Returns how many needed tailoring.
+    """
+    catalog = OpportunityCatalog()
+    queue = WorkQueue()
+    processed = 0
+    while (item := queue.pop("tailor")) is not None:
+        prompts = current_prompts(model, preprompt, main_prompt)
+        if batch_size > 1:
+            items = [item]
+            while len(items) < batch_size and (next_item := queue.pop("tailor")) is not None:
+                items.append(next_item)
+            processed += tailor_batch(items, model, *prompts, catalog, queue, limiter, cache, similarity)
+        elif tailor_opportunity(item, model, *prompts, catalog, queue, limiter, cache, similarity):
+            processed += 1
+    queue.close()
+    catalog.close()
+    return processed
+
+def option_value(args, flag, default, cast=int):
+    """Returns the value following `flag` in args, or default."""
+    return cast(args[args.index(flag) + 1]) if flag in args and args.index(flag) + 1 < len(args) else default
+
+def main():
+    """Finds opportunities needing data generation and uses AI to create data.txt files."""
+    args = sys.argv[1:]
+    workers = option_value(args, '--workers', MAX_IN_FLIGHT)
+    batch_size = option_value(args, '--batch', 1)
+    if '--benchmark' in args:
+        # One harness for both entry points: it runs this phase in a scratch copy of the project.
+        from tailor_benchmark import main as run_benchmark
+        run_benchmark([arg for arg in args if arg != '--benchmark'])
+        return
+
+    print("--- Phase 2: AI Data Tailoring ---")
+    model = configure_model()
+    preprompt, main_prompt = load_prompt_files()
+    if '--no-prefix-cache' not in args:
+        model = PrefixCachedModel(model)
+    if batch_size > (limit := max_batch_size(preprompt, main_prompt)):
+        print(f"  > INFO: --batch {batch_size} would exceed the model's output or context limit. Using {limit}.")
+        batch_size = limit
+
     if not os.path.isdir(OPPORTUNITIES_BASE_DIR):
         print(f"Error: Opportunities directory not found at '{OPPORTUNITIES_BASE_DIR}'"); return
 
-    for folder_name in sorted(os.listdir(OPPORTUNITIES_BASE_DIR)):
-        opportunity_path = os.path.join(OPPORTUNITIES_BASE_DIR, folder_name)
-        if os.path.isdir(opportunity_path):
-            job_desc_path = os.path.join(opportunity_path, 'jobdescription.txt')
-            data_status = get_specific_status(job_desc_path, "Data-Status")
-            print(f"\nChecking '{folder_name}'... Data-Status: {data_status.upper()}")
-
-            if data_status in ['pending', 'error']:
-                opportunities_to_process += 1
-                print(f"  > Processing opportunity...")
-                try:
-                    with open(job_desc_path, 'r', encoding='utf-8') as f:
-                        job_description_content = f.read()
-                    
-                    final_prompt = f"{preprompt}\n\n{main_prompt}\n\n--- JOB DESCRIPTION ---\n\n{job_description_content}"
-                    
-                    print("  > Sending prompt to Google AI...")
-                    
-                    # --- FIX 2: Add safety settings to prevent the model from blocking the response ---
-                    safety_settings = {
-                        HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
-                        HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
-                        HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
-                        HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
-                    }
-
-                    response = model.generate_content(final_prompt, safety_settings=safety_settings)
-                    
-                    # Accessing text after confirming the response is valid
-                    ai_output = re.sub(r'```(text|markdown|)?', '', response.text).strip()
-
-                    data_txt_path = os.path.join(opportunity_path, 'data.txt')
-                    with open(data_txt_path, 'w', encoding='utf-8') as f:
-                        f.write(ai_output)
-                    print(f"  > SUCCESS: AI-generated data.txt saved.")
-                    update_specific_status(job_desc_path, "Data-Status", "complete")
-                except Exception as e:
-                    print(f"  > ERROR: An error occurred during AI processing for {folder_name}: {e}")
-                    update_specific_status(job_desc_path, "Data-Status", "error")
+    # New and failed opportunities arrive on the "tailor" queue; tailored ones are handed to "render".
+    # Every worker pops its own items, so each folder is still written and acked by exactly one thread.
+    WorkQueue(seed_from_catalog=True).close()  # Creates (and seeds) the queue once, before the workers open it.
+    limiter = RateLimiter(REQUESTS_PER_MINUTE, TOKENS_PER_MINUTE)
+    cache = None if '--no-cache' in args else ResponseCache()
+    similarity = SimilarityCache() if SimilarityCache is not None and '--no-reuse' not in args else None
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        opportunities_to_process = sum(pool.map(lambda _: drain_tailor_queue(model, preprompt, main_prompt, limiter, cache, similarity, batch_size), range(workers)))
+    elapsed = time.perf_counter() - started
+    if similarity is not None:
+        lookups = similarity.hits + similarity.misses
+        print(f"\nSimilar-draft reuse: {similarity.hits} of {lookups} opportunities ({similarity.hits / lookups if lookups else 0:.0%}),"
+              f" ~{similarity.tokens_saved:,} tokens saved.")
+        similarity.close()
+    if cache is not None:
+        print(f"Response cache: {cache.hits} hits, {cache.misses} misses ({cache.hits} AI calls saved).")
+        cache.close()
+    if isinstance(model, PrefixCachedModel):
+        print(model.summary())
+        model.close()
 
     if opportunities_to_process == 0:
         print("\nScan complete. No opportunities need data.txt generation.")
     else:
-        print(f"\nScan complete. Processed {opportunities_to_process} opportunities.")
+        print(f"\nScan complete. Processed {opportunities_to_process} opportunities in {elapsed:.1f}s with {workers} workers.")
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
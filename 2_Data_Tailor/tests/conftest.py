@@ -0,0 +1,13 @@
+# FILE: ./2_Data_Tailor/tests/conftest.py
+
+import os
+import sys
+
+# --- Dynamic Path Configuration ---
+TESTS_DIR = os.path.dirname(os.path.realpath(__file__))
+SCRIPT_DIR = os.path.dirname(TESTS_DIR)
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+
+# The tailor's modules import each other (and the project root's) by bare name, as when run as scripts.
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, SCRIPT_DIR)
@@ -0,0 +1,37 @@
+# FILE: ./2_Data_Tailor/tests/test_batch_prompt.py
+
+from batch_prompt import build_batch_prompt, split_batch_prompt, split_batch_response, ANSWER_START, ANSWER_END
+
+DESCRIPTIONS = [
+    "Company Name: Acme\nRole Name: Scrum Master\n\nJob Description:\nLead two teams.",
+    "Company Name: Globex\nRole Name: Project Manager\n\nJob Description:\nRun the PMO.\n\n=== not a marker ===",
+    "Company Name: Initech\nRole Name: Agile Coach\n\nJob Description:\nCoach everyone.",
+]
+
+def answer(n, text):
+    return f"{ANSWER_START.format(n=n)}\n{text}\n{ANSWER_END.format(n=n)}"
+
+def test_batch_prompt_starts_with_the_prompt_files_once():
+    prompt = build_batch_prompt("PREPROMPT", "MAIN PROMPT", DESCRIPTIONS)
+    assert prompt.startswith("PREPROMPT\n\nMAIN PROMPT\n\n")
+    assert prompt.count("MAIN PROMPT") == 1
+    assert "3 separate job descriptions" in prompt
+
+def test_batch_prompt_round_trips_its_job_descriptions():
+    prompt = build_batch_prompt("PREPROMPT", "MAIN PROMPT", DESCRIPTIONS)
+    assert split_batch_prompt(prompt) == {n: description for n, description in enumerate(DESCRIPTIONS, 1)}
+
+def test_a_single_job_prompt_is_not_a_batch():
+    assert split_batch_prompt("PREPROMPT\n\nMAIN PROMPT\n\n--- JOB DESCRIPTION ---\n\nLead two teams.") == {}
+
+def test_split_response_matches_answers_by_number_not_order():
+    text = "\n\n".join([answer(2, "COMPANY_NAME: Globex"), answer(1, "COMPANY_NAME: Acme\nJOB_ROLE: Scrum Master")])
+    assert split_batch_response(text) == {1: "COMPANY_NAME: Acme\nJOB_ROLE: Scrum Master", 2: "COMPANY_NAME: Globex"}
+
+def test_split_response_drops_a_cut_off_or_mismatched_answer():
+    text = "\n\n".join([
+        answer(1, "COMPANY_NAME: Acme"),
+        f"{ANSWER_START.format(n=2)}\nCOMPANY_NAME: Globex\n{ANSWER_END.format(n=3)}",
+        f"{ANSWER_START.format(n=3)}\nCOMPANY_NAME: Initech",
+    ])
+    assert split_batch_response(text) == {1: "COMPANY_NAME: Acme"}
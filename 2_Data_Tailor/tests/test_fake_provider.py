@@ -0,0 +1,63 @@
+# FILE: ./2_Data_Tailor/tests/test_fake_provider.py
+
+import threading
+
+import pytest
+
+from llm_backends import create_backend, OpenAICompatibleBackend
+from fake_llm_server import FakeLLMServer, MODEL_NAME
+from batch_prompt import build_batch_prompt, split_batch_response
+from stub_model import fake_data_txt, template_keys
+from tailor_data import valid_data_txt
+import tailor_benchmark
+
+DESCRIPTIONS = [f"Company Name: Company {n}\nRole Name: Scrum Master\n\nJob Description:\nLead team {n}." for n in range(1, 4)]
+
+@pytest.fixture
+def server():
+    server = FakeLLMServer(port=0, latency=0, jitter=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def backend(server, monkeypatch):
+    monkeypatch.setenv("OPENAI_BASE_URL", server.url)
+    monkeypatch.setenv("LLM_MODEL", MODEL_NAME)
+    return create_backend("openai")
+
+def single_prompt(description):
+    return f"PREPROMPT\n\nMAIN PROMPT\n\n--- JOB DESCRIPTION ---\n\n{description}"
+
+def test_the_fake_server_binds_a_free_port(server):
+    assert server.server_address[1] != 0
+    assert server.url.endswith(f":{server.server_address[1]}/v1")
+
+def test_create_backend_talks_to_the_fake_server(backend, server):
+    assert isinstance(backend, OpenAICompatibleBackend) and backend.model_name == MODEL_NAME
+    response = backend.generate_content(single_prompt(DESCRIPTIONS[0]))
+    assert response.text == fake_data_txt(single_prompt(DESCRIPTIONS[0]), template_keys())
+    assert valid_data_txt(response.text)
+    assert response.usage_metadata.prompt_token_count == len(single_prompt(DESCRIPTIONS[0])) // 4
+    assert server.requests == 1
+
+def test_a_batch_prompt_gets_one_valid_answer_per_job(backend):
+    answers = split_batch_response(backend.generate_content(build_batch_prompt("PREPROMPT", "MAIN PROMPT", DESCRIPTIONS)).text)
+    assert sorted(answers) == [1, 2, 3]
+    assert all(valid_data_txt(answer) and f"COMPANY_NAME: Company {n}" in answer for n, answer in answers.items())
+
+def test_a_streamed_answer_matches_the_whole_one(backend):
+    assert "".join(backend.stream(single_prompt(DESCRIPTIONS[1]))) == backend.generate_content(single_prompt(DESCRIPTIONS[1])).text
+
+def test_an_injected_error_raises(server, backend):
+    server.error_rate = 1.0
+    with pytest.raises(RuntimeError, match="HTTP 500"):
+        backend.generate_content(single_prompt(DESCRIPTIONS[0]))
+
+def test_the_benchmark_runs_the_tailor_phase_against_the_fake_server(capfd):
+    tailor_benchmark.main(["--jobs", "6", "--workers", "2", "--batch", "2", "--latency", "0", "--jitter", "0"])
+    output = capfd.readouterr().out
+    assert "6 of 6 data.txt written" in output
+    assert "Fake server: 3 requests" in output
+    assert "Speed-up:" in output and "(plus 6 for the baseline)" in output
@@ -0,0 +1,46 @@
+# FILE: ./2_Data_Tailor/tests/test_merge_sections.py
+
+from tailor_data import merge_sections, split_sections, application_date, DELTA_KEYS
+
+DRAFT = """COMPANY_NAME: Acme
+JOB_ROLE: Scrum Master
+HIRING_MANAGER: Hiring Team
+SUBJECT: Application for Scrum Master
+CONTENT: Dear Hiring Team,
+I led two agile teams.
+SUMMARY: Certified Scrum Master.
+APPLICATION_DATE: July 30th, 2025"""
+
+DELTA = """COMPANY_NAME: Globex
+JOB_ROLE: Project Manager
+HIRING_MANAGER: Jane Doe
+SUBJECT: Application for Project Manager
+CONTENT: Dear Jane,
+I ran a PMO."""
+
+def test_split_sections_keeps_continuation_lines_with_their_key():
+    assert split_sections(DRAFT)[4] == ["CONTENT", ["CONTENT: Dear Hiring Team,", "I led two agile teams."]]
+
+def test_merge_replaces_only_the_delta_keys():
+    merged = dict((key, lines) for key, lines in split_sections(merge_sections(DRAFT, DELTA)))
+    assert merged["COMPANY_NAME"] == ["COMPANY_NAME: Globex"]
+    assert merged["CONTENT"] == ["CONTENT: Dear Jane,", "I ran a PMO."]
+    assert merged["SUMMARY"] == ["SUMMARY: Certified Scrum Master."]
+    assert [key for key, _ in split_sections(merge_sections(DRAFT, DELTA))] == [key for key, _ in split_sections(DRAFT)]
+
+def test_merge_ignores_keys_outside_the_delta():
+    merged = merge_sections(DRAFT, DELTA + "\nSUMMARY: Invented by the model.")
+    assert "SUMMARY: Certified Scrum Master." in merged
+    assert "Invented" not in merged
+
+def test_merge_gives_up_when_the_delta_lacks_a_key():
+    assert merge_sections(DRAFT, DELTA.replace("HIRING_MANAGER: Jane Doe\n", "")) is None
+
+def test_merge_appends_a_key_the_draft_lacks():
+    merged = merge_sections(DRAFT.replace("HIRING_MANAGER: Hiring Team\n", ""), DELTA)
+    assert split_sections(merged)[-1] == ["HIRING_MANAGER", ["HIRING_MANAGER: Jane Doe"]]
+    assert all(key in merged for key in DELTA_KEYS)
+
+def test_merge_can_redate_a_reused_draft():
+    merged = merge_sections(DRAFT, f"APPLICATION_DATE: {application_date()}", keys=("APPLICATION_DATE",))
+    assert merged.endswith(f"APPLICATION_DATE: {application_date()}")
@@ -0,0 +1,46 @@
+# FILE: ./2_Data_Tailor/tests/test_opportunity_lease.py
+
+import os
+
+from opportunity_lease import OpportunityLease, LEASE_FILE_NAME, read_lease
+from tailor_data import lost_lease
+
+def test_renewing_a_held_lease_extends_it_in_place(tmp_path):
+    lease = OpportunityLease(str(tmp_path), "tailor")
+    assert lease.try_create()
+    expires_at = read_lease(lease.lease_path)["expires_at"]
+    assert lease.try_renew()
+    assert read_lease(lease.lease_path)["token"] == lease.token
+    assert read_lease(lease.lease_path)["expires_at"] >= expires_at
+    assert os.listdir(tmp_path) == [LEASE_FILE_NAME]
+
+def test_renewing_leaves_a_lease_taken_over_by_another_worker_alone(tmp_path):
+    lease, thief = OpportunityLease(str(tmp_path), "tailor"), OpportunityLease(str(tmp_path), "tailor")
+    assert lease.try_create()
+    thief.try_steal(read_lease(lease.lease_path))
+    assert thief.try_create()
+    assert not lease.try_renew()
+    assert read_lease(lease.lease_path)["token"] == thief.token
+    assert os.listdir(tmp_path) == [LEASE_FILE_NAME]
+
+def test_renewing_a_removed_lease_fails(tmp_path):
+    lease = OpportunityLease(str(tmp_path), "tailor")
+    assert lease.try_create()
+    os.remove(lease.lease_path)
+    assert not lease.try_renew()
+    assert os.listdir(tmp_path) == []
+
+def test_a_lost_lease_stops_the_tailor_before_it_writes(tmp_path):
+    class Queue:
+        def __init__(self):
+            self.deferred = []
+        def defer(self, item, seconds):
+            self.deferred.append(item['folder'])
+
+    lease, queue = OpportunityLease(str(tmp_path), "tailor"), Queue()
+    assert not lost_lease({"folder": "f"}, None, queue)
+    lease.acquired = True
+    assert not lost_lease({"folder": "f"}, lease, queue)
+    lease.acquired = False
+    assert lost_lease({"folder": "f"}, lease, queue)
+    assert queue.deferred == ["f"]
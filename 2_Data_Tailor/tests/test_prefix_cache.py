@@ -0,0 +1,67 @@
+# FILE: ./2_Data_Tailor/tests/test_prefix_cache.py
+
+import os
+
+import pytest
+
+import prefix_cache
+from prefix_cache import PrefixCachedModel, prefix_text
+from stub_model import StubModel
+from tailor_data import current_prompts
+
+JOB = "--- JOB DESCRIPTION ---\n\nCompany Name: Acme\nRole Name: Scrum Master\n\nJob Description:\nLead two teams."
+
+@pytest.fixture
+def prompt_files(tmp_path, monkeypatch):
+    """Points the prefix cache at scratch prompt files, and returns a function that rewrites them."""
+    paths = tmp_path / "preprompt.txt", tmp_path / "prompt.txt"
+    monkeypatch.setattr(prefix_cache, "PREPROMPT_PATH", str(paths[0]))
+    monkeypatch.setattr(prefix_cache, "PROMPT_PATH", str(paths[1]))
+
+    def write(preprompt, main_prompt, age=0):
+        for path, text in zip(paths, (preprompt, main_prompt)):
+            path.write_text(text, encoding="utf-8")
+            os.utime(path, (path.stat().st_mtime - age, path.stat().st_mtime - age))
+    write("You are a CV writer. " * 200, "Fill in every key. " * 200, age=10)
+    return write
+
+def final_prompt(model):
+    return f"{prefix_text(*model.load_prompts())}\n\n{JOB}"
+
+def test_a_prompt_starting_with_the_prompt_files_is_sent_against_the_cached_prefix(prompt_files):
+    model = PrefixCachedModel(StubModel(0, 0))
+    for _ in range(3):
+        assert "COMPANY_NAME: Acme" in model.generate_content(final_prompt(model)).text
+    assert model.registrations == 1
+    assert model.cached_tokens == 3 * (len(prefix_text(*model.prompts)) // 4)
+    assert 0 < model.uncached_tokens < model.cached_tokens
+
+def test_any_other_prompt_is_sent_whole(prompt_files):
+    model = PrefixCachedModel(StubModel(0, 0))
+    model.generate_content(f"Rewrite only COMPANY_NAME.\n\n{JOB}")
+    assert model.registrations == 0
+    assert model.cached_tokens == 0 and model.uncached_tokens > 0
+
+def test_an_edited_prompt_file_registers_a_new_prefix(prompt_files):
+    model = PrefixCachedModel(StubModel(0, 0))
+    model.generate_content(final_prompt(model))
+    prompt_files("You are a CV writer. " * 200, "Fill in every key, in English. " * 200)
+    prompts = current_prompts(model, "stale preprompt", "stale prompt")
+    assert prompts[1].startswith("Fill in every key, in English.")
+    model.generate_content(f"{prefix_text(*prompts)}\n\n{JOB}")
+    assert model.registrations == 2
+    assert model.cached_tokens == len(prefix_text(*model.prompts)) // 4 + len(prefix_text("You are a CV writer. " * 200, "Fill in every key. " * 200)) // 4
+
+def test_a_model_without_prefix_caching_gets_whole_prompts(prompt_files):
+    class PlainModel:
+        def __init__(self):
+            self.stub = StubModel(0, 0)
+
+        def generate_content(self, prompt, **kwargs):
+            return self.stub.generate_content(prompt, **kwargs)
+
+    model = PrefixCachedModel(PlainModel())
+    model.generate_content(final_prompt(model))
+    model.generate_content(final_prompt(model))
+    assert model.unsupported and model.registrations == 0
+    assert model.cached_tokens == 0 and model.uncached_tokens == 2 * (len(final_prompt(model)) // 4)
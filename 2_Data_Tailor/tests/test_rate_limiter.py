@@ -0,0 +1,52 @@
+# FILE: ./2_Data_Tailor/tests/test_rate_limiter.py
+
+import time
+
+import pytest
+
+from rate_limiter import TokenBucket, RateLimiter
+
+def test_bucket_refills_evenly_up_to_capacity():
+    bucket = TokenBucket(60, period=60.0)
+    bucket.available = 0
+    bucket.refill(bucket.updated + 10)
+    assert bucket.available == pytest.approx(10)
+    bucket.refill(bucket.updated + 1000)
+    assert bucket.available == 60
+
+def test_bucket_wait_time_is_the_missing_units_over_the_rate():
+    bucket = TokenBucket(120, period=60.0)
+    bucket.available = 0.5
+    assert bucket.wait_time(2) == pytest.approx(0.75)
+    assert bucket.wait_time(0.5) == 0
+
+def test_limiter_passes_calls_within_the_quota_without_waiting():
+    limiter = RateLimiter(requests_per_minute=60, tokens_per_minute=6000)
+    assert all(limiter.acquire(100) < 0.05 for _ in range(5))
+    assert limiter.throttled_calls == 0
+
+def test_limiter_blocks_a_call_over_the_request_quota_until_the_bucket_refills():
+    limiter = RateLimiter(requests_per_minute=600, tokens_per_minute=10**9)  # One request per 0.1s once the burst is spent.
+    for _ in range(600):
+        limiter.acquire(1)
+    started = time.monotonic()
+    waited = limiter.acquire(1)
+    assert 0.05 < waited < 1.0
+    assert time.monotonic() - started >= waited
+    assert limiter.throttled_calls == 1
+
+def test_limiter_blocks_a_call_over_the_token_quota():
+    limiter = RateLimiter(requests_per_minute=600, tokens_per_minute=6000)  # 100 tokens per second.
+    limiter.acquire(6000)
+    assert 0.1 < limiter.acquire(20) < 1.0
+
+def test_settle_charges_an_underestimate_to_the_next_calls():
+    limiter = RateLimiter(requests_per_minute=600, tokens_per_minute=6000)
+    limiter.acquire(100)
+    limiter.settle(100, 7000)
+    assert limiter.tokens.available < 0
+    assert limiter.tokens.wait_time(1) > 0
+
+def test_a_prompt_larger_than_the_whole_quota_still_goes_through():
+    limiter = RateLimiter(requests_per_minute=600, tokens_per_minute=1000)
+    assert limiter.acquire(50000) < 0.05
@@ -0,0 +1,75 @@
+# FILE: ./2_Data_Tailor/tests/test_response_cache.py
+
+import pytest
+
+import response_cache
+from response_cache import ResponseCache, cache_key, prompt_version
+
+JOB = "Status: pending\nData-Status: pending\nCompany Name: Acme\nRole Name: Scrum Master\n\nJob Description:\nLead two teams."
+SETTINGS = "temperature=0.2"
+
+class Clock:
+    """Stands in for time.time() in response_cache, advancing only when told to."""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(response_cache, "time", clock)
+    return clock
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    cache = ResponseCache(str(tmp_path / "response_cache.db"), max_bytes=10, max_age_days=1)
+    yield cache
+    cache.close()
+
+def test_the_key_ignores_status_lines_but_not_the_request():
+    key = cache_key("model", "pre", "main", JOB, SETTINGS)
+    reset = JOB.replace("Data-Status: pending", "Data-Status: error")
+    linked = JOB.replace("Status: pending\n", "Status: pending\nDuplicate-Of: Acme_Scrum_Master\n", 1)
+    assert cache_key("model", "pre", "main", reset, SETTINGS) == key
+    assert cache_key("model", "pre", "main", linked, SETTINGS) == key
+    assert cache_key("other-model", "pre", "main", JOB, SETTINGS) != key
+    assert cache_key("model", "pre", "changed", JOB, SETTINGS) != key
+    assert cache_key("model", "pre", "main", JOB.replace("two", "three"), SETTINGS) != key
+    assert cache_key("model", "pre", "main", JOB, "temperature=0.7") != key
+
+def test_a_stored_response_is_returned_and_counted(cache):
+    assert cache.get("a") is None
+    cache.put("a", "1234", "v1")
+    assert "a" in cache and "b" not in cache
+    assert cache.get("a") == "1234"
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.stats() == {"entries": 1, "bytes": 4, "hits": 1, "misses": 1, "evictions": 0}
+
+def test_the_least_recently_used_response_is_evicted_over_the_size_limit(cache, clock):
+    cache.put("a", "1234", "v1"); clock.now += 1
+    cache.put("b", "1234", "v1"); clock.now += 1
+    cache.get("a"); clock.now += 1
+    cache.put("c", "1234", "v1")
+    assert "a" in cache and "b" not in cache and "c" in cache
+    assert cache.stats()["evictions"] == 1
+
+def test_a_response_past_the_age_limit_is_a_miss_and_evicted(cache, clock):
+    cache.put("a", "1234", "v1")
+    clock.now += 86400 + 1
+    assert "a" not in cache
+    assert cache.get("a") is None
+    cache.put("b", "1234", "v1")
+    assert cache.stats()["entries"] == 1 and cache.stats()["evictions"] == 1
+
+def test_invalidate_drops_one_prompt_version_or_all_but_one(cache):
+    versions = [prompt_version("pre", "main"), prompt_version("pre", "changed"), prompt_version("new", "main")]
+    assert len(set(versions)) == 3
+    for key, version in zip("abc", versions):
+        cache.put(key, "1", version)
+    assert cache.invalidate(version=versions[0]) == 1
+    assert "a" not in cache and "b" in cache
+    assert cache.invalidate(keep_version=versions[2]) == 1
+    assert "b" not in cache and "c" in cache
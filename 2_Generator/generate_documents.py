@@ -15,6 +15,11 @@ TODO_FILE_PATH = os.path.join(PROJECT_ROOT, 'todo.txt')
 CV_TEMPLATE_HTML_PATH = os.path.join(SCRIPT_DIR, 'cv_template.html')
 CL_TEMPLATE_HTML_PATH = os.path.join(SCRIPT_DIR, 'cl_template.html')
 
+sys.path.insert(0, PROJECT_ROOT)
+from opportunity_catalog import OpportunityCatalog
+from work_queue import WorkQueue
+from opportunity_lease import OpportunityLease, LEASE_SECONDS, atomic_write
+
 def get_specific_status(file_path, status_key):
     """Reads a file and returns the value of a specific status key."""
     try:
@@ -26,15 +31,31 @@ def get_specific_status(file_path, status_key):
         return "not_found"
     return "unknown"
 
-def update_specific_status(file_path, status_key, new_status):
-    """Reads the entire file, updates a specific status line, and writes it back."""
+def get_specific_statuses(file_path, status_keys):
+    """Reads a file once and returns the values of several status keys, in order."""
+    found = {}
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                key = line.split(":", 1)[0].strip().lower()
+                if ":" in line and key not in found and key in (status_key.lower() for status_key in status_keys):
+                    found[key] = line.split(":", 1)[1].strip().lower()
+                if len(found) == len(status_keys):
+                    break
+    except FileNotFoundError:
+        return ["not_found"] * len(status_keys)
+    return [found.get(status_key.lower(), "unknown") for status_key in status_keys]
+
+def update_specific_status(file_path, status_key, new_status, catalog=None):
+    """Reads the entire file, updates a specific status line, and replaces it atomically (and updates the catalog, if given)."""
     try:
         with open(file_path, 'r', encoding='utf-8') as f: lines = f.readlines()
-        with open(file_path, 'w', encoding='utf-8') as f:
-            for line in lines:
-                if line.lower().strip().startswith(status_key.lower() + ":"):
-                    f.write(f"{status_key}: {new_status}\n")
-                else: f.write(line)
+        atomic_write(file_path, "".join(
+            f"{status_key}: {new_status}\n" if line.lower().strip().startswith(status_key.lower() + ":") else line
+            for line in lines
+        ))
+        if catalog is not None:
+            catalog.set_status(os.path.dirname(file_path), status_key, new_status)
         print(f"  > {status_key} updated to '{new_status}'.")
         return True
     except Exception as e:
@@ -65,6 +86,21 @@ def log_to_todo_file(opportunity_path, job_data):
         print(f"  > WARNING: Could not write to {os.path.basename(TODO_FILE_PATH)}: {e}")
         return False
 
+def log_rendered_opportunity(item, catalog, queue):
+    """Writes the todo.txt entry of one queued, rendered opportunity. Returns True if it was written."""
+    opportunity_path = catalog.folder_path(item['folder'])
+    job_data = read_data_from_file(os.path.join(opportunity_path, 'jobdescription.txt')) or {}
+    if log_to_todo_file(opportunity_path, job_data):
+        queue.ack(item)
+        return True
+    queue.nack(item, "todo.txt not writable")
+    return False
+
+def log_rendered_opportunities(queue, catalog):
+    """Drains the "todo" queue into todo.txt; entries that cannot be written stay queued for a retry."""
+    while (item := queue.pop("todo")) is not None:
+        log_rendered_opportunity(item, catalog, queue)
+
 def process_opportunity_folder(folder_path):
     """Runs the full document generation process for a single opportunity folder."""
     print(f"--- Starting Document Generation for: {folder_path} ---")
@@ -105,6 +141,48 @@ def process_opportunity_folder(folder_path):
     
     return True, job_description_data
 
+def render_opportunity(item, catalog, queue):
+    """
+    Claims the folder's lease and renders it. A folder leased by another worker is deferred until that
+    lease would have expired. Returns True if it was rendered.
+    """
+    with OpportunityLease(catalog.folder_path(item['folder']), "render") as lease:
+        if not lease.acquired:
+            print(f"\nSkipping '{item['folder']}': claimed by {lease.holder}.")
+            queue.defer(item, LEASE_SECONDS)
+            return False
+        return render_claimed_opportunity(item, catalog, queue, lease)
+
+def render_claimed_opportunity(item, catalog, queue, lease=None):
+    """
+    Renders the CV and CL of one queued opportunity, then acks it and queues it for the todo log, or nacks it on failure.
+    If `lease` was lost meanwhile, the new holder finishes the folder instead. Returns True if the opportunity was
+    ready to render (whether or not it succeeded).
+    """
+    folder_name = item['folder']
+    opportunity_path = catalog.folder_path(folder_name)
+    job_desc_path = os.path.join(opportunity_path, 'jobdescription.txt')
+    overall_status, data_status = get_specific_statuses(job_desc_path, ["Status", "Data-Status"])
+    print(f"\nChecking '{folder_name}'... Status: {overall_status.upper()}, Data-Status: {data_status.upper()}")
+
+    if overall_status != 'pending' or data_status != 'complete':
+        # Already rendered, not tailored yet, or removed since it was queued.
+        catalog.sync_folder(opportunity_path)
+        queue.ack(item)
+        return False
+
+    success, _ = process_opportunity_folder(opportunity_path)
+    if lease is not None and not lease.acquired:
+        print(f"--- Lost the lease on {folder_name} to another worker. Leaving the folder to it. ---")
+        queue.defer(item, LEASE_SECONDS)
+    elif success:
+        print(f"--- Successfully processed {folder_name} ---")
+        update_specific_status(job_desc_path, "Status", "processed", catalog)
+        queue.ack(item); queue.enqueue("todo", folder_name)
+    else:
+        print(f"--- FAILED to process {folder_name}. Leaving status as 'pending' for review ({queue.nack(item, 'render failed')}). ---")
+    return True
+
 def main():
     """Main function to find and process all pending opportunities."""
     print("--- Phase 3: Final Document Generation ---")
@@ -114,23 +192,14 @@ def main():
         print(f"Error: Opportunities directory not found at '{OPPORTUNITIES_BASE_DIR}'"); return
 
     pending_docs_found = 0
-    for folder_name in sorted(os.listdir(OPPORTUNITIES_BASE_DIR)):
-        opportunity_path = os.path.join(OPPORTUNITIES_BASE_DIR, folder_name)
-        if os.path.isdir(opportunity_path):
-            job_desc_path = os.path.join(opportunity_path, 'jobdescription.txt')
-            overall_status = get_specific_status(job_desc_path, "Status")
-            data_status = get_specific_status(job_desc_path, "Data-Status")
-            print(f"\nChecking '{folder_name}'... Status: {overall_status.upper()}, Data-Status: {data_status.upper()}")
-            
-            if overall_status == 'pending' and data_status == 'complete':
-                pending_docs_found += 1
-                success, job_data_for_log = process_opportunity_folder(opportunity_path)
-                if success:
-                    print(f"--- Successfully processed {folder_name} ---")
-                    log_to_todo_file(opportunity_path, job_data_for_log)
-                    update_specific_status(job_desc_path, "Status", "processed")
-                else:
-                    print(f"--- FAILED to process {folder_name}. Leaving status as 'pending' for review. ---")
+    # Tailored opportunities arrive on the "render" queue; rendered ones are handed to "todo".
+    catalog = OpportunityCatalog()
+    queue = WorkQueue(seed_from_catalog=True)
+    while (item := queue.pop("render")) is not None:
+        if render_opportunity(item, catalog, queue):
+            pending_docs_found += 1
+
+    log_rendered_opportunities(queue, catalog)
 
     if pending_docs_found == 0:
         print("\nScan complete. No pending opportunities with complete data were found.")
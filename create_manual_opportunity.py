@@ -2,25 +2,17 @@
 
 import os
 import sys
-import datetime
 
 # --- Dynamic Path Configuration ---
 # Assumes this script is in the project's root directory.
 PROJECT_ROOT = os.path.dirname(os.path.realpath(__file__))
 OPPORTUNITIES_BASE_DIR = os.path.join(PROJECT_ROOT, '3_Opportunities')
-PROCESSED_URLS_FILE = os.path.join(PROJECT_ROOT, 'processed_urls.txt')
 
-def load_processed_urls():
-    """Loads all previously processed URLs from the log file into a set for fast lookups."""
-    if not os.path.exists(PROCESSED_URLS_FILE):
-        return set()
-    with open(PROCESSED_URLS_FILE, 'r', encoding='utf-8') as f:
-        return {line.strip() for line in f if line.strip()}
-
-def log_processed_url(url):
-    """Appends a new, successfully processed URL to the log file."""
-    with open(PROCESSED_URLS_FILE, 'a', encoding='utf-8') as f:
-        f.write(url + '\n')
+from job_index import JobIndex, JOB_INDEX_DB, extract_job_id
+from near_duplicates import NearDuplicateIndex, minhash_signature
+from opportunity_catalog import OpportunityCatalog
+from work_queue import WorkQueue
+from opportunity_paths import new_opportunity_path, folder_key
 
 def main():
     """Interactively prompts the user for job details and creates an opportunity folder."""
@@ -37,10 +29,9 @@ def main():
         sys.exit(1)
 
     # --- Step 2: Duplicate Check ---
-    processed_urls = load_processed_urls()
-    base_url = job_post_url.split('&')[0] # Clean the URL
-    if base_url in processed_urls:
-        print(f"\n[ERROR] This job URL has already been processed. Aborting to prevent a duplicate.")
+    job_index = JobIndex()
+    if job_index.contains_url(job_post_url):
+        print(f"\n[ERROR] This job has already been processed. Aborting to prevent a duplicate.")
         sys.exit(0)
 
     # --- Step 3: Gather Optional Information ---
@@ -62,14 +53,19 @@ def main():
         description_lines.append(line)
     job_description = "\n".join(description_lines)
 
+    # Reposts of an existing opportunity are linked to it so the AI tailor can reuse its data.txt.
+    duplicate_index = NearDuplicateIndex()
+    signature = minhash_signature(job_description)
+    duplicate_of = None
+    if match := duplicate_index.find(None, signature=signature):
+        duplicate_of = match[0]
+        print(f"\n[INFO] This description is {match[1]:.0%} similar to '{duplicate_of}'. It will be linked as a repost.")
+
     # --- Step 5: Create Folder and jobdescription.txt ---
     print("\n--- Processing ---")
     
-    sanitized_company = "".join(c for c in company_name if c.isalnum() or c in (' ', '-', '_')).strip().replace(' ', '_')
-    sanitized_role = "".join(c for c in role_name if c.isalnum() or c in (' ', '-', '_')).strip().replace(' ', '_')
-    date_str = datetime.date.today().strftime("%Y-%m-%d")
-    folder_name = f"{sanitized_company}_{sanitized_role}_{date_str}"
-    folder_path = os.path.join(OPPORTUNITIES_BASE_DIR, folder_name)
+    folder_path = new_opportunity_path(company_name, role_name, extract_job_id(job_post_url), base_dir=OPPORTUNITIES_BASE_DIR)
+    folder_name = folder_key(folder_path, OPPORTUNITIES_BASE_DIR)
 
     if os.path.exists(folder_path):
         print(f"[ERROR] A folder for this job already exists for today's date: {folder_name}. Aborting.")
@@ -81,6 +77,8 @@ def main():
         with open(job_desc_path, 'w', encoding='utf-8') as f:
             f.write("Status: pending\n")
             f.write("Data-Status: pending\n")
+            if duplicate_of:
+                f.write(f"Duplicate-Of: {duplicate_of}\n")
             f.write(f"Job board: Manual Entry\n")
             f.write(f"Company Name: {company_name}\n")
             f.write(f"Role Name: {role_name}\n")
@@ -94,9 +92,12 @@ def main():
         
         print(f"  > SUCCESS: Created new opportunity folder at: {folder_path}")
 
-        # --- Step 6: Log the URL to prevent future scraping ---
-        log_processed_url(base_url)
-        print(f"  > SUCCESS: Added URL to '{os.path.basename(PROCESSED_URLS_FILE)}' to prevent future duplicates.")
+        # --- Step 6: Record the job ID to prevent future scraping ---
+        job_index.add_url(job_post_url, source="manual")
+        duplicate_index.add(folder_name, None, signature=signature)
+        OpportunityCatalog().sync_folder(folder_path)
+        WorkQueue().enqueue("tailor", folder_name)
+        print(f"  > SUCCESS: Added job to '{os.path.basename(JOB_INDEX_DB)}' to prevent future duplicates.")
 
     except OSError as e:
         print(f"  > [FATAL ERROR] Could not create directory or file: {e}")
@@ -0,0 +1,124 @@
+# FILE: ./job_index.py
+
+import os
+import re
+import sys
+import sqlite3
+import datetime
+from urllib.parse import urlparse, parse_qsl, urlencode
+
+# --- Dynamic Path Configuration ---
+# Assumes this script is in the project's root directory.
+PROJECT_ROOT = os.path.dirname(os.path.realpath(__file__))
+JOB_INDEX_DB = os.path.join(PROJECT_ROOT, 'job_index.db')
+PROCESSED_URLS_FILE = os.path.join(PROJECT_ROOT, 'processed_urls.txt')
+
+# currentJobId=123, /jobs/view/123, /jobs/view/scrum-master-at-acme-123 and urn:li:jobPosting:123
+LINKEDIN_JOB_ID_PATTERN = re.compile(r'(?:currentJobId=|/jobs/view/(?:[^/?#]*-)?|jobPosting:)(\d+)')
+TRACKING_PARAMS = {'refid', 'trackingid', 'trk', 'origin', 'refresh', 'src', 'source'}
+
+def extract_job_id(url):
+    """Returns the LinkedIn job ID in any search, view or URN form of a job reference, or None."""
+    match = LINKEDIN_JOB_ID_PATTERN.search(url or '')
+    return match.group(1) if match else None
+
+def canonical_job_id(url):
+    """
+    Maps any form of a job URL to one key: the LinkedIn job ID when there is one, otherwise
+    'url:' plus the URL without fragment and tracking parameters (for manual entries from other boards).
+    """
+    url = (url or '').strip()
+    if not url:
+        return None
+    if url.isdigit():
+        return url
+    if job_id := extract_job_id(url):
+        return job_id
+    parts = urlparse(url)
+    query = [(key, value) for key, value in parse_qsl(parts.query) if key.lower() not in TRACKING_PARAMS and not key.lower().startswith('utm_')]
+    normalized = parts._replace(scheme=parts.scheme.lower(), netloc=parts.netloc.lower(), query=urlencode(sorted(query)), fragment='')
+    return "url:" + normalized.geturl().rstrip('/')
+
+class JobIndex:
+    """
+    Persistent set of processed job IDs backed by SQLite. Lookups hit the primary-key index on disk,
+    so nothing is loaded into memory at startup no matter how long the history grows.
+    """
+
+    def __init__(self, db_path=JOB_INDEX_DB, legacy_urls_file=PROCESSED_URLS_FILE):
+        is_new = not os.path.exists(db_path)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS job_ids ("
+            " job_id TEXT PRIMARY KEY, url TEXT, source TEXT, added_at TEXT"
+            ") WITHOUT ROWID"
+        )
+        self.conn.commit()
+        if is_new and legacy_urls_file and os.path.exists(legacy_urls_file):
+            migrated = self.import_urls_file(legacy_urls_file)
+            print(f"Migrated {migrated} job IDs from '{os.path.basename(legacy_urls_file)}' into '{os.path.basename(db_path)}'.")
+
+    def __contains__(self, job_id):
+        return job_id is not None and self.conn.execute("SELECT 1 FROM job_ids WHERE job_id = ?", (job_id,)).fetchone() is not None
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM job_ids").fetchone()[0]
+
+    def contains_url(self, url):
+        """Returns True if the job behind any form of this URL is already processed."""
+        return canonical_job_id(url) in self
+
+    def add(self, job_id, url=None, source="scraper"):
+        """Records a processed job. Returns False if it was already present."""
+        if not job_id:
+            return False
+        cursor = self.conn.execute(
+            "INSERT OR IGNORE INTO job_ids (job_id, url, source, added_at) VALUES (?, ?, ?, ?)",
+            (job_id, url, source, datetime.datetime.now().isoformat(timespec='seconds'))
+        )
+        self.conn.commit()
+        return cursor.rowcount == 1
+
+    def add_url(self, url, source="scraper"):
+        """Records the job behind a URL as processed. Returns False if it was already present."""
+        return self.add(canonical_job_id(url), url, source)
+
+    def add_many(self, urls, source):
+        """Records many URLs in one transaction. Returns how many were new."""
+        rows = [(canonical_job_id(url), url, source, datetime.datetime.now().isoformat(timespec='seconds')) for url in urls]
+        before = len(self)
+        self.conn.executemany("INSERT OR IGNORE INTO job_ids (job_id, url, source, added_at) VALUES (?, ?, ?, ?)", [row for row in rows if row[0]])
+        self.conn.commit()
+        return len(self) - before
+
+    def import_urls_file(self, path):
+        """One-shot migration of a processed_urls.txt style file (one URL per line)."""
+        with open(path, 'r', encoding='utf-8') as f:
+            return self.add_many((line.strip() for line in f if line.strip()), source="processed_urls.txt")
+
+    def close(self):
+        self.conn.close()
+
+def main():
+    """Command-line entry point: migrate the legacy URL log, show stats or check a URL."""
+    args = sys.argv[1:]
+    if not args or args[0] not in ('--migrate', '--stats', '--check'):
+        print("Usage: python job_index.py --migrate | --stats | --check <url>"); sys.exit(1)
+    index = JobIndex()
+    if args[0] == '--migrate':
+        if not os.path.exists(PROCESSED_URLS_FILE):
+            print(f"'{os.path.basename(PROCESSED_URLS_FILE)}' not found. Nothing to migrate."); return
+        added = index.import_urls_file(PROCESSED_URLS_FILE)
+        print(f"Imported {added} new job IDs. The index now holds {len(index)} jobs.")
+    elif args[0] == '--stats':
+        print(f"'{os.path.basename(JOB_INDEX_DB)}' holds {len(index)} processed jobs.")
+        for source, count in index.conn.execute("SELECT source, COUNT(*) FROM job_ids GROUP BY source ORDER BY source"):
+            print(f"  > {source}: {count}")
+    elif args[0] == '--check' and len(args) > 1:
+        job_id = canonical_job_id(args[1])
+        print(f"Canonical job ID: {job_id}. Already processed: {'yes' if job_id in index else 'no'}.")
+    index.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,206 @@
+# FILE: ./near_duplicates.py
+
+import os
+import re
+import sys
+import time
+import zlib
+import random
+import sqlite3
+import hashlib
+from array import array
+
+from opportunity_paths import folder_key, resolve, iter_opportunity_dirs
+from opportunity_catalog import OpportunityCatalog
+from opportunity_archive import iter_archived_descriptions
+
+# --- Dynamic Path Configuration ---
+# Assumes this script is in the project's root directory.
+PROJECT_ROOT = os.path.dirname(os.path.realpath(__file__))
+OPPORTUNITIES_BASE_DIR = os.path.join(PROJECT_ROOT, '3_Opportunities')
+NEAR_DUPLICATES_DB = os.path.join(PROJECT_ROOT, 'near_duplicates.db')
+
+# --- Signature Configuration ---
+# 64 MinHash values of 32 bits each: a 256-byte signature per posting.
+# 16 LSH bands of 4 rows catch pairs from roughly 50% similarity upwards; candidates are then
+# confirmed against NEAR_DUPLICATE_THRESHOLD using the full signature.
+SHINGLE_SIZE = 5
+NUM_PERMUTATIONS = 64
+LSH_BANDS = 16
+LSH_ROWS = NUM_PERMUTATIONS // LSH_BANDS
+NEAR_DUPLICATE_THRESHOLD = 0.8
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = 0xFFFFFFFF
+_rng = random.Random(20240601)  # Fixed seed: signatures must stay comparable across runs.
+PERMUTATIONS = [(_rng.randrange(1, MERSENNE_PRIME), _rng.randrange(0, MERSENNE_PRIME)) for _ in range(NUM_PERMUTATIONS)]
+
+WORD_PATTERN = re.compile(r'[a-z0-9]+')
+
+def description_body(job_description_content):
+    """Returns the text after 'Job Description:' in a jobdescription.txt, or the whole text if there is no such line."""
+    return job_description_content.split("Job Description:", 1)[-1]
+
+def shingle_hashes(text):
+    """Returns the 32-bit hashes of every run of SHINGLE_SIZE consecutive words in the text (none if it is shorter)."""
+    words = WORD_PATTERN.findall(text.lower())
+    return {zlib.crc32(' '.join(words[i:i + SHINGLE_SIZE]).encode('utf-8')) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+def minhash_signature(text):
+    """
+    Returns the MinHash signature of a description as an array of NUM_PERMUTATIONS unsigned 32-bit ints, or None
+    if it has fewer than SHINGLE_SIZE words: such texts carry too little to compare, and would all look identical.
+    """
+    hashes = shingle_hashes(text)
+    if not hashes:
+        return None
+    return array('I', [min(((a * h + b) % MERSENNE_PRIME) & MAX_HASH for h in hashes) for a, b in PERMUTATIONS])
+
+def estimate_similarity(signature_a, signature_b):
+    """Estimates the Jaccard similarity of two descriptions from their signatures."""
+    return sum(1 for a, b in zip(signature_a, signature_b) if a == b) / NUM_PERMUTATIONS
+
+def band_buckets(signature):
+    """Returns one 64-bit bucket key per LSH band; the band number is part of the key."""
+    buckets = []
+    for band in range(LSH_BANDS):
+        rows = signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]
+        digest = hashlib.blake2b(bytes([band]) + rows.tobytes(), digest_size=8).digest()
+        buckets.append(int.from_bytes(digest, 'big', signed=True))
+    return buckets
+
+class NearDuplicateIndex:
+    """
+    MinHash signatures of every ingested description plus their LSH buckets, stored in SQLite.
+    A lookup is LSH_BANDS indexed bucket probes followed by a signature comparison per candidate,
+    so its cost depends on how many near matches exist, not on the size of the history.
+    """
+
+    def __init__(self, db_path=NEAR_DUPLICATES_DB):
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS signatures (folder TEXT PRIMARY KEY, signature BLOB NOT NULL) WITHOUT ROWID")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS lsh_buckets (bucket INTEGER NOT NULL, folder TEXT NOT NULL, PRIMARY KEY (bucket, folder)) WITHOUT ROWID")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS lsh_buckets_folder ON lsh_buckets (folder)")
+        self.conn.commit()
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM signatures").fetchone()[0]
+
+    def add(self, folder_name, text, signature=None, commit=True):
+        """Stores the signature of a description under its opportunity folder name, replacing any previous one (if it has one)."""
+        if signature is None and (signature := minhash_signature(text or "")) is None:
+            return
+        self.conn.execute("DELETE FROM lsh_buckets WHERE folder = ?", (folder_name,))
+        self.conn.execute("INSERT OR REPLACE INTO signatures (folder, signature) VALUES (?, ?)", (folder_name, signature.tobytes()))
+        self.conn.executemany("INSERT OR IGNORE INTO lsh_buckets (bucket, folder) VALUES (?, ?)", [(bucket, folder_name) for bucket in band_buckets(signature)])
+        if commit:
+            self.conn.commit()
+
+    def remove(self, folder_name):
+        """Forgets an opportunity folder."""
+        self.conn.execute("DELETE FROM lsh_buckets WHERE folder = ?", (folder_name,))
+        self.conn.execute("DELETE FROM signatures WHERE folder = ?", (folder_name,))
+        self.conn.commit()
+
+    def find(self, text, threshold=NEAR_DUPLICATE_THRESHOLD, signature=None, exclude=None):
+        """Returns (folder name, estimated similarity) of the most similar stored description at or above threshold, or None."""
+        if signature is None and (signature := minhash_signature(text or "")) is None:
+            return None
+        buckets = band_buckets(signature)
+        candidates = self.conn.execute(
+            f"SELECT DISTINCT s.folder, s.signature FROM lsh_buckets b JOIN signatures s ON s.folder = b.folder"
+            f" WHERE b.bucket IN ({','.join('?' * len(buckets))})", buckets
+        ).fetchall()
+        best = None
+        for folder_name, blob in candidates:
+            if folder_name == exclude:
+                continue
+            similarity = estimate_similarity(signature, array('I', blob))
+            if similarity >= threshold and (best is None or similarity > best[1]):
+                best = (folder_name, similarity)
+        return best
+
+    def close(self):
+        self.conn.close()
+
+def read_folder_description(folder_path):
+    """Returns the description body of an opportunity folder, or None if it has no jobdescription.txt."""
+    job_desc_path = os.path.join(folder_path, 'jobdescription.txt')
+    if not os.path.exists(job_desc_path):
+        return None
+    with open(job_desc_path, 'r', encoding='utf-8') as f:
+        return description_body(f.read())
+
+def rebuild(index):
+    """Re-ingests every archived and on-disk opportunity and reports the near-duplicate groups it finds."""
+    print(f"--- Rebuilding '{os.path.basename(NEAR_DUPLICATES_DB)}' from '{OPPORTUNITIES_BASE_DIR}' ---")
+    if not os.path.isdir(OPPORTUNITIES_BASE_DIR):
+        print(f"ERROR: Opportunities directory not found at '{OPPORTUNITIES_BASE_DIR}'."); return
+    index.conn.execute("DELETE FROM lsh_buckets")
+    index.conn.execute("DELETE FROM signatures")
+    catalog = OpportunityCatalog()
+    # Archived opportunities are the oldest, so they are indexed first and newer reposts link to them.
+    descriptions = [(key, description_body(content)) for key, content in iter_archived_descriptions(catalog)]
+    catalog.close()
+    descriptions += [(folder_key(folder_path, OPPORTUNITIES_BASE_DIR), text) for folder_path in iter_opportunity_dirs(OPPORTUNITIES_BASE_DIR)
+                     if (text := read_folder_description(folder_path)) is not None]
+    duplicates = 0
+    for key, text in descriptions:
+        signature = minhash_signature(text)
+        if match := index.find(text, signature=signature):
+            duplicates += 1
+            print(f"  > {key} is a near-duplicate of {match[0]} ({match[1]:.0%}).")
+        index.add(key, text, signature=signature, commit=False)
+    index.conn.commit()
+    print(f"Indexed {len(index)} descriptions, {duplicates} near-duplicates.")
+
+def run_benchmark(index, history_size=100000, lookups=200):
+    """Times lookups against a synthetic history of `history_size` random signatures in a scratch database."""
+    print(f"--- Near-duplicate Lookup Benchmark ({history_size:,} signatures) ---")
+    rng = random.Random(1)
+    scratch_path = NEAR_DUPLICATES_DB + '.bench'
+    scratch = NearDuplicateIndex(scratch_path)
+    if len(scratch) < history_size:
+        started = time.perf_counter()
+        for i in range(len(scratch), history_size):
+            scratch.add(f"synthetic_{i}", "", signature=array('I', [rng.getrandbits(32) for _ in range(NUM_PERMUTATIONS)]), commit=False)
+        scratch.conn.commit()
+        print(f"Built the synthetic history in {time.perf_counter() - started:.1f}s.")
+
+    texts = [text for folder_path in iter_opportunity_dirs(OPPORTUNITIES_BASE_DIR) if (text := read_folder_description(folder_path))]
+    texts = texts or ["scrum master agile delivery lead for a software team " * 20]
+    signatures = [minhash_signature(text) for text in texts]
+    started = time.perf_counter()
+    for i in range(lookups):
+        scratch.find(None, signature=signatures[i % len(signatures)])
+    lookup_seconds = (time.perf_counter() - started) / lookups
+    started = time.perf_counter()
+    for text in texts:
+        minhash_signature(text)
+    signature_seconds = (time.perf_counter() - started) / len(texts)
+    print(f"Signature: {signature_seconds * 1000:.2f} ms/description. Lookup: {lookup_seconds * 1000:.3f} ms/query.")
+    scratch.close()
+
+def main():
+    """Command-line entry point: rebuild the index, check one folder, or benchmark lookups."""
+    args = sys.argv[1:]
+    if not args or args[0] not in ('--rebuild', '--check', '--benchmark'):
+        print("Usage: python near_duplicates.py --rebuild | --check <folder key> | --benchmark [history size]"); sys.exit(1)
+    index = NearDuplicateIndex()
+    if args[0] == '--rebuild':
+        rebuild(index)
+    elif args[0] == '--check' and len(args) > 1:
+        text = read_folder_description(resolve(args[1], OPPORTUNITIES_BASE_DIR))
+        if text is None:
+            print(f"ERROR: No jobdescription.txt in '{args[1]}'.")
+        elif match := index.find(text, exclude=args[1]):
+            print(f"Near-duplicate of '{match[0]}' ({match[1]:.0%} similar).")
+        else:
+            print("No near-duplicate found.")
+    elif args[0] == '--benchmark':
+        run_benchmark(index, int(args[1]) if len(args) > 1 else 100000)
+    index.close()
+
+if __name__ == '__main__':
+    main()
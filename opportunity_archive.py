@@ -0,0 +1,229 @@
+# FILE: ./opportunity_archive.py
+
+import os
+import sys
+import zlib
+import shutil
+import struct
+import zipfile
+import datetime
+import warnings
+
+from opportunity_catalog import OpportunityCatalog, parse_header, row_from_header
+from opportunity_paths import resolve, folder_date
+from opportunity_lease import OpportunityLease
+from work_queue import WorkQueue
+
+# --- Dynamic Path Configuration ---
+# Assumes this script is in the project's root directory.
+PROJECT_ROOT = os.path.dirname(os.path.realpath(__file__))
+OPPORTUNITIES_BASE_DIR = os.path.join(PROJECT_ROOT, '3_Opportunities')
+ARCHIVE_DIR = os.path.join(PROJECT_ROOT, '3_Opportunities_Archive')
+
+# --- Archive Configuration ---
+# Archived opportunities are packed into one zip bundle per month they were created in
+# (3_Opportunities_Archive/YYYY-MM.zip), then removed from 3_Opportunities. The byte offset of every packed
+# file is kept in the catalog's archive_members table, so one file is read back with a single seek and read.
+ARCHIVE_AFTER_DAYS = 30
+STORED_EXTENSIONS = ('.pdf',)  # PDFs are already compressed; deflating them again only costs time.
+LOCAL_HEADER = struct.Struct('<4sHHHHHIIIHH')  # Zip local file header; the name and extra field follow it.
+LOCAL_HEADER_SIGNATURE = b'PK\x03\x04'
+
+def created_on(row):
+    """Returns the ISO date an opportunity was created: its shard date, else the catalog's created_on."""
+    date = folder_date(row['folder'])
+    return date.isoformat() if date else (row['created_on'] or datetime.date.today().isoformat())
+
+def bundle_name(row):
+    """Returns the bundle an opportunity is archived into, from the month it was created in."""
+    return f"{created_on(row)[:7]}.zip"
+
+def data_offset(bundle_file, header_offset):
+    """Returns where a member's data starts, from the local header at header_offset."""
+    bundle_file.seek(header_offset)
+    fields = LOCAL_HEADER.unpack(bundle_file.read(LOCAL_HEADER.size))
+    if fields[0] != LOCAL_HEADER_SIGNATURE:
+        raise ValueError(f"No zip member header at offset {header_offset} of '{bundle_file.name}'.")
+    return header_offset + LOCAL_HEADER.size + fields[9] + fields[10]
+
+def index_members(catalog, bundle, infos):
+    """Records the offsets of zip members named '<folder key>/<file name>' in archive_members."""
+    with open(os.path.join(ARCHIVE_DIR, bundle), 'rb') as bundle_file:
+        catalog.conn.executemany(
+            "INSERT OR REPLACE INTO archive_members (folder, name, bundle, data_offset, compressed_size, size, compress_type, crc)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [(*info.filename.rsplit('/', 1), bundle, data_offset(bundle_file, info.header_offset),
+              info.compress_size, info.file_size, info.compress_type, info.CRC) for info in infos]
+        )
+
+def read_archived(folder, file_name, catalog=None):
+    """Returns the bytes of one archived file, or None if that folder has no such file in the archive."""
+    own_catalog = catalog is None
+    catalog = catalog or OpportunityCatalog()
+    member = catalog.conn.execute("SELECT * FROM archive_members WHERE folder = ? AND name = ?", (folder, file_name)).fetchone()
+    if own_catalog:
+        catalog.close()
+    if member is None:
+        return None
+    with open(os.path.join(ARCHIVE_DIR, member['bundle']), 'rb') as bundle_file:
+        bundle_file.seek(member['data_offset'])
+        data = bundle_file.read(member['compressed_size'])
+    if member['compress_type'] == zipfile.ZIP_DEFLATED:
+        data = zlib.decompress(data, -15)
+    if zlib.crc32(data) != member['crc']:
+        raise ValueError(f"Archived file '{folder}/{file_name}' in '{member['bundle']}' is corrupt.")
+    return data
+
+def read_opportunity_file(folder, file_name, catalog=None):
+    """Returns the text of one file of an opportunity, from its folder or else from the archive, or None."""
+    file_path = os.path.join(resolve(folder, OPPORTUNITIES_BASE_DIR), file_name)
+    if os.path.exists(file_path):
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return f.read()
+    data = read_archived(folder, file_name, catalog)
+    return data.decode('utf-8') if data is not None else None
+
+def archived_files(catalog, folder):
+    """Returns the names of a folder's archived files."""
+    return [row['name'] for row in catalog.conn.execute("SELECT name FROM archive_members WHERE folder = ? ORDER BY name", (folder,))]
+
+def iter_archived_descriptions(catalog):
+    """Yields (folder key, jobdescription.txt text) for every archived opportunity."""
+    for row in catalog.find(archived=True):
+        if (data := read_archived(row['folder'], 'jobdescription.txt', catalog)) is not None:
+            yield row['folder'], data.decode('utf-8')
+
+def archive_candidates(catalog, days=ARCHIVE_AFTER_DAYS):
+    """Returns the on-disk opportunities that are processed or were created more than `days` days ago."""
+    cutoff = (datetime.date.today() - datetime.timedelta(days=days)).isoformat()
+    return [row for row in catalog.find() if row['status'] == 'processed' or created_on(row) < cutoff]
+
+def remove_empty_parents(folder_path):
+    """Deletes the day, month and year directories a removed folder leaves empty."""
+    parent = os.path.dirname(folder_path)
+    while os.path.normpath(parent) != os.path.normpath(OPPORTUNITIES_BASE_DIR) and not os.listdir(parent):
+        os.rmdir(parent)
+        parent = os.path.dirname(parent)
+
+def archive_folder(row, catalog, work_queue):
+    """Packs one opportunity folder into its bundle, verifies it, and deletes the folder. Returns the bytes freed or None."""
+    folder_path = catalog.folder_path(row)
+    bundle = bundle_name(row)
+    with OpportunityLease(folder_path, "archive") as lease:
+        if not lease.acquired:
+            print(f"  > SKIPPED {row['folder']}: in use by {lease.holder}.")
+            return None
+        files = sorted(entry.name for entry in os.scandir(folder_path)
+                       if entry.is_file() and not entry.name.startswith('.lease') and not entry.name.endswith('.tmp'))
+        os.makedirs(ARCHIVE_DIR, exist_ok=True)
+        with warnings.catch_warnings():
+            # A folder archived again after a restore is appended anew; the index points at the newest copy.
+            warnings.simplefilter("ignore", UserWarning)
+            with zipfile.ZipFile(os.path.join(ARCHIVE_DIR, bundle), 'a') as bundle_zip:
+                for file_name in files:
+                    compress_type = zipfile.ZIP_STORED if file_name.lower().endswith(STORED_EXTENSIONS) else zipfile.ZIP_DEFLATED
+                    bundle_zip.write(os.path.join(folder_path, file_name), f"{row['folder']}/{file_name}", compress_type=compress_type)
+                infos = bundle_zip.infolist()[-len(files):] if files else []
+        with open(os.path.join(ARCHIVE_DIR, bundle), 'rb+') as bundle_file:
+            os.fsync(bundle_file.fileno())
+
+        index_members(catalog, bundle, infos)
+        freed = 0
+        for file_name in files:
+            with open(os.path.join(folder_path, file_name), 'rb') as f:
+                if read_archived(row['folder'], file_name, catalog) != f.read():
+                    catalog.conn.rollback()
+                    print(f"  > ERROR: '{row['folder']}/{file_name}' did not read back from '{bundle}'. Leaving the folder in place.")
+                    return None
+            freed += os.path.getsize(os.path.join(folder_path, file_name))
+        catalog.mark_archived(row['folder'], bundle)
+    work_queue.forget(row['folder'])
+    shutil.rmtree(folder_path)
+    remove_empty_parents(folder_path)
+    return freed
+
+def restore_folder(folder, catalog):
+    """Writes an archived opportunity back to its folder and returns it to the catalog as a normal row."""
+    row = catalog.get(folder)
+    if row is None or not row['archive']:
+        print(f"ERROR: '{folder}' is not archived."); return False
+    folder_path = resolve(folder, OPPORTUNITIES_BASE_DIR)
+    os.makedirs(folder_path, exist_ok=True)
+    for file_name in archived_files(catalog, folder):
+        with open(os.path.join(folder_path, file_name), 'wb') as f:
+            f.write(read_archived(folder, file_name, catalog))
+    # The bundle keeps the packed copy; only the index forgets it.
+    catalog.conn.execute("DELETE FROM archive_members WHERE folder = ?", (folder,))
+    catalog.conn.execute("UPDATE opportunities SET archive = NULL WHERE folder = ?", (folder,))
+    catalog.conn.commit()
+    catalog.sync_folder(folder_path)
+    print(f"Restored '{folder}' to '{folder_path}'.")
+    return True
+
+def reindex_bundles(catalog):
+    """
+    Rebuilds archive_members and the archived catalog rows from the bundles' own zip directories,
+    e.g. after the catalog database was deleted. Folders that are back on disk are left alone.
+    Returns how many archived opportunities were indexed.
+    """
+    if not os.path.isdir(ARCHIVE_DIR):
+        return 0
+    catalog.conn.execute("DELETE FROM archive_members")
+    indexed = 0
+    for bundle in sorted(name for name in os.listdir(ARCHIVE_DIR) if name.endswith('.zip')):
+        with zipfile.ZipFile(os.path.join(ARCHIVE_DIR, bundle)) as bundle_zip:
+            newest = {info.filename: info for info in bundle_zip.infolist()}  # Later copies win.
+            by_folder = {}
+            for info in newest.values():
+                by_folder.setdefault(info.filename.rsplit('/', 1)[0], []).append(info)
+            for folder, infos in sorted(by_folder.items()):
+                job_desc = newest.get(f"{folder}/jobdescription.txt")
+                if job_desc is None or os.path.isdir(resolve(folder, OPPORTUNITIES_BASE_DIR)):
+                    continue
+                header = parse_header(bundle_zip.read(job_desc).decode('utf-8').splitlines())
+                catalog.upsert({**row_from_header(folder, header, datetime.date(*job_desc.date_time[:3]).isoformat()), "archive": bundle}, commit=False)
+                index_members(catalog, bundle, infos)
+                indexed += 1
+    catalog.conn.commit()
+    return indexed
+
+def main():
+    """Command-line entry point: archive old or processed opportunities, read or restore archived ones."""
+    args = sys.argv[1:]
+    if not args or args[0] not in ('--archive', '--list', '--cat', '--restore', '--reindex'):
+        print("Usage: python opportunity_archive.py --archive [days] [--dry-run] | --list | --cat <folder key> <file name>"
+              " | --restore <folder key> | --reindex"); sys.exit(1)
+    catalog = OpportunityCatalog()
+    if args[0] == '--archive':
+        days = int(args[1]) if len(args) > 1 and args[1].isdigit() else ARCHIVE_AFTER_DAYS
+        candidates = archive_candidates(catalog, days)
+        print(f"--- Archiving {len(candidates)} opportunities (processed, or older than {days} days){' (dry run)' if '--dry-run' in args else ''} ---")
+        if '--dry-run' in args:
+            for row in candidates:
+                print(f"  > {row['folder']} -> {bundle_name(row)}")
+        else:
+            work_queue = WorkQueue()
+            archived, freed = 0, 0
+            for row in candidates:
+                if (size := archive_folder(row, catalog, work_queue)) is not None:
+                    print(f"  > {row['folder']} -> {bundle_name(row)}")
+                    archived += 1; freed += size
+            work_queue.close()
+            print(f"Archived {archived} opportunities, removing {freed / 1024:.0f} KB of loose files.")
+    elif args[0] == '--list':
+        for row in catalog.find(archived=True):
+            print(f"  > [{row['archive']}] {row['folder']}: {', '.join(archived_files(catalog, row['folder']))}")
+    elif args[0] == '--cat' and len(args) > 2:
+        data = read_archived(args[1], args[2], catalog)
+        if data is None:
+            print(f"ERROR: '{args[1]}/{args[2]}' is not in the archive.")
+        else:
+            sys.stdout.buffer.write(data)
+    elif args[0] == '--restore' and len(args) > 1:
+        restore_folder(args[1], catalog)
+    elif args[0] == '--reindex':
+        print(f"Indexed {reindex_bundles(catalog)} archived opportunities from '{ARCHIVE_DIR}'.")
+    catalog.close()
+
+if __name__ == '__main__':
+    main()
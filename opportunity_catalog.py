@@ -0,0 +1,249 @@
+# FILE: ./opportunity_catalog.py
+
+import os
+import sys
+import time
+import sqlite3
+import datetime
+
+from job_index import canonical_job_id
+from opportunity_paths import folder_key, resolve, iter_opportunity_dirs
+
+# --- Dynamic Path Configuration ---
+# Assumes this script is in the project's root directory.
+PROJECT_ROOT = os.path.dirname(os.path.realpath(__file__))
+OPPORTUNITIES_BASE_DIR = os.path.join(PROJECT_ROOT, '3_Opportunities')
+OPPORTUNITY_CATALOG_DB = os.path.join(PROJECT_ROOT, 'opportunity_catalog.db')
+
+# jobdescription.txt header line -> catalog column.
+HEADER_COLUMNS = {
+    "status": "status",
+    "data-status": "data_status",
+    "duplicate-of": "duplicate_of",
+    "company name": "company",
+    "role name": "role",
+    "job post url": "job_url",
+}
+# Generated artifact -> catalog column holding its path when it exists.
+ARTIFACT_COLUMNS = {
+    "data.txt": "data_path",
+    "CV-Sebastian-Ochoa-Alvarez.pdf": "cv_path",
+    "CL-Sebastian-Ochoa-Alvarez.pdf": "cl_path",
+}
+COLUMNS = ["folder", "status", "data_status", "job_id", "company", "role", "job_url", "duplicate_of",
+           "created_on", "updated_at", "data_path", "cv_path", "cl_path", "archive"]
+
+def parse_header(lines):
+    """Returns the lowercased header keys and raw values of jobdescription.txt lines, up to 'Job Description:'."""
+    header = {}
+    for line in lines:
+        if line.strip().lower().startswith("job description:"):
+            break
+        if ":" in line:
+            key, value = line.split(":", 1)
+            header[key.strip().lower()] = value.strip()
+    return header
+
+def read_header(job_desc_path):
+    """Returns the lowercased header keys and raw values of a jobdescription.txt, up to 'Job Description:'."""
+    with open(job_desc_path, 'r', encoding='utf-8') as f:
+        return parse_header(f)
+
+def row_from_header(folder, header, created_on):
+    """Builds the catalog row of an opportunity from its parsed jobdescription.txt header."""
+    row = {column: header.get(key, '') for key, column in HEADER_COLUMNS.items()}
+    row["status"] = row["status"].lower() or "unknown"
+    row["data_status"] = row["data_status"].lower() or "unknown"
+    row["folder"] = folder
+    row["job_id"] = canonical_job_id(row["job_url"]) if row["job_url"] not in ('', 'N/A') else None
+    row["created_on"] = created_on
+    row["updated_at"] = datetime.datetime.now().isoformat(timespec='seconds')
+    return row
+
+def row_from_folder(folder_path):
+    """Builds the catalog row of an opportunity folder from its jobdescription.txt and artifacts, or None."""
+    job_desc_path = os.path.join(folder_path, 'jobdescription.txt')
+    if not os.path.exists(job_desc_path):
+        return None
+    row = row_from_header(folder_key(folder_path), read_header(job_desc_path),
+                          datetime.date.fromtimestamp(os.stat(job_desc_path).st_mtime).isoformat())
+    for file_name, column in ARTIFACT_COLUMNS.items():
+        artifact_path = os.path.join(folder_path, file_name)
+        row[column] = artifact_path if os.path.exists(artifact_path) else None
+    return row
+
+class OpportunityCatalog:
+    """
+    One row per opportunity folder with its statuses, job ID, company, role and artifact paths, in SQLite.
+    Phases ask the catalog which folders have work instead of opening every jobdescription.txt.
+    The writers keep it in sync; rebuild() reconciles it from disk after hand edits.
+    Rows of opportunities packed away by opportunity_archive.py name their bundle in `archive` and stay
+    in the catalog; archive_members holds the byte offset of each of their files inside the bundle.
+    """
+
+    def __init__(self, db_path=OPPORTUNITY_CATALOG_DB, base_dir=None):
+        is_new = not os.path.exists(db_path)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS opportunities ("
+            " folder TEXT PRIMARY KEY, status TEXT, data_status TEXT, job_id TEXT, company TEXT, role TEXT,"
+            " job_url TEXT, duplicate_of TEXT, created_on TEXT, updated_at TEXT, data_path TEXT, cv_path TEXT, cl_path TEXT,"
+            " archive TEXT"
+            ")"
+        )
+        if "archive" not in {column["name"] for column in self.conn.execute("PRAGMA table_info(opportunities)")}:
+            self.conn.execute("ALTER TABLE opportunities ADD COLUMN archive TEXT")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS archive_members ("
+            " folder TEXT NOT NULL, name TEXT NOT NULL, bundle TEXT NOT NULL, data_offset INTEGER NOT NULL,"
+            " compressed_size INTEGER NOT NULL, size INTEGER NOT NULL, compress_type INTEGER NOT NULL, crc INTEGER NOT NULL,"
+            " PRIMARY KEY (folder, name)"
+            ")"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS opportunities_status ON opportunities (status, data_status)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS opportunities_data_status ON opportunities (data_status)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS opportunities_job_id ON opportunities (job_id)")
+        self.conn.commit()
+        if is_new:
+            self.rebuild(base_dir or OPPORTUNITIES_BASE_DIR)
+            # Imported here because the archiver itself builds on the catalog.
+            from opportunity_archive import reindex_bundles
+            reindex_bundles(self)
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM opportunities").fetchone()[0]
+
+    def upsert(self, row, commit=True):
+        """Inserts or replaces one catalog row."""
+        self.conn.execute(
+            f"INSERT OR REPLACE INTO opportunities ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+            [row.get(column) for column in COLUMNS]
+        )
+        if commit:
+            self.conn.commit()
+
+    def sync_folder(self, folder_path):
+        """Re-reads one opportunity folder from disk into the catalog. Returns its row, or None if it has no jobdescription.txt."""
+        row = row_from_folder(folder_path)
+        if row is None:
+            existing = self.get(folder_key(folder_path))
+            if existing and not existing["archive"]:
+                self.remove(existing["folder"])
+        else:
+            existing = self.get(row["folder"])
+            if existing and existing["created_on"]:
+                row["created_on"] = existing["created_on"]
+            self.upsert(row)
+        return row
+
+    def set_status(self, folder_path, status_key, new_status):
+        """Records a status change that was just written to a folder's jobdescription.txt."""
+        column = HEADER_COLUMNS.get(status_key.lower())
+        if column not in ("status", "data_status"):
+            return
+        cursor = self.conn.execute(
+            f"UPDATE opportunities SET {column} = ?, updated_at = ? WHERE folder = ?",
+            (new_status.lower(), datetime.datetime.now().isoformat(timespec='seconds'), folder_key(folder_path))
+        )
+        self.conn.commit()
+        if cursor.rowcount == 0:
+            self.sync_folder(folder_path)
+        else:
+            self.refresh_artifacts(folder_path)
+
+    def refresh_artifacts(self, folder_path):
+        """Updates the artifact paths of one folder after files were generated or deleted."""
+        values = {column: (path if os.path.exists(path := os.path.join(folder_path, file_name)) else None)
+                  for file_name, column in ARTIFACT_COLUMNS.items()}
+        self.conn.execute(
+            f"UPDATE opportunities SET {', '.join(f'{column} = ?' for column in values)} WHERE folder = ?",
+            list(values.values()) + [folder_key(folder_path)]
+        )
+        self.conn.commit()
+
+    def get(self, folder):
+        """Returns the row of one folder key, or None."""
+        return self.conn.execute("SELECT * FROM opportunities WHERE folder = ?", (folder,)).fetchone()
+
+    def remove(self, folder):
+        self.conn.execute("DELETE FROM opportunities WHERE folder = ?", (folder,))
+        self.conn.commit()
+
+    def find(self, status=None, data_status=None, archived=False):
+        """
+        Returns the rows matching the given status and data status (a value or a list of values), by folder.
+        Only opportunities on disk are returned unless archived is True (only archived ones) or None (both).
+        """
+        clauses, params = [], []
+        if archived is not None:
+            clauses.append("archive IS NOT NULL" if archived else "archive IS NULL")
+        for column, wanted in (("status", status), ("data_status", data_status)):
+            if wanted is None:
+                continue
+            wanted = [wanted] if isinstance(wanted, str) else list(wanted)
+            clauses.append(f"{column} IN ({', '.join('?' * len(wanted))})")
+            params.extend(wanted)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self.conn.execute(f"SELECT * FROM opportunities{where} ORDER BY folder", params).fetchall()
+
+    def folder_path(self, row_or_folder):
+        """Returns the absolute path of a catalog row or folder key."""
+        folder = row_or_folder["folder"] if isinstance(row_or_folder, sqlite3.Row) else row_or_folder
+        return resolve(folder)
+
+    def mark_archived(self, folder, bundle, commit=True):
+        """Records that a folder's files now live in an archive bundle instead of on disk."""
+        self.conn.execute(
+            "UPDATE opportunities SET archive = ?, data_path = NULL, cv_path = NULL, cl_path = NULL, updated_at = ? WHERE folder = ?",
+            (bundle, datetime.datetime.now().isoformat(timespec='seconds'), folder)
+        )
+        if commit:
+            self.conn.commit()
+
+    def rebuild(self, base_dir=OPPORTUNITIES_BASE_DIR):
+        """
+        Reconciles the catalog with the opportunity folders on disk. Archived rows are kept.
+        Returns (added or updated, removed).
+        """
+        if not os.path.isdir(base_dir):
+            return 0, 0
+        seen = set()
+        for folder_path in iter_opportunity_dirs(base_dir):
+            if row := row_from_folder(folder_path):
+                existing = self.get(row["folder"])
+                if existing and existing["created_on"]:
+                    row["created_on"] = existing["created_on"]
+                self.upsert(row, commit=False)
+                seen.add(row["folder"])
+        stale = [row["folder"] for row in self.conn.execute("SELECT folder FROM opportunities WHERE archive IS NULL") if row["folder"] not in seen]
+        self.conn.executemany("DELETE FROM opportunities WHERE folder = ?", [(folder,) for folder in stale])
+        self.conn.commit()
+        return len(seen), len(stale)
+
+    def close(self):
+        self.conn.close()
+
+def main():
+    """Command-line entry point: rebuild the catalog from disk, or show status counts."""
+    args = sys.argv[1:]
+    if not args or args[0] not in ('--rebuild', '--stats'):
+        print("Usage: python opportunity_catalog.py --rebuild | --stats"); sys.exit(1)
+    catalog = OpportunityCatalog()
+    if args[0] == '--rebuild':
+        started = time.perf_counter()
+        synced, removed = catalog.rebuild()
+        print(f"Catalog rebuilt in {time.perf_counter() - started:.2f}s: {synced} opportunities on disk, {removed} stale rows removed.")
+    else:
+        print(f"'{os.path.basename(OPPORTUNITY_CATALOG_DB)}' holds {len(catalog)} opportunities.")
+        for row in catalog.conn.execute("SELECT status, data_status, COUNT(*) AS count FROM opportunities GROUP BY status, data_status ORDER BY status, data_status"):
+            print(f"  > Status: {row['status']:<10} Data-Status: {row['data_status']:<10} {row['count']}")
+        print(f"  > Archived: {len(catalog.find(archived=True))}")
+        started = time.perf_counter()
+        pending = catalog.find(data_status=['pending', 'error'])
+        print(f"Query for pending tailoring work: {len(pending)} rows in {(time.perf_counter() - started) * 1000:.2f} ms.")
+    catalog.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+# FILE: ./opportunity_lease.py
+
+import os
+import json
+import time
+import uuid
+import socket
+import threading
+
+# --- Lease Configuration ---
+# A worker holds a folder's lease while it tailors or renders it. Leases are files created with O_EXCL,
+# which is atomic on local disks and on NFS v3+/SMB shares, so several processes or machines sharing
+# 3_Opportunities never work on the same folder at once. A lease whose holder stopped heartbeating is
+# stolen once it expires.
+LEASE_FILE_NAME = ".lease"
+LEASE_SECONDS = 120
+HEARTBEAT_SECONDS = 30
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+def atomic_write(path, content):
+    """Writes a text file crash-safely: a temp file in the same directory is flushed, fsynced and renamed over it."""
+    temp_path = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+def read_lease(lease_path):
+    """Returns the lease record at lease_path, or None if there is none (or it is being replaced)."""
+    try:
+        with open(lease_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+class OpportunityLease:
+    """
+    Exclusive, expiring claim on one opportunity folder. Use as a context manager:
+
+        with OpportunityLease(folder_path, "tailor") as lease:
+            if lease.acquired: ...
+
+    While held, a background thread renews the lease every HEARTBEAT_SECONDS.
+    """
+
+    def __init__(self, folder_path, stage):
+        self.lease_path = os.path.join(folder_path, LEASE_FILE_NAME)
+        self.stage = stage
+        self.token = uuid.uuid4().hex
+        self.acquired = False
+        self.holder = None
+        self.claimed_at = time.time()
+        self._stop = threading.Event()
+        self._heartbeat = None
+
+    def record(self):
+        return {"owner": WORKER_ID, "stage": self.stage, "token": self.token,
+                "claimed_at": self.claimed_at, "expires_at": time.time() + LEASE_SECONDS}
+
+    def try_create(self):
+        """Creates the lease file if no one holds it. Returns True on success."""
+        try:
+            fd = os.open(self.lease_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(self.record(), f)
+        return True
+
+    def try_steal(self, expired):
+        """
+        Removes an expired lease so it can be re-created. Renaming it aside is atomic, so only one of several
+        stealing workers succeeds; if what was renamed turns out to be a fresh lease, it is linked back.
+        """
+        tombstone = f"{self.lease_path}.{self.token}.expired"
+        try:
+            os.rename(self.lease_path, tombstone)
+        except FileNotFoundError:
+            return
+        if (read_lease(tombstone) or {}).get("token") != expired.get("token"):
+            try:
+                os.link(tombstone, self.lease_path)
+            except OSError:
+                pass
+        os.remove(tombstone)
+
+    def try_renew(self):
+        """
+        Extends the lease if this worker still holds it, with the same protocol as try_steal: the lease is renamed
+        aside, so a renewal and a steal never both win, and the renewed one is linked into place only if the name is
+        still free. A lease that is not ours is linked back. Returns False if the lease was lost.
+        """
+        renewed = f"{self.lease_path}.{self.token}.renewed"
+        aside = f"{self.lease_path}.{self.token}.renewing"
+        with open(renewed, 'w', encoding='utf-8') as f:
+            json.dump(self.record(), f)
+        try:
+            os.rename(self.lease_path, aside)
+        except FileNotFoundError:
+            os.remove(renewed)
+            return False
+        held = (read_lease(aside) or {}).get("token") == self.token
+        try:
+            os.link(renewed if held else aside, self.lease_path)
+        except OSError:
+            held = False
+        os.remove(aside)
+        os.remove(renewed)
+        return held
+
+    def acquire(self):
+        """Claims the folder. Returns True if this worker now holds the lease; otherwise self.holder names who does."""
+        if not self.try_create():
+            current = read_lease(self.lease_path)
+            if current is None or current.get("expires_at", 0) >= time.time():
+                self.holder = (current or {}).get("owner", "another worker")
+                return False
+            print(f"  > Lease held by {current.get('owner')} expired {time.time() - current['expires_at']:.0f}s ago. Taking it over.")
+            self.try_steal(current)
+            if not self.try_create():
+                self.holder = (read_lease(self.lease_path) or {}).get("owner", "another worker")
+                return False
+        self.acquired = True
+        self._heartbeat = threading.Thread(target=self.renew_until_released, daemon=True)
+        self._heartbeat.start()
+        return True
+
+    def renew_until_released(self):
+        while not self._stop.wait(HEARTBEAT_SECONDS):
+            if not self.try_renew():
+                print(f"  > WARNING: Lost the lease on '{os.path.dirname(self.lease_path)}'.")
+                self.acquired = False
+                return
+
+    def release(self):
+        """Stops the heartbeat and deletes the lease if this worker still holds it."""
+        self._stop.set()
+        if self._heartbeat:
+            self._heartbeat.join()
+        if self.acquired and (read_lease(self.lease_path) or {}).get("token") == self.token:
+            os.remove(self.lease_path)
+        self.acquired = False
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+        return False
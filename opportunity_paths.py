@@ -0,0 +1,177 @@
+# FILE: ./opportunity_paths.py
+
+import os
+import re
+import sys
+import sqlite3
+import datetime
+
+from job_index import extract_job_id
+from opportunity_lease import atomic_write
+
+# --- Dynamic Path Configuration ---
+# Assumes this script is in the project's root directory.
+PROJECT_ROOT = os.path.dirname(os.path.realpath(__file__))
+OPPORTUNITIES_BASE_DIR = os.path.join(PROJECT_ROOT, '3_Opportunities')
+# Kept by 2_Data_Tailor/similarity_cache.py, which needs numpy; migrate() re-keys it with plain SQL instead.
+SIMILARITY_CACHE_DB = os.path.join(PROJECT_ROOT, 'similarity_cache.db')
+
+# --- Layout Configuration ---
+# New opportunities are sharded by date: 3_Opportunities/YYYY/MM/DD/<jobid>_<Company>_<Role>.
+# Folders from the original flat layout (3_Opportunities/<Company>_<Role>_<date>) are still read
+# until they are moved with --migrate. Every script resolves folders through this module.
+YEAR_PATTERN = re.compile(r'^\d{4}$')
+MONTH_DAY_PATTERN = re.compile(r'^\d{2}$')
+LEGACY_DATE_SUFFIX = re.compile(r'_(\d{4})-(\d{2})-(\d{2})$')
+
+def sanitize(text):
+    """Keeps letters, digits, '-' and '_' of a company or role name, with spaces turned into underscores."""
+    return "".join(c for c in text if c.isalnum() or c in (' ', '-', '_')).strip().replace(' ', '_')
+
+def new_opportunity_path(company_name, role_name, job_id=None, date=None, base_dir=OPPORTUNITIES_BASE_DIR):
+    """Returns the sharded folder path for a new opportunity. The job ID prefix is used only for numeric LinkedIn IDs."""
+    date = date or datetime.date.today()
+    slug = f"{sanitize(company_name)}_{sanitize(role_name)}"
+    if job_id and str(job_id).isdigit():
+        slug = f"{job_id}_{slug}"
+    return os.path.join(base_dir, f"{date.year:04d}", f"{date.month:02d}", f"{date.day:02d}", slug)
+
+def folder_key(folder_path, base_dir=OPPORTUNITIES_BASE_DIR):
+    """Returns the layout-independent key of a folder: its path relative to the opportunities directory, with '/' separators."""
+    return os.path.relpath(folder_path, base_dir).replace(os.sep, '/')
+
+def resolve(key, base_dir=OPPORTUNITIES_BASE_DIR):
+    """Returns the absolute folder path of a folder key (sharded or legacy)."""
+    return os.path.join(base_dir, *key.split('/'))
+
+def folder_date(key):
+    """Returns the date a sharded folder key was filed under, or None for a flat-layout key."""
+    parts = key.split('/')
+    if len(parts) == 4 and YEAR_PATTERN.match(parts[0]) and MONTH_DAY_PATTERN.match(parts[1]) and MONTH_DAY_PATTERN.match(parts[2]):
+        return datetime.date(int(parts[0]), int(parts[1]), int(parts[2]))
+    return None
+
+def iter_opportunity_dirs(base_dir=OPPORTUNITIES_BASE_DIR):
+    """
+    Yields every opportunity folder path in both layouts, sorted within each directory. Uses os.scandir,
+    whose entries carry the file type from the directory listing, so no per-entry stat() is needed.
+    """
+    if not os.path.isdir(base_dir):
+        return
+    for entry in sorted(os.scandir(base_dir), key=lambda e: e.name):
+        if not entry.is_dir():
+            continue
+        if not YEAR_PATTERN.match(entry.name):
+            yield entry.path  # Legacy flat folder.
+            continue
+        for month in sorted(os.scandir(entry.path), key=lambda e: e.name):
+            if not (month.is_dir() and MONTH_DAY_PATTERN.match(month.name)):
+                continue
+            for day in sorted(os.scandir(month.path), key=lambda e: e.name):
+                if not (day.is_dir() and MONTH_DAY_PATTERN.match(day.name)):
+                    continue
+                for folder in sorted(os.scandir(day.path), key=lambda e: e.name):
+                    if folder.is_dir():
+                        yield folder.path
+
+def legacy_folders(base_dir=OPPORTUNITIES_BASE_DIR):
+    """Returns the folders still in the flat layout."""
+    return [path for path in iter_opportunity_dirs(base_dir) if os.path.dirname(path) == base_dir]
+
+def read_job_post_url(folder_path):
+    """Returns the 'Job post URL:' value of a folder's jobdescription.txt, or ''."""
+    try:
+        with open(os.path.join(folder_path, 'jobdescription.txt'), 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip().lower().startswith('job post url:'):
+                    return line.split(':', 1)[1].strip()
+    except FileNotFoundError:
+        pass
+    return ''
+
+def sharded_path_for_legacy(folder_path, base_dir=OPPORTUNITIES_BASE_DIR):
+    """Returns where a flat-layout folder belongs in the sharded layout, keeping its name minus the date suffix."""
+    name = os.path.basename(folder_path)
+    if match := LEGACY_DATE_SUFFIX.search(name):
+        date = datetime.date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+        name = name[:match.start()]
+    else:
+        date = datetime.date.fromtimestamp(os.stat(folder_path).st_mtime)
+    job_id = extract_job_id(read_job_post_url(folder_path))
+    if job_id:
+        name = f"{job_id}_{name}"
+    return os.path.join(base_dir, f"{date.year:04d}", f"{date.month:02d}", f"{date.day:02d}", name)
+
+def rewrite_duplicate_links(moves, base_dir=OPPORTUNITIES_BASE_DIR):
+    """Points 'Duplicate-Of:' lines at the new keys of moved folders."""
+    for folder_path in iter_opportunity_dirs(base_dir):
+        job_desc_path = os.path.join(folder_path, 'jobdescription.txt')
+        if not os.path.exists(job_desc_path):
+            continue
+        with open(job_desc_path, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+        changed = False
+        for i, line in enumerate(lines):
+            if line.lower().startswith('duplicate-of:') and (new_key := moves.get(line.split(':', 1)[1].strip())):
+                lines[i] = f"Duplicate-Of: {new_key}\n"
+                changed = True
+        if changed:
+            atomic_write(job_desc_path, "".join(lines))
+
+def migrate(dry_run=False, base_dir=OPPORTUNITIES_BASE_DIR):
+    """Moves every flat-layout folder into the sharded layout and re-keys the catalog, queue, dedupe index and similarity cache."""
+    print(f"--- Migrating '{base_dir}' to the YYYY/MM/DD/<jobid>_<slug> layout{' (dry run)' if dry_run else ''} ---")
+    moves = {}
+    for folder_path in legacy_folders(base_dir):
+        target = sharded_path_for_legacy(folder_path, base_dir)
+        if os.path.exists(target):
+            print(f"  > SKIPPED {os.path.basename(folder_path)}: '{folder_key(target, base_dir)}' already exists.")
+            continue
+        print(f"  > {os.path.basename(folder_path)} -> {folder_key(target, base_dir)}")
+        if not dry_run:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.rename(folder_path, target)
+        moves[folder_key(folder_path, base_dir)] = folder_key(target, base_dir)
+    if dry_run or not moves:
+        print(f"{len(moves)} folders {'would be' if dry_run else 'were'} moved.")
+        return moves
+
+    # Imported here because these modules resolve their folders through this one.
+    from opportunity_catalog import OpportunityCatalog
+    from work_queue import WorkQueue
+    from near_duplicates import NearDuplicateIndex
+    rewrite_duplicate_links(moves, base_dir)
+    catalog = OpportunityCatalog()
+    synced, removed = catalog.rebuild(base_dir)
+    catalog.close()
+    work_queue = WorkQueue()
+    work_queue.conn.executemany("UPDATE OR REPLACE work_items SET folder = ? WHERE folder = ?", [(new, old) for old, new in moves.items()])
+    work_queue.close()
+    duplicate_index = NearDuplicateIndex()
+    for old, new in moves.items():
+        duplicate_index.conn.execute("UPDATE OR REPLACE signatures SET folder = ? WHERE folder = ?", (new, old))
+        duplicate_index.conn.execute("UPDATE OR REPLACE lsh_buckets SET folder = ? WHERE folder = ?", (new, old))
+    duplicate_index.conn.commit()
+    duplicate_index.close()
+    if os.path.exists(SIMILARITY_CACHE_DB):
+        similarity = sqlite3.connect(SIMILARITY_CACHE_DB, timeout=30)
+        similarity.executemany("UPDATE OR REPLACE vectors SET folder = ? WHERE folder = ?", [(new, old) for old, new in moves.items()])
+        similarity.commit()
+        similarity.close()
+    print(f"Moved {len(moves)} folders. Catalog holds {synced} opportunities ({removed} stale rows removed).")
+    return moves
+
+def main():
+    """Command-line entry point: migrate flat folders into the sharded layout, or list the layout in use."""
+    args = sys.argv[1:]
+    if not args or args[0] not in ('--migrate', '--status'):
+        print("Usage: python opportunity_paths.py --migrate [--dry-run] | --status"); sys.exit(1)
+    if args[0] == '--migrate':
+        migrate(dry_run='--dry-run' in args)
+    else:
+        folders = list(iter_opportunity_dirs())
+        legacy = legacy_folders()
+        print(f"{len(folders)} opportunity folders: {len(folders) - len(legacy)} sharded, {len(legacy)} in the flat layout.")
+
+if __name__ == '__main__':
+    main()
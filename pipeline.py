@@ -0,0 +1,206 @@
+# FILE: ./pipeline.py
+
+import os
+import sys
+import time
+import queue
+import argparse
+import importlib
+import threading
+
+from opportunity_catalog import OpportunityCatalog
+from work_queue import WorkQueue
+
+# --- Dynamic Path Configuration ---
+# Assumes this script is in the project's root directory.
+PROJECT_ROOT = os.path.dirname(os.path.realpath(__file__))
+PHASE_DIRS = {
+    "scrape": os.path.join(PROJECT_ROOT, '1_Scraper'),
+    "tailor": os.path.join(PROJECT_ROOT, '2_Data_Tailor'),
+    "render": os.path.join(PROJECT_ROOT, '2_Generator'),
+}
+
+# --- Pipeline Configuration ---
+# Each stage pulls from its durable work queue topic into a bounded in-memory buffer; when a buffer is
+# full its feeder stops claiming work, which is the back-pressure between stages.
+STAGE_WORKERS = {"tailor": 3, "render": 2, "todo": 1}
+STAGE_BUFFER_SIZE = {"tailor": 4, "render": 4, "todo": 16}
+POLL_SECONDS = 1.0
+REPORT_INTERVAL_SECONDS = 15
+
+def import_phase(phase, module_name):
+    """Imports a phase script from its digit-named folder (which is not importable as a package)."""
+    if PHASE_DIRS[phase] not in sys.path:
+        sys.path.insert(0, PHASE_DIRS[phase])
+    return importlib.import_module(module_name)
+
+def make_stage(name, workers, buffer_size):
+    """Returns the shared state of one pipeline stage."""
+    return {
+        "name": name, "workers": workers, "buffer": queue.Queue(maxsize=buffer_size),
+        "wakeup": threading.Event(), "upstream_done": threading.Event(), "done": threading.Event(),
+        "lock": threading.Lock(), "processed": 0, "busy_seconds": 0.0, "max_depth": 0, "first_done_at": None,
+    }
+
+def feed_stage(stage, stop):
+    """Claims the stage's queued items into its buffer until upstream has finished and nothing is left."""
+    work_queue = WorkQueue()
+    while not stop.is_set():
+        # Read the flag before popping: an empty pop after upstream finished means nothing more can arrive.
+        upstream_finished = stage['upstream_done'].is_set()
+        item = work_queue.pop(stage['name'])
+        if item is None:
+            if upstream_finished:
+                break
+            stage['wakeup'].wait(POLL_SECONDS)
+            stage['wakeup'].clear()
+            continue
+        while not stop.is_set():
+            try:
+                stage['buffer'].put(item, timeout=POLL_SECONDS)
+                break
+            except queue.Full:
+                continue
+        else:
+            work_queue.release(item)
+        with stage['lock']:
+            stage['max_depth'] = max(stage['max_depth'], stage['buffer'].qsize())
+
+    # On shutdown, hand back everything still waiting in the buffer so the next run picks it up.
+    if stop.is_set():
+        while True:
+            try:
+                work_queue.release(stage['buffer'].get_nowait())
+            except queue.Empty:
+                break
+    for _ in range(stage['workers']):
+        stage['buffer'].put(None)
+    work_queue.close()
+
+def run_stage_worker(stage, process, downstream, started_at):
+    """Processes buffered items with process(item, catalog, work_queue) until the feeder signals the end."""
+    catalog = OpportunityCatalog()
+    work_queue = WorkQueue()
+    while (item := stage['buffer'].get()) is not None:
+        item_started = time.perf_counter()
+        try:
+            did_work = process(item, catalog, work_queue)
+        except Exception as e:
+            print(f"  > ERROR: {stage['name']} stage failed on '{item['folder']}': {e}")
+            work_queue.nack(item, e)
+            did_work = False
+        with stage['lock']:
+            stage['busy_seconds'] += time.perf_counter() - item_started
+            if did_work:
+                stage['processed'] += 1
+                if stage['first_done_at'] is None:
+                    stage['first_done_at'] = time.perf_counter() - started_at
+        if downstream:
+            downstream['wakeup'].set()
+    catalog.close()
+    work_queue.close()
+
+def run_scraper(tailor_stage):
+    """Runs the scraper, waking the tailor stage as each new opportunity folder is written."""
+    try:
+        scraper = import_phase("scrape", "scrape_linkedin")
+        scraper.main(on_opportunity_created=lambda folder_path, job_info: tailor_stage['wakeup'].set())
+    except Exception as e:
+        print(f"ERROR: The scrape stage stopped: {e}")
+    finally:
+        tailor_stage['upstream_done'].set()
+        tailor_stage['wakeup'].set()
+
+def print_report(stages, started_at, final=False):
+    """Prints per-stage throughput, buffer depth and durable queue depth."""
+    elapsed = time.perf_counter() - started_at
+    work_queue = WorkQueue()
+    print(f"\n--- Pipeline {'summary' if final else 'progress'} after {elapsed:.0f}s ---")
+    for stage in stages:
+        with stage['lock']:
+            processed, busy, max_depth = stage['processed'], stage['busy_seconds'], stage['max_depth']
+        print(f"  > {stage['name']:<6} processed: {processed:>4}  throughput: {processed / elapsed * 60 if elapsed else 0:6.1f}/min  "
+              f"busy: {busy:7.1f}s  buffer: {stage['buffer'].qsize()}/{stage['buffer'].maxsize} (max {max_depth})  "
+              f"queued: {work_queue.depth(stage['name'])}{'  done' if stage['done'].is_set() else ''}")
+    work_queue.close()
+
+def main():
+    """Runs scrape, tailor and render as overlapping stages of one pipeline."""
+    parser = argparse.ArgumentParser(description="Runs the scraper, AI tailor and document generator concurrently.")
+    parser.add_argument('--no-scrape', action='store_true', help="Only drain the tailor and render queues.")
+    parser.add_argument('--tailor-workers', type=int, default=STAGE_WORKERS["tailor"])
+    parser.add_argument('--render-workers', type=int, default=STAGE_WORKERS["render"])
+    args = parser.parse_args()
+
+    print("--- Concurrent Pipeline: Scrape -> Tailor -> Render ---")
+    tailor_data = import_phase("tailor", "tailor_data")
+    generate_documents = import_phase("render", "generate_documents")
+    model = tailor_data.PrefixCachedModel(tailor_data.configure_model())  # Sends the prompt files once, not per opportunity.
+    preprompt, main_prompt = tailor_data.load_prompt_files()
+    limiter = tailor_data.RateLimiter(tailor_data.REQUESTS_PER_MINUTE, tailor_data.TOKENS_PER_MINUTE)  # Shared by all tailor workers.
+    cache = tailor_data.ResponseCache()
+    similarity = tailor_data.SimilarityCache() if tailor_data.SimilarityCache is not None else None
+    WorkQueue(seed_from_catalog=True).close()  # Creates (and seeds) the queue once, before the stage threads open it.
+
+    stages = [
+        make_stage("tailor", args.tailor_workers, STAGE_BUFFER_SIZE["tailor"]),
+        make_stage("render", args.render_workers, STAGE_BUFFER_SIZE["render"]),
+        make_stage("todo", STAGE_WORKERS["todo"], STAGE_BUFFER_SIZE["todo"]),
+    ]
+    tailor_stage, render_stage, todo_stage = stages
+    processes = {
+        "tailor": lambda item, catalog, work_queue: tailor_data.tailor_opportunity(item, model, *tailor_data.current_prompts(model, preprompt, main_prompt), catalog, work_queue, limiter, cache, similarity),
+        "render": generate_documents.render_opportunity,
+        "todo": generate_documents.log_rendered_opportunity,
+    }
+    downstream = {"tailor": render_stage, "render": todo_stage, "todo": None}
+
+    started_at = time.perf_counter()
+    stop = threading.Event()
+    threads = []
+    if args.no_scrape:
+        tailor_stage['upstream_done'].set()
+    else:
+        threads.append(threading.Thread(target=run_scraper, args=(tailor_stage,), name="scrape", daemon=True))
+
+    stage_threads = {}
+    for stage in stages:
+        stage_threads[stage['name']] = [threading.Thread(target=feed_stage, args=(stage, stop), name=f"{stage['name']}-feeder", daemon=True)]
+        stage_threads[stage['name']] += [
+            threading.Thread(target=run_stage_worker, args=(stage, processes[stage['name']], downstream[stage['name']], started_at),
+                             name=f"{stage['name']}-{i + 1}", daemon=True)
+            for i in range(stage['workers'])
+        ]
+        threads += stage_threads[stage['name']]
+    for thread in threads:
+        thread.start()
+
+    last_report = time.perf_counter()
+    try:
+        for stage in stages:
+            # A stage is finished once its feeder and workers have exited; that is the end of the next stage's input.
+            while any(thread.is_alive() for thread in stage_threads[stage['name']]):
+                for thread in stage_threads[stage['name']]:
+                    thread.join(timeout=0.5)
+                if time.perf_counter() - last_report >= REPORT_INTERVAL_SECONDS:
+                    print_report(stages, started_at); last_report = time.perf_counter()
+            stage['done'].set()
+            if (next_stage := downstream[stage['name']]) is not None:
+                next_stage['upstream_done'].set(); next_stage['wakeup'].set()
+    except KeyboardInterrupt:
+        print("\nInterrupted. Finishing the items in progress and returning the rest to the queue...")
+        stop.set()
+        for stage in stages:
+            stage['upstream_done'].set(); stage['wakeup'].set()
+        for stage in stages:
+            for thread in stage_threads[stage['name']]:
+                thread.join()
+
+    print_report(stages, started_at, final=True)
+    if todo_stage['first_done_at'] is not None:
+        print(f"First finished CV was logged {todo_stage['first_done_at']:.1f}s after the pipeline started.")
+    print(model.summary())
+    model.close()
+
+if __name__ == '__main__':
+    main()
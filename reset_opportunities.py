@@ -9,6 +9,10 @@ PROJECT_ROOT = os.path.dirname(os.path.realpath(__file__))
 OPPORTUNITIES_BASE_DIR = os.path.join(PROJECT_ROOT, '3_Opportunities')
 TODO_FILE_PATH = os.path.join(PROJECT_ROOT, 'todo.txt')
 
+from opportunity_catalog import OpportunityCatalog
+from work_queue import WorkQueue
+from opportunity_lease import atomic_write
+
 def reset_all_opportunities():
     """
     Resets the entire project to a state where all opportunities can be re-processed.
@@ -18,11 +22,12 @@ def reset_all_opportunities():
     """
     print("--- Opportunity Reset Utility ---")
     print("\nThis script will perform the following actions:")
-    print("  1. Iterate through all folders in '3_Opportunities'.")
+    print("  1. Iterate through all folders in '3_Opportunities' listed in the opportunity catalog.")
     print("  2. Delete all 'data.txt' files.")
     print("  3. Delete all generated CV and CL (.pdf, .html) files.")
     print("  4. Reset 'Status' and 'Data-Status' to 'pending' in all 'jobdescription.txt' files.")
     print("  5. Clear all content from 'todo.txt'.")
+    print("  6. Empty the work queue and queue every opportunity for tailoring again.")
     print("\nThis action is irreversible.")
     
     # --- Safety Confirmation ---
@@ -40,8 +45,10 @@ def reset_all_opportunities():
     folders_processed = 0
     files_deleted = 0
 
-    for folder_name in sorted(os.listdir(OPPORTUNITIES_BASE_DIR)):
-        opportunity_path = os.path.join(OPPORTUNITIES_BASE_DIR, folder_name)
+    catalog = OpportunityCatalog()
+    for row in catalog.find():
+        folder_name = row['folder']
+        opportunity_path = catalog.folder_path(row)
         
         if os.path.isdir(opportunity_path):
             print(f"\nProcessing folder: {folder_name}")
@@ -71,19 +78,29 @@ def reset_all_opportunities():
                     with open(job_desc_path, 'r', encoding='utf-8') as f:
                         lines = f.readlines()
                     
-                    with open(job_desc_path, 'w', encoding='utf-8') as f:
-                        for line in lines:
-                            if line.lower().strip().startswith("status:"):
-                                f.write("Status: pending\n")
-                            elif line.lower().strip().startswith("data-status:"):
-                                f.write("Data-Status: pending\n")
-                            else:
-                                f.write(line)
+                    reset_lines = []
+                    for line in lines:
+                        if line.lower().strip().startswith("status:"):
+                            reset_lines.append("Status: pending\n")
+                        elif line.lower().strip().startswith("data-status:"):
+                            reset_lines.append("Data-Status: pending\n")
+                        else:
+                            reset_lines.append(line)
+                    atomic_write(job_desc_path, "".join(reset_lines))
+                    catalog.set_status(opportunity_path, "Status", "pending")
+                    catalog.set_status(opportunity_path, "Data-Status", "pending")
                     print("  > Reset statuses in jobdescription.txt")
                 except Exception as e:
                     print(f"  > ERROR updating {job_desc_path}: {e}")
             else:
                  print("  > WARNING: jobdescription.txt not found.")
+        else:
+            catalog.remove(folder_name)
+
+    work_queue = WorkQueue()
+    work_queue.clear()
+    work_queue.enqueue_many("tailor", [row['folder'] for row in catalog.find()])
+    print(f"\nQueued {work_queue.depth('tailor')} opportunities for tailoring.")
 
     try:
         if os.path.exists(TODO_FILE_PATH):
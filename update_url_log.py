@@ -1,71 +1,48 @@
 # FILE: ./update_url_log.py
 
 import os
+from job_index import JobIndex, JOB_INDEX_DB, PROCESSED_URLS_FILE
+from opportunity_catalog import OpportunityCatalog
 
 # --- Configuration ---
 # This script is designed to be run from the project's root directory.
 PROJECT_ROOT = os.path.dirname(os.path.realpath(__file__))
 OPPORTUNITIES_BASE_DIR = os.path.join(PROJECT_ROOT, '3_Opportunities')
-PROCESSED_URLS_FILE = os.path.join(PROJECT_ROOT, 'processed_urls.txt')
 
 def update_processed_urls_from_existing_folders():
     """
-    Scans all existing opportunity folders, extracts the job URLs from
-    jobdescription.txt, and updates the master processed_urls.txt file.
+    Reconciles the opportunity catalog with the folders on disk, then records
+    the job IDs of every catalogued job URL in the job index.
     """
-    print("--- Starting URL Log Update Utility ---")
+    print("--- Starting Job Index Update Utility ---")
 
-    # --- Step 1: Load URLs that are already in the log file ---
-    existing_urls = set()
-    if os.path.exists(PROCESSED_URLS_FILE):
-        with open(PROCESSED_URLS_FILE, 'r', encoding='utf-8') as f:
-            existing_urls = {line.strip() for line in f if line.strip()}
-        print(f"Found {len(existing_urls)} URLs already in '{os.path.basename(PROCESSED_URLS_FILE)}'.")
-    else:
-        print(f"'{os.path.basename(PROCESSED_URLS_FILE)}' not found. A new one will be created.")
+    # --- Step 1: Open the index (migrates processed_urls.txt on first use) ---
+    job_index = JobIndex()
+    print(f"Found {len(job_index)} jobs already in '{os.path.basename(JOB_INDEX_DB)}'.")
 
-    # --- Step 2: Scan all existing opportunity folders ---
-    found_urls = set()
+    # --- Step 2: Reconcile the catalog with all existing opportunity folders ---
     if not os.path.isdir(OPPORTUNITIES_BASE_DIR):
         print(f"ERROR: Opportunities directory not found at '{OPPORTUNITIES_BASE_DIR}'.")
         return
 
-    print(f"Scanning folders in '{OPPORTUNITIES_BASE_DIR}'...")
-    for folder_name in sorted(os.listdir(OPPORTUNITIES_BASE_DIR)):
-        opportunity_path = os.path.join(OPPORTUNITIES_BASE_DIR, folder_name)
-        
-        if os.path.isdir(opportunity_path):
-            job_desc_path = os.path.join(opportunity_path, 'jobdescription.txt')
-            if os.path.exists(job_desc_path):
-                try:
-                    with open(job_desc_path, 'r', encoding='utf-8') as f:
-                        for line in f:
-                            # Find the URL line, ignore case and whitespace
-                            if line.strip().lower().startswith('job post url:'):
-                                url = line.split(':', 1)[1].strip()
-                                if url:
-                                    # Get base URL without tracking params for better de-duplication
-                                    base_url = url.split('&')[0]
-                                    found_urls.add(base_url)
-                                    print(f"  > Found URL in: {folder_name}")
-                                break # Move to the next folder once URL is found
-                except Exception as e:
-                    print(f"  > Could not read file in {folder_name}: {e}")
+    print(f"Reconciling the opportunity catalog with '{OPPORTUNITIES_BASE_DIR}'...")
+    catalog = OpportunityCatalog()
+    synced, removed = catalog.rebuild()
+    found_urls = {row['job_url'] for row in catalog.find(archived=None) if row['job_url'] and row['job_url'] != 'N/A'}
+    catalog.close()
 
-    print(f"\nScanned all folders. Found {len(found_urls)} unique URLs in job description files.")
+    print(f"\nCatalog holds {synced} opportunities ({removed} stale entries removed). Found {len(found_urls)} unique job URLs.")
 
-    # --- Step 3: Combine and write the final list ---
-    final_urls = existing_urls.union(found_urls)
-    
-    print(f"Total unique URLs to be saved: {len(final_urls)}")
-    
+    # --- Step 3: Record the folders' jobs, then anything still only in the legacy log ---
     try:
-        with open(PROCESSED_URLS_FILE, 'w', encoding='utf-8') as f:
-            for url in sorted(list(final_urls)): # Sort for consistency
-                f.write(url + '\n')
-        print(f"SUCCESS: '{os.path.basename(PROCESSED_URLS_FILE)}' has been updated with all found URLs.")
+        added = job_index.add_many(sorted(found_urls), source="folder_scan")
+        if os.path.exists(PROCESSED_URLS_FILE):
+            added += job_index.import_urls_file(PROCESSED_URLS_FILE)
+        print(f"SUCCESS: Added {added} new job IDs. '{os.path.basename(JOB_INDEX_DB)}' now holds {len(job_index)} jobs.")
     except Exception as e:
-        print(f"ERROR: Could not write to file: {e}")
+        print(f"ERROR: Could not update the job index: {e}")
+    finally:
+        job_index.close()
 
 if __name__ == '__main__':
-    update_processed_urls_from_existing_folders()
\ No newline at end of file
+    update_processed_urls_from_existing_folders()
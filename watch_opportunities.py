@@ -0,0 +1,163 @@
+# FILE: ./watch_opportunities.py
+
+import os
+import sys
+import time
+import threading
+
+from opportunity_catalog import OpportunityCatalog, OPPORTUNITIES_BASE_DIR, folder_key
+from work_queue import WorkQueue
+from opportunity_paths import iter_opportunity_dirs
+from pipeline import import_phase
+
+# watchdog (inotify on Linux) is optional; without it the directory tree is polled.
+try:
+    from watchdog.observers import Observer
+except ImportError:
+    Observer = None
+
+# --- Watch Configuration ---
+WATCHED_FILES = ("jobdescription.txt", "data.txt")
+RENDERED_CV_FILE = "CV-Sebastian-Ochoa-Alvarez.pdf"
+DEBOUNCE_SECONDS = 2.0  # A file must be quiet this long before its changes are acted on.
+POLL_SECONDS = 2.0      # Scan interval when watchdog is not installed.
+TICK_SECONDS = 0.5
+
+class ChangeCollector:
+    """
+    Collects file change events from watchdog or the poller and hands out the ones that have been quiet
+    for DEBOUNCE_SECONDS, so a burst of saves to one file becomes a single change.
+    Watchdog calls dispatch() for every event.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.last_seen = {}
+
+    def dispatch(self, event):
+        if event.is_directory:
+            return
+        for path in (event.src_path, getattr(event, 'dest_path', '')):
+            self.record(path)
+
+    def record(self, path):
+        if path and os.path.basename(path) in WATCHED_FILES:
+            with self.lock:
+                self.last_seen[os.path.abspath(path)] = time.monotonic()
+
+    def settled(self):
+        """Returns and forgets the paths that have not changed for DEBOUNCE_SECONDS."""
+        now = time.monotonic()
+        with self.lock:
+            ready = [path for path, seen in self.last_seen.items() if now - seen >= DEBOUNCE_SECONDS]
+            for path in ready:
+                del self.last_seen[path]
+        return ready
+
+def poll_for_changes(collector, stop):
+    """Fallback watcher: records watched files whose modification time changed since the previous scan."""
+    mtimes = {}
+    first_scan = True
+    while not stop.is_set():
+        current = {}
+        for folder_path in iter_opportunity_dirs(OPPORTUNITIES_BASE_DIR):
+            for file_name in WATCHED_FILES:
+                path = os.path.join(folder_path, file_name)
+                try:
+                    current[path] = os.stat(path).st_mtime_ns
+                except FileNotFoundError:
+                    continue
+        if not first_scan:
+            for path, mtime in current.items():
+                if mtimes.get(path) != mtime:
+                    collector.record(path)
+        mtimes, first_scan = current, False
+        stop.wait(POLL_SECONDS)
+
+def queue_changes(paths, catalog, work_queue):
+    """
+    Turns settled file changes into queued work: a jobdescription.txt with Data-Status pending is queued for
+    tailoring, and a changed data.txt marks its folder for re-rendering. Returns how many items were queued.
+    """
+    tailor_data = import_phase("tailor", "tailor_data")
+    queued = 0
+    for folder_path in sorted({os.path.dirname(path) for path in paths if os.path.basename(path) == "jobdescription.txt"}):
+        row = catalog.sync_folder(folder_path)
+        if row and row['data_status'] == 'pending':
+            print(f"  > New or reset opportunity: {row['folder']}")
+            work_queue.enqueue("tailor", row['folder']); queued += 1
+
+    for folder_path in sorted({os.path.dirname(path) for path in paths if os.path.basename(path) == "data.txt"}):
+        job_desc_path = os.path.join(folder_path, 'jobdescription.txt')
+        data_txt_path = os.path.join(folder_path, 'data.txt')
+        cv_path = os.path.join(folder_path, RENDERED_CV_FILE)
+        if not os.path.exists(data_txt_path) or not os.path.exists(job_desc_path):
+            continue
+        # A CV newer than data.txt was rendered from it already (e.g. right after the tailor wrote it).
+        if os.path.exists(cv_path) and os.path.getmtime(cv_path) >= os.path.getmtime(data_txt_path):
+            continue
+        if tailor_data.get_specific_status(job_desc_path, "Data-Status") != 'complete':
+            continue
+        if tailor_data.get_specific_status(job_desc_path, "Status") != 'pending':
+            print(f"  > data.txt edited: {folder_key(folder_path)}. Re-rendering its CV and CL.")
+            tailor_data.update_specific_status(job_desc_path, "Status", "pending", catalog)
+        work_queue.enqueue("render", folder_key(folder_path)); queued += 1
+    return queued
+
+def drain_queues(work_queue, catalog, tailor_state):
+    """Runs every queued tailor, render and todo item of this process to completion."""
+    tailor_data = import_phase("tailor", "tailor_data")
+    generate_documents = import_phase("render", "generate_documents")
+    while (item := work_queue.pop("tailor")) is not None:
+        if tailor_state.get('model') is None:
+            tailor_state['model'] = tailor_data.PrefixCachedModel(tailor_data.configure_model())
+            tailor_state['cache'] = tailor_data.ResponseCache()
+            tailor_state['similarity'] = tailor_data.SimilarityCache() if tailor_data.SimilarityCache is not None else None
+        # Re-read on every item, so an edit to the prompt files applies (and re-registers the cached prefix) without a restart.
+        tailor_data.tailor_opportunity(item, tailor_state['model'], *tailor_state['model'].load_prompts(), catalog, work_queue,
+                                       cache=tailor_state['cache'], similarity=tailor_state['similarity'])
+    while (item := work_queue.pop("render")) is not None:
+        generate_documents.render_opportunity(item, catalog, work_queue)
+    generate_documents.log_rendered_opportunities(work_queue, catalog)
+
+def main():
+    """Watches 3_Opportunities and tailors and renders opportunities as soon as they appear or change."""
+    print("--- Watch Mode: Tailor and Render on Change ---")
+    if not os.path.isdir(OPPORTUNITIES_BASE_DIR):
+        print(f"ERROR: Opportunities directory not found at '{OPPORTUNITIES_BASE_DIR}'."); sys.exit(1)
+
+    catalog = OpportunityCatalog()
+    work_queue = WorkQueue(seed_from_catalog=True)
+    collector = ChangeCollector()
+    stop = threading.Event()
+    tailor_state = {}
+
+    if Observer is not None:
+        observer = Observer()
+        observer.schedule(collector, OPPORTUNITIES_BASE_DIR, recursive=True)
+        observer.start()
+        print(f"Watching '{OPPORTUNITIES_BASE_DIR}' for changes (watchdog).")
+    else:
+        observer = None
+        threading.Thread(target=poll_for_changes, args=(collector, stop), daemon=True).start()
+        print(f"watchdog is not installed; polling '{OPPORTUNITIES_BASE_DIR}' every {POLL_SECONDS:.0f}s.")
+
+    # Work that was already waiting when the watcher started is handled first.
+    drain_queues(work_queue, catalog, tailor_state)
+    print("Waiting for changes. Press Ctrl+C to stop.")
+    try:
+        while True:
+            time.sleep(TICK_SECONDS)
+            if paths := collector.settled():
+                if queue_changes(paths, catalog, work_queue):
+                    drain_queues(work_queue, catalog, tailor_state)
+    except KeyboardInterrupt:
+        print("\nStopping watch mode.")
+    finally:
+        stop.set()
+        if observer is not None:
+            observer.stop(); observer.join()
+        work_queue.close(); catalog.close()
+
+if __name__ == '__main__':
+    main()
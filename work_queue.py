@@ -0,0 +1,173 @@
+# FILE: ./work_queue.py
+
+import os
+import sys
+import time
+import sqlite3
+import datetime
+
+from opportunity_catalog import OpportunityCatalog
+
+# --- Dynamic Path Configuration ---
+# Assumes this script is in the project's root directory.
+PROJECT_ROOT = os.path.dirname(os.path.realpath(__file__))
+WORK_QUEUE_DB = os.path.join(PROJECT_ROOT, 'work_queue.db')
+
+# --- Queue Configuration ---
+# One topic per hand-off between phases: scraped -> "tailor", tailored -> "render", rendered -> "todo".
+TOPICS = ("tailor", "render", "todo")
+MAX_ATTEMPTS = 3               # A nacked item is retried this many times in total, then parked as "dead".
+RETRY_DELAY_SECONDS = 60       # Doubled after every failed attempt.
+CLAIM_TIMEOUT_SECONDS = 15 * 60 # A claimed item not acked or nacked by then is handed out again.
+
+class WorkQueue:
+    """
+    Durable per-topic queues of opportunity folder keys, stored in SQLite.
+    Consumers pop an item, then ack it when done or nack it to retry later with backoff, so one failing
+    folder never blocks the others and every stage only sees the work that is new to it.
+    """
+
+    def __init__(self, db_path=WORK_QUEUE_DB, seed_from_catalog=False):
+        is_new = not os.path.exists(db_path)
+        self.conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS work_items ("
+            " id INTEGER PRIMARY KEY, topic TEXT NOT NULL, folder TEXT NOT NULL, state TEXT NOT NULL,"
+            " attempts INTEGER NOT NULL DEFAULT 0, available_at REAL NOT NULL, claimed_at REAL,"
+            " enqueued_at TEXT, last_error TEXT, UNIQUE (topic, folder)"
+            ")"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS work_items_ready ON work_items (topic, state, available_at)")
+        if is_new and seed_from_catalog:
+            self.seed_from_catalog()
+
+    def seed_from_catalog(self):
+        """
+        Queues the work the catalog shows as outstanding: once when the queue is first created, and from
+        `--rebuild` after hand edits. Dead items stay dead until --retry-dead. Returns how many were queued.
+        """
+        catalog = OpportunityCatalog()
+        tailor = [row['folder'] for row in catalog.find(data_status=['pending', 'error'])]
+        render = [row['folder'] for row in catalog.find(status='pending', data_status='complete')]
+        catalog.close()
+        queued_tailor = self.enqueue_many("tailor", tailor)
+        queued_render = self.enqueue_many("render", render)
+        if queued_tailor or queued_render:
+            print(f"Queued from the catalog in '{os.path.basename(WORK_QUEUE_DB)}': {queued_tailor} to tailor, {queued_render} to render.")
+        return queued_tailor + queued_render
+
+    def enqueue(self, topic, folder):
+        """Adds a folder to a topic. A folder already waiting or dead is left as is; a finished one is queued again."""
+        self.enqueue_many(topic, [folder])
+
+    def enqueue_many(self, topic, folders):
+        """Adds several folders to a topic, like enqueue(). Returns how many were newly queued."""
+        now = time.time()
+        enqueued_at = datetime.datetime.now().isoformat(timespec='seconds')
+        return self.conn.executemany(
+            "INSERT INTO work_items (topic, folder, state, attempts, available_at, enqueued_at) VALUES (?, ?, 'ready', 0, ?, ?)"
+            " ON CONFLICT (topic, folder) DO UPDATE SET state = 'ready', attempts = 0, available_at = excluded.available_at,"
+            " enqueued_at = excluded.enqueued_at, last_error = NULL WHERE state = 'done'",
+            [(topic, folder, now, enqueued_at) for folder in folders]
+        ).rowcount
+
+    def pop(self, topic):
+        """Claims the oldest ready item of a topic and returns it (id, folder, attempts, ...), or None if there is none."""
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.execute(
+                "UPDATE work_items SET state = 'ready' WHERE topic = ? AND state = 'claimed' AND claimed_at < ?",
+                (topic, now - CLAIM_TIMEOUT_SECONDS)
+            )
+            item = self.conn.execute(
+                "SELECT * FROM work_items WHERE topic = ? AND state = 'ready' AND available_at <= ? ORDER BY available_at, id LIMIT 1",
+                (topic, now)
+            ).fetchone()
+            if item:
+                self.conn.execute("UPDATE work_items SET state = 'claimed', claimed_at = ? WHERE id = ?", (now, item['id']))
+            self.conn.execute("COMMIT")
+            return item
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def ack(self, item):
+        """Marks a claimed item as done."""
+        self.conn.execute("UPDATE work_items SET state = 'done', claimed_at = NULL WHERE id = ?", (item['id'],))
+
+    def nack(self, item, error=""):
+        """Returns a claimed item for a later retry with exponential backoff, or parks it as dead after MAX_ATTEMPTS."""
+        attempts = item['attempts'] + 1
+        state = 'dead' if attempts >= MAX_ATTEMPTS else 'ready'
+        self.conn.execute(
+            "UPDATE work_items SET state = ?, attempts = ?, available_at = ?, claimed_at = NULL, last_error = ? WHERE id = ?",
+            (state, attempts, time.time() + RETRY_DELAY_SECONDS * 2 ** (attempts - 1), str(error)[:500], item['id'])
+        )
+        return state
+
+    def defer(self, item, seconds):
+        """Hands a claimed item back to be offered again after `seconds`, without counting a failed attempt."""
+        self.conn.execute("UPDATE work_items SET state = 'ready', claimed_at = NULL, available_at = ? WHERE id = ?", (time.time() + seconds, item['id']))
+
+    def release(self, item):
+        """Hands a claimed item back untouched, e.g. when a consumer shuts down before processing it."""
+        self.conn.execute("UPDATE work_items SET state = 'ready', claimed_at = NULL WHERE id = ? AND state = 'claimed'", (item['id'],))
+
+    def retry_dead(self, topic):
+        """Puts every dead item of a topic back in the queue. Returns how many were revived."""
+        return self.conn.execute(
+            "UPDATE work_items SET state = 'ready', attempts = 0, available_at = ? WHERE topic = ? AND state = 'dead'", (time.time(), topic)
+        ).rowcount
+
+    def clear(self, topic=None):
+        """Removes every item, or every item of one topic."""
+        if topic:
+            self.conn.execute("DELETE FROM work_items WHERE topic = ?", (topic,))
+        else:
+            self.conn.execute("DELETE FROM work_items")
+
+    def forget(self, folder):
+        """Removes every item of one folder, e.g. once it has been archived."""
+        self.conn.execute("DELETE FROM work_items WHERE folder = ?", (folder,))
+
+    def depth(self, topic):
+        """Returns how many items of a topic are waiting or in progress."""
+        return self.conn.execute("SELECT COUNT(*) FROM work_items WHERE topic = ? AND state IN ('ready', 'claimed')", (topic,)).fetchone()[0]
+
+    def stats(self):
+        """Returns {topic: {state: count}}."""
+        counts = {topic: {} for topic in TOPICS}
+        for row in self.conn.execute("SELECT topic, state, COUNT(*) AS count FROM work_items GROUP BY topic, state"):
+            counts.setdefault(row['topic'], {})[row['state']] = row['count']
+        return counts
+
+    def close(self):
+        self.conn.close()
+
+def main():
+    """Command-line entry point: show queue depths, list dead items, retry them, or re-queue from disk after hand edits."""
+    args = sys.argv[1:]
+    if not args or args[0] not in ('--stats', '--dead', '--retry-dead', '--rebuild'):
+        print("Usage: python work_queue.py --stats | --dead | --retry-dead <topic> | --rebuild"); sys.exit(1)
+    queue = WorkQueue()
+    if args[0] == '--rebuild':
+        # The only full rescan: re-reads every folder's statuses into the catalog, then queues what is outstanding.
+        catalog = OpportunityCatalog()
+        synced, removed = catalog.rebuild()
+        catalog.close()
+        print(f"Re-read {synced} opportunity folders ({removed} gone). Queued {queue.seed_from_catalog()} of them.")
+    elif args[0] == '--stats':
+        for topic, states in queue.stats().items():
+            print(f"  > {topic:<7} " + ", ".join(f"{state}: {count}" for state, count in sorted(states.items())) if states else f"  > {topic:<7} empty")
+    elif args[0] == '--dead':
+        for row in queue.conn.execute("SELECT topic, folder, attempts, last_error FROM work_items WHERE state = 'dead' ORDER BY topic, folder"):
+            print(f"  > [{row['topic']}] {row['folder']} after {row['attempts']} attempts: {row['last_error']}")
+    elif args[0] == '--retry-dead' and len(args) > 1:
+        print(f"Re-queued {queue.retry_dead(args[1])} dead '{args[1]}' items.")
+    queue.close()
+
+if __name__ == '__main__':
+    main()